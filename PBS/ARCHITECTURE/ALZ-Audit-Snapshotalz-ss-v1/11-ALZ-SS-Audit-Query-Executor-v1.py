@@ -3,7 +3,11 @@
 ALZ Snapshot Audit - Automated Query Executor
 ==============================================
 Executes all KQL queries against Azure Resource Graph API
-and exports results to JSON/CSV files.
+and exports results to JSON/NDJSON/CSV or Parquet/Arrow files.
+
+Results are streamed page by page from Resource Graph straight into the
+export writers, so memory use stays at roughly one page (1000 rows)
+regardless of how large the estate is.
 
 Requirements:
     pip install azure-identity azure-mgmt-resourcegraph azure-mgmt-resource pandas openpyxl
@@ -16,29 +20,55 @@ Authentication:
 Usage:
     python alz_audit_executor.py --config queries.json --output ./exports
     python alz_audit_executor.py --subscription-filter "sub1,sub2" --output ./exports
+    python alz_audit_executor.py --parallel 4 --output ./exports
+    python alz_audit_executor.py --quota 10 --max-retries 8 --output ./exports
+    python alz_audit_executor.py --shard-size 200 --parallel 8 --output ./exports
+    python alz_audit_executor.py --cache-ttl 600 --output ./exports
+    python alz_audit_executor.py --baseline --output ./exports-previous
+    python alz_audit_executor.py --delta-from ./exports-previous --output ./exports
+    python alz_audit_executor.py --format parquet --output ./exports
+    python alz_audit_executor.py --consolidate --output ./exports
 """
 
 import argparse
+import csv
+import functools
+import gzip
+import hashlib
+import heapq
 import json
 import os
 import sys
 import logging
+import random
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Any, Tuple
 
 try:
+    from azure.core.exceptions import ServiceRequestError, ServiceResponseError
     from azure.identity import DefaultAzureCredential, AzureCliCredential
     from azure.mgmt.resourcegraph import ResourceGraphClient
     from azure.mgmt.resourcegraph.models import QueryRequest, QueryRequestOptions
     from azure.mgmt.resource import SubscriptionClient
-    import pandas as pd
 except ImportError as e:
     print(f"Missing required package: {e}")
     print("\nInstall requirements:")
     print("  pip install azure-identity azure-mgmt-resourcegraph azure-mgmt-resource pandas openpyxl")
     sys.exit(1)
 
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -48,6 +78,1503 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+class RateLimitScheduler:
+    """
+    Token-bucket scheduler for Azure Resource Graph calls.
+    
+    One scheduler is shared by every query an executor runs, so concurrent
+    queries draw from the same quota. Throttled (429) calls pause the whole
+    bucket for the server's retry-after hint, or a jittered exponential
+    backoff when no hint is given; transient 5xx and connection errors are
+    retried with backoff for the failing call only.
+    """
+    
+    RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+    
+    def __init__(
+        self,
+        quota: int = 15,
+        window_seconds: float = 5.0,
+        max_retries: int = 5,
+        backoff_base: float = 1.0,
+        backoff_max: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep
+    ):
+        """
+        Initialize the scheduler.
+        
+        Args:
+            quota: Requests allowed per window (Resource Graph default: 15 per 5s)
+            window_seconds: Length of the quota window in seconds
+            max_retries: Retries per call before the error is raised
+            backoff_base: Base delay in seconds for exponential backoff
+            backoff_max: Upper bound in seconds for a single backoff delay
+            clock: Monotonic clock (injectable for tests)
+            sleep: Sleep function (injectable for tests)
+        """
+        self.capacity = max(1, quota)
+        self.refill_rate = self.capacity / window_seconds
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = float(self.capacity)
+        self._updated = clock()
+        self._resume_at = 0.0
+        self.throttled = 0
+        self.retries = 0
+    
+    def acquire(self) -> None:
+        """Block until a request token is available and no throttle pause is active."""
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(
+                    self.capacity,
+                    self._tokens + (now - self._updated) * self.refill_rate
+                )
+                self._updated = now
+                wait = self._resume_at - now
+                if wait <= 0:
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / self.refill_rate
+            self._sleep(wait)
+    
+    def pause(self, seconds: float) -> None:
+        """Pause all callers for the given time and drain the bucket (quota is spent)."""
+        with self._lock:
+            self._resume_at = max(self._resume_at, self._clock() + seconds)
+            self._tokens = 0.0
+    
+    def call(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Call func under the rate limit, retrying throttled and transient failures.
+        
+        Raises:
+            The last exception once retries are exhausted or the error is not retryable
+        """
+        attempt = 0
+        while True:
+            self.acquire()
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                status = getattr(e, "status_code", None)
+                transient = isinstance(e, (ServiceRequestError, ServiceResponseError))
+                if (status not in self.RETRYABLE_STATUS_CODES and not transient) \
+                        or attempt >= self.max_retries:
+                    raise
+                attempt += 1
+                with self._lock:
+                    self.retries += 1
+                
+                hint = self._retry_after(e)
+                if hint is not None:
+                    delay = hint + random.uniform(0, self.backoff_base)
+                else:
+                    delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+                
+                if status == 429:
+                    with self._lock:
+                        self.throttled += 1
+                    logger.warning(f"  → Throttled (attempt {attempt}/{self.max_retries}), pausing {delay:.1f}s")
+                    self.pause(delay)
+                else:
+                    logger.warning(f"  → Transient error {status or type(e).__name__} "
+                                   f"(attempt {attempt}/{self.max_retries}), retrying in {delay:.1f}s")
+                    self._sleep(delay)
+    
+    @staticmethod
+    def _retry_after(error: Exception) -> Optional[float]:
+        """Extract a retry delay in seconds from the error's response headers, if any."""
+        response = getattr(error, "response", None)
+        headers = getattr(response, "headers", None) or {}
+        
+        value = headers.get("Retry-After") or headers.get("retry-after")
+        if value is not None:
+            try:
+                return max(0.0, float(value))
+            except ValueError:
+                pass
+        
+        # Resource Graph quota reset hint, formatted hh:mm:ss
+        value = headers.get("x-ms-user-quota-resets-after")
+        if value:
+            try:
+                h, m, sec = value.split(":")
+                return int(h) * 3600 + int(m) * 60 + float(sec)
+            except ValueError:
+                pass
+        return None
+
+
+class JsonArrayWriter:
+    """
+    Incrementally write rows as a JSON array.
+    
+    Output is byte-identical to json.dump(rows, f, indent=2, default=str)
+    but only one page of rows is held in memory at a time.
+    """
+    
+    extension = "json"
+    
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.count = 0
+        self._file = open(self.path, 'w')
+        self._file.write("[")
+    
+    @property
+    def written(self) -> bool:
+        return True
+    
+    def write_page(self, rows: List[Dict[str, Any]]) -> None:
+        for row in rows:
+            item = json.dumps(row, indent=2, default=str).replace("\n", "\n  ")
+            self._file.write(("," if self.count else "") + "\n  " + item)
+            self.count += 1
+    
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.write("\n]" if self.count else "]")
+            self._file.close()
+
+
+class NdjsonWriter:
+    """Incrementally write rows as newline-delimited JSON (one object per line)."""
+    
+    extension = "ndjson"
+    
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.count = 0
+        self._file = open(self.path, 'w')
+    
+    @property
+    def written(self) -> bool:
+        return True
+    
+    def write_page(self, rows: List[Dict[str, Any]]) -> None:
+        for row in rows:
+            self._file.write(json.dumps(row, default=str) + "\n")
+        self.count += len(rows)
+    
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+
+
+class CsvPageWriter:
+    """
+    Incrementally append rows to a CSV file.
+    
+    The header is taken from the first non-empty page; the file is only
+    created once there is a row to write. Nested values (tags, arrays)
+    are written as JSON rather than Python reprs.
+    """
+    
+    extension = "csv"
+    
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.count = 0
+        self._file = None
+        self._writer = None
+        self._extra_columns = set()
+    
+    @property
+    def written(self) -> bool:
+        return self._file is not None
+    
+    def write_page(self, rows: List[Dict[str, Any]]) -> None:
+        if not rows:
+            return
+        if self._writer is None:
+            fieldnames = list(dict.fromkeys(key for row in rows for key in row))
+            self._file = open(self.path, 'w', newline='')
+            self._writer = csv.DictWriter(self._file, fieldnames=fieldnames, extrasaction='ignore')
+            self._writer.writeheader()
+        
+        for row in rows:
+            extra = row.keys() - set(self._writer.fieldnames) - self._extra_columns
+            if extra:
+                logger.warning(f"  → {self.path.name}: dropping columns not in CSV header: {sorted(extra)}")
+                self._extra_columns |= extra
+            self._writer.writerow({key: self._format_value(value) for key, value in row.items()})
+        self.count += len(rows)
+    
+    @staticmethod
+    def _format_value(value: Any) -> Any:
+        if value is None:
+            return ""
+        if isinstance(value, (dict, list)):
+            return json.dumps(value, default=str)
+        return value
+    
+    def close(self) -> None:
+        if self._file is not None and not self._file.closed:
+            self._file.close()
+
+
+class ArrowPageWriter:
+    """
+    Incrementally write rows to a typed, compressed Arrow IPC (Feather v2) file.
+    
+    The schema is inferred once every column has shown a value (or once
+    row_group_size rows are buffered), over the union of the columns seen
+    in the buffered rows: still-null columns become strings, columns
+    mixing ints and floats become float64 and any other mix becomes
+    string, flat objects such as tags become map<string, string>, arrays
+    such as addressSpace and groupIds stay lists, and deeper objects are
+    kept as JSON strings. Later pages are conformed to that schema without
+    lossy casts (a value the column type cannot hold is written as null
+    and logged) and buffered as Arrow record batches until row_group_size
+    rows are ready, so memory stays bounded. Requires pyarrow.
+    """
+    
+    extension = "arrow"
+    compression = "zstd"
+    
+    def __init__(self, path: Path, row_group_size: int = 65536):
+        if not PYARROW_AVAILABLE:
+            raise ImportError("pyarrow not installed. Run: pip install pyarrow")
+        self.path = Path(path)
+        self.row_group_size = row_group_size
+        self.count = 0
+        self.schema = None
+        self._writer = None
+        self._closed = False
+        self._pending_rows = []
+        self._columns = {}
+        self._batches = []
+        self._buffered = 0
+        self._extra_columns = set()
+        self._nulled = {}
+    
+    @property
+    def written(self) -> bool:
+        return self._writer is not None
+    
+    def write_page(self, rows: List[Dict[str, Any]]) -> None:
+        if not rows:
+            return
+        if self.schema is None:
+            # Hold raw rows until every column has a sample value to type it by
+            self._pending_rows.extend(rows)
+            for row in rows:
+                for key, value in row.items():
+                    self._columns[key] = self._columns.get(key, False) or value not in (None, [], {})
+            if not all(self._columns.values()) and len(self._pending_rows) < self.row_group_size:
+                return
+            self._start()
+            return
+        self._append(rows)
+    
+    def _start(self) -> None:
+        self.schema = pa.schema([
+            pa.field(name, self._infer_type([row.get(name) for row in self._pending_rows]))
+            for name in self._columns
+        ])
+        self._writer = self._open_writer()
+        rows, self._pending_rows = self._pending_rows, []
+        self._append(rows)
+    
+    def _append(self, rows: List[Dict[str, Any]]) -> None:
+        extra = {key for row in rows for key in row} - set(self.schema.names) - self._extra_columns
+        if extra:
+            logger.warning(f"  → {self.path.name}: dropping columns not in schema: {sorted(extra)}")
+            self._extra_columns |= extra
+        
+        columns = [self._column(field, rows) for field in self.schema]
+        batch = pa.RecordBatch.from_arrays(columns, schema=self.schema)
+        self._batches.append(batch)
+        self._buffered += batch.num_rows
+        self.count += batch.num_rows
+        if self._buffered >= self.row_group_size:
+            self._flush()
+    
+    def _open_writer(self) -> Any:
+        return pa.ipc.new_file(
+            str(self.path), self.schema,
+            options=pa.ipc.IpcWriteOptions(compression=self.compression)
+        )
+    
+    def _flush(self) -> None:
+        if self._batches:
+            self._writer.write_table(pa.Table.from_batches(self._batches, schema=self.schema))
+            self._batches = []
+            self._buffered = 0
+    
+    def _column(self, field: Any, rows: List[Dict[str, Any]]) -> Any:
+        """Conform one column of a page to its field type, nulling values it cannot hold."""
+        values = []
+        nulled = 0
+        for row in rows:
+            try:
+                values.append(self._conform(row.get(field.name), field.type))
+            except (TypeError, ValueError):
+                values.append(None)
+                nulled += 1
+        if nulled:
+            if field.name not in self._nulled:
+                logger.warning(f"  → {self.path.name}: column '{field.name}' has values that do not "
+                               f"fit {field.type}; writing them as null")
+            self._nulled[field.name] = self._nulled.get(field.name, 0) + nulled
+        return pa.array(values, type=field.type)
+    
+    @classmethod
+    def _infer_type(cls, values: List[Any]) -> Any:
+        """Arrow type for a buffered column, widening int -> float64 -> string on conflicts."""
+        try:
+            return cls._normalise_type(pa.array(values).type)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, OverflowError):
+            present = [value for value in values if value is not None]
+            if all(isinstance(value, (int, float)) and not isinstance(value, bool) for value in present):
+                return pa.float64()
+            return pa.string()
+    
+    @classmethod
+    def _normalise_type(cls, arrow_type: Any) -> Any:
+        if pa.types.is_null(arrow_type):
+            return pa.string()
+        if pa.types.is_struct(arrow_type):
+            children = [cls._normalise_type(arrow_type.field(i).type) for i in range(arrow_type.num_fields)]
+            if all(pa.types.is_string(child) for child in children):
+                return pa.map_(pa.string(), pa.string())
+            return pa.string()
+        if pa.types.is_list(arrow_type) or pa.types.is_large_list(arrow_type):
+            return pa.list_(cls._normalise_type(arrow_type.value_type))
+        return arrow_type
+    
+    @classmethod
+    def _conform(cls, value: Any, arrow_type: Any) -> Any:
+        if value is None:
+            return None
+        if pa.types.is_string(arrow_type):
+            return value if isinstance(value, str) else json.dumps(value, default=str)
+        if pa.types.is_map(arrow_type):
+            if not isinstance(value, dict):
+                return None
+            return {str(k): cls._conform(v, arrow_type.item_type) for k, v in value.items()}
+        if pa.types.is_list(arrow_type):
+            items = value if isinstance(value, list) else [value]
+            return [cls._conform(item, arrow_type.value_type) for item in items]
+        if pa.types.is_boolean(arrow_type):
+            if not isinstance(value, bool):
+                raise TypeError(f"{value!r} is not a bool")
+            return value
+        if pa.types.is_integer(arrow_type):
+            if isinstance(value, float) and value.is_integer():
+                return int(value)
+            if not isinstance(value, int) or isinstance(value, bool):
+                raise TypeError(f"{value!r} is not an integer")
+            return value
+        if pa.types.is_floating(arrow_type):
+            if not isinstance(value, (int, float)) or isinstance(value, bool):
+                raise TypeError(f"{value!r} is not a number")
+            return float(value)
+        return value
+    
+    def close(self) -> None:
+        if self._pending_rows:
+            self._start()
+        if self._writer is not None and not self._closed:
+            self._flush()
+            self._writer.close()
+            self._closed = True
+
+
+class ParquetPageWriter(ArrowPageWriter):
+    """Incrementally write rows to a zstd-compressed Parquet file, one row group per buffer."""
+    
+    extension = "parquet"
+    
+    def _open_writer(self) -> Any:
+        return pq.ParquetWriter(str(self.path), self.schema, compression=self.compression)
+
+
+# Writer classes by format name, and the writers each --format value selects
+EXPORT_WRITERS = {
+    "json": JsonArrayWriter,
+    "ndjson": NdjsonWriter,
+    "csv": CsvPageWriter,
+    "parquet": ParquetPageWriter,
+    "arrow": ArrowPageWriter
+}
+
+EXPORT_FORMATS = {
+    "json": ["json"],
+    "ndjson": ["ndjson"],
+    "csv": ["csv"],
+    "both": ["json", "csv"],
+    "parquet": ["parquet"],
+    "arrow": ["arrow"]
+}
+
+
+def open_export_writers(output_dir: Path, stem: str, export_format: str) -> List[Any]:
+    """Create the page writers selected by an export format for one output stem."""
+    return [
+        EXPORT_WRITERS[fmt](Path(output_dir) / f"{stem}.{EXPORT_WRITERS[fmt].extension}")
+        for fmt in EXPORT_FORMATS[export_format]
+    ]
+
+
+class BaselineWriter:
+    """
+    Write a compact snapshot baseline for later delta runs.
+    
+    Each row becomes one gzipped "digest<TAB>key" line: the key is the
+    lower-cased value of the first non-empty key column (id, resourceId
+    or ResourceId unless the query names its own) and the digest is an
+    8-byte BLAKE2b of the row, so a 500k-row inventory baseline is a few
+    MB and loads in about a second. Rows without a key are keyed by their
+    digest and occurrence number ("row:<digest>", "row:<digest>:2", ...),
+    so identical rows compare as a multiset. The file is only published
+    once finish() is called; an incomplete run leaves any previous
+    baseline in place.
+    """
+    
+    extension = "baseline"
+    KEY_COLUMNS = ("id", "resourceId", "ResourceId")
+    
+    def __init__(self, path: Path, key_columns: Optional[Iterable[str]] = None):
+        """
+        Args:
+            path: Baseline file to publish
+            key_columns: Columns identifying a row, first non-empty wins
+                (default: KEY_COLUMNS)
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.key_columns = tuple(key_columns or self.KEY_COLUMNS)
+        self.count = 0
+        self._tmp_path = self.path.with_name(self.path.name + ".tmp")
+        self._file = gzip.open(self._tmp_path, 'wt', encoding='utf-8')
+        self._complete = False
+        self._unkeyed: Dict[str, int] = {}
+    
+    @property
+    def written(self) -> bool:
+        return self._complete
+    
+    def fingerprint(self, row: Dict[str, Any]) -> Tuple[str, str]:
+        """Return the (key, digest) pair identifying a row."""
+        digest = hashlib.blake2b(
+            json.dumps(row, sort_keys=True, default=str).encode("utf-8"), digest_size=8
+        ).hexdigest()
+        for column in self.key_columns:
+            key = row.get(column)
+            if key:
+                return str(key).lower(), digest
+        occurrence = self._unkeyed.get(digest, 0) + 1
+        self._unkeyed[digest] = occurrence
+        return (f"row:{digest}" if occurrence == 1 else f"row:{digest}:{occurrence}"), digest
+    
+    @staticmethod
+    def load(path: Path) -> Dict[str, str]:
+        """Load a baseline file into a key -> digest map."""
+        baseline = {}
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            for line in f:
+                digest, key = line.rstrip("\n").split("\t", 1)
+                baseline[key] = digest
+        return baseline
+    
+    def write_page(self, rows: List[Dict[str, Any]]) -> None:
+        self.write_fingerprints([self.fingerprint(row) for row in rows])
+    
+    def write_fingerprints(self, fingerprints: List[Tuple[str, str]]) -> None:
+        self._file.writelines(f"{digest}\t{key}\n" for key, digest in fingerprints)
+        self.count += len(fingerprints)
+    
+    def finish(self) -> None:
+        self._complete = True
+    
+    def close(self) -> None:
+        if self._file.closed:
+            return
+        self._file.close()
+        if self._complete:
+            os.replace(self._tmp_path, self.path)
+        else:
+            os.remove(self._tmp_path)
+
+
+class SnapshotDelta:
+    """
+    Diff streamed rows against a previous baseline and write only the changes.
+    
+    Added and changed rows are written in full to the "added" and
+    "changed" writers; keys present in the previous baseline but not in
+    this run are written as {"id": key} to the "removed" writers once
+    the query completes. A fresh baseline is written alongside.
+    """
+    
+    extension = "delta"
+    
+    def __init__(
+        self,
+        previous: Dict[str, str],
+        baseline: BaselineWriter,
+        open_writers: Callable[[str], List[Any]]
+    ):
+        """
+        Args:
+            previous: Previous baseline (key -> digest); consumed as rows are matched
+            baseline: Writer for this run's baseline
+            open_writers: Factory returning the page writers for a category name
+        """
+        self.previous = previous
+        self.baseline = baseline
+        self.added = open_writers("added")
+        self.changed = open_writers("changed")
+        self.removed = open_writers("removed")
+        self.counts = {"added": 0, "changed": 0, "removed": 0}
+        self.count = 0
+    
+    @property
+    def writers(self) -> List[Any]:
+        return self.added + self.changed + self.removed + [self.baseline]
+    
+    @property
+    def written(self) -> bool:
+        return True
+    
+    def write_page(self, rows: List[Dict[str, Any]]) -> None:
+        added, changed, fingerprints = [], [], []
+        for row in rows:
+            key, digest = self.baseline.fingerprint(row)
+            fingerprints.append((key, digest))
+            previous_digest = self.previous.pop(key, None)
+            if previous_digest is None:
+                added.append(row)
+            elif previous_digest != digest:
+                changed.append(row)
+        
+        self.baseline.write_fingerprints(fingerprints)
+        self._write("added", self.added, added)
+        self._write("changed", self.changed, changed)
+        self.count += len(rows)
+    
+    def finish(self) -> None:
+        """Emit rows missing from this run as removed and publish the baseline."""
+        page = []
+        for key in self.previous:
+            page.append({"id": key})
+            if len(page) == 1000:
+                self._write("removed", self.removed, page)
+                page = []
+        self._write("removed", self.removed, page)
+        self.previous = {}
+        self.baseline.finish()
+    
+    def _write(self, category: str, writers: List[Any], rows: List[Dict[str, Any]]) -> None:
+        if not rows:
+            return
+        for writer in writers:
+            writer.write_page(rows)
+        self.counts[category] += len(rows)
+    
+    def close(self) -> None:
+        for writer in self.writers:
+            writer.close()
+
+
+class ResultOrdering:
+    """
+    The trailing order by / sort by / top / take / limit of a KQL query.
+    
+    Rows from separate subscription shards are each ordered and limited by
+    Resource Graph, so re-applying the tail restores the result of the
+    unsharded query: ordered shard streams are k-way merged and the limit
+    is applied to the merged stream.
+    """
+    
+    _SORT = re.compile(r'^(?:order|sort)\s+by\s+(.+)$', re.S | re.I)
+    _TOP = re.compile(r'^top\s+(\d+)\s+by\s+(.+)$', re.S | re.I)
+    _TAKE = re.compile(r'^(?:take|limit)\s+(\d+)$', re.I)
+    
+    def __init__(self, order_by: Optional[List[Tuple[str, bool]]] = None, limit: Optional[int] = None):
+        """
+        Args:
+            order_by: (column, descending) pairs to sort rows by
+            limit: Maximum number of rows to keep
+        """
+        self.order_by = order_by or []
+        self.limit = limit
+    
+    @classmethod
+    def from_operators(cls, operators: List[str]) -> "ResultOrdering":
+        """
+        Parse the trailing sort and limit operators of a split pipeline.
+        
+        Raises:
+            ValueError: If an operator is not order by / sort by / top / take / limit
+        """
+        order_by: List[Tuple[str, bool]] = []
+        limit = None
+        for op in operators:
+            sort, top, take = cls._SORT.match(op), cls._TOP.match(op), cls._TAKE.match(op)
+            if sort or top:
+                order_by = SummarizeMerger._parse_sort_keys((sort or top).group(sort and 1 or 2))
+                if top:
+                    limit = int(top.group(1)) if limit is None else min(limit, int(top.group(1)))
+            elif take:
+                limit = int(take.group(1)) if limit is None else min(limit, int(take.group(1)))
+            else:
+                raise ValueError(f"'{op.split()[0]}' cannot be re-applied")
+        return cls(order_by, limit)
+    
+    @classmethod
+    def from_query(cls, query: str) -> "ResultOrdering":
+        """Parse the longest run of sort and limit operators that ends a query."""
+        text = re.sub(r'//[^\n]*', '', query)
+        operators = [op.strip() for op in SummarizeMerger._split_top_level(text, "|")]
+        start = len(operators)
+        while start > 1 and any(p.match(operators[start - 1]) for p in (cls._SORT, cls._TOP, cls._TAKE)):
+            start -= 1
+        return cls.from_operators(operators[start:])
+    
+    def __bool__(self) -> bool:
+        return bool(self.order_by) or self.limit is not None
+    
+    def compare(self, a: Dict[str, Any], b: Dict[str, Any]) -> int:
+        """Compare two rows by order_by the way KQL sorts them."""
+        for col, descending in self.order_by:
+            x, y = a.get(col), b.get(col)
+            if x == y:
+                continue
+            # KQL puts nulls first ascending and last descending
+            if x is None or y is None:
+                result = -1 if x is None else 1
+            else:
+                try:
+                    result = -1 if x < y else 1
+                except TypeError:
+                    result = -1 if LocalQueryPlan._to_text(x) < LocalQueryPlan._to_text(y) else 1
+            return -result if descending else result
+        return 0
+    
+    def apply(self, rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Sort and limit rows in memory."""
+        result = list(rows)
+        if self.order_by:
+            result.sort(key=functools.cmp_to_key(self.compare))
+        return result if self.limit is None else result[:self.limit]
+    
+    def merge(self, streams: List[Iterable[Dict[str, Any]]]) -> Iterator[Dict[str, Any]]:
+        """
+        Merge row streams that are each already in order_by order.
+        
+        Without order_by the streams are concatenated in the given order.
+        Only one row per stream is held in memory.
+        """
+        if self.order_by:
+            rows = heapq.merge(*streams, key=functools.cmp_to_key(self.compare))
+        else:
+            rows = (row for stream in streams for row in stream)
+        for produced, row in enumerate(rows):
+            if self.limit is not None and produced >= self.limit:
+                break
+            yield row
+
+
+class SummarizeMerger:
+    """
+    Re-aggregate the rows of a summarize query run over separate subscription shards.
+    
+    Each shard returns its own groups, so the same group key can appear
+    once per shard. Additive aggregates (count, countif, sum, sumif) are
+    summed, min/max are re-applied, make_set/make_list are unioned, and
+    dcount(subscriptionId) is summed because shards never share a
+    subscription. A trailing order by / sort by / top / take / limit is
+    re-applied to the merged groups.
+    """
+    
+    MERGE_FUNCTIONS = {
+        "count": "sum", "countif": "sum", "sum": "sum", "sumif": "sum",
+        "min": "min", "minif": "min", "max": "max", "maxif": "max",
+        "make_set": "set", "make_list": "list"
+    }
+    
+    _SUMMARIZE = re.compile(r'^summarize\s+(?P<aggs>.+?)(?:\s+by\s+(?P<by>.+))?$', re.S | re.I)
+    _AGGREGATE = re.compile(r'^(?:(?P<alias>\w+)\s*=\s*)?(?P<func>\w+)\s*\((?P<arg>.*)\)$', re.S)
+    _GROUP_KEY = re.compile(r'^(?:(?P<alias>\w+)\s*=\s*.+|(?P<column>\w+))$', re.S)
+    
+    def __init__(
+        self,
+        group_by: List[str],
+        aggregates: Dict[str, str],
+        ordering: Optional[ResultOrdering] = None
+    ):
+        """
+        Args:
+            group_by: Output column names of the by clause
+            aggregates: Output column name -> merge function (sum, min, max, set, list)
+            ordering: Sort and limit applied to the merged groups
+        """
+        self.group_by = group_by
+        self.aggregates = aggregates
+        self.ordering = ordering or ResultOrdering()
+    
+    @classmethod
+    def from_query(cls, query: str) -> Optional["SummarizeMerger"]:
+        """
+        Build a merger for a KQL query.
+        
+        Returns:
+            A merger, or None if the query has no summarize operator
+            
+        Raises:
+            ValueError: If the query summarizes in a way that cannot be re-aggregated
+        """
+        text = re.sub(r'//[^\n]*', '', query)
+        operators = [op.strip() for op in cls._split_top_level(text, "|")]
+        summarize_at = [i for i, op in enumerate(operators) if re.match(r'summarize\b', op, re.I)]
+        if not summarize_at:
+            return None
+        
+        match = cls._SUMMARIZE.match(operators[summarize_at[-1]])
+        if not match:
+            raise ValueError("unrecognised summarize clause")
+        
+        aggregates = {}
+        for item in cls._split_top_level(match.group("aggs"), ","):
+            agg = cls._AGGREGATE.match(item.strip())
+            if not agg:
+                raise ValueError(f"unrecognised aggregate '{item.strip()}'")
+            func = agg.group("func").lower()
+            arg = agg.group("arg").strip()
+            merge = cls.MERGE_FUNCTIONS.get(func)
+            if func == "dcount" and arg == "subscriptionId":
+                merge = "sum"
+            if merge is None:
+                raise ValueError(f"{func}() cannot be re-aggregated across shards")
+            alias = agg.group("alias") or (f"{func}_" if not arg else f"{func}_{arg}")
+            aggregates[alias] = merge
+        
+        group_by = []
+        if match.group("by"):
+            for item in cls._split_top_level(match.group("by"), ","):
+                key = cls._GROUP_KEY.match(item.strip())
+                if not key:
+                    raise ValueError(f"group key '{item.strip()}' needs an alias")
+                group_by.append(key.group("alias") or key.group("column"))
+        
+        try:
+            ordering = ResultOrdering.from_operators(operators[summarize_at[-1] + 1:])
+        except ValueError as e:
+            raise ValueError(f"{e} after summarize") from None
+        
+        return cls(group_by, aggregates, ordering)
+    
+    def merge(self, rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Combine per-shard group rows into one row per group key."""
+        groups: Dict[str, Dict[str, Any]] = {}
+        for row in rows:
+            key = json.dumps([row.get(col) for col in self.group_by], sort_keys=True, default=str)
+            merged = groups.get(key)
+            if merged is None:
+                groups[key] = dict(row)
+                continue
+            for col, how in self.aggregates.items():
+                a, b = merged.get(col), row.get(col)
+                if a is None or b is None:
+                    merged[col] = b if a is None else a
+                elif how == "sum":
+                    merged[col] = a + b
+                elif how == "min":
+                    merged[col] = min(a, b)
+                elif how == "max":
+                    merged[col] = max(a, b)
+                elif how == "set":
+                    seen = {json.dumps(v, sort_keys=True, default=str) for v in a}
+                    merged[col] = a + [
+                        v for v in b if json.dumps(v, sort_keys=True, default=str) not in seen
+                    ]
+                else:
+                    merged[col] = a + b
+        
+        return self.ordering.apply(groups.values())
+    
+    @staticmethod
+    def _parse_sort_keys(clause: str) -> List[Tuple[str, bool]]:
+        keys = []
+        for item in SummarizeMerger._split_top_level(clause, ","):
+            parts = item.split()
+            # KQL sorts descending unless asc is given
+            keys.append((parts[0], not (len(parts) > 1 and parts[1].lower() == "asc")))
+        return keys
+    
+    @staticmethod
+    def _split_top_level(text: str, separator: str) -> List[str]:
+        """Split on separator outside brackets and string literals."""
+        parts, depth, quote, current = [], 0, None, []
+        for ch in text:
+            if quote:
+                if ch == quote:
+                    quote = None
+            elif ch in "'\"":
+                quote = ch
+            elif ch in "([{":
+                depth += 1
+            elif ch in ")]}":
+                depth -= 1
+            elif ch == separator and depth == 0:
+                parts.append("".join(current))
+                current = []
+                continue
+            current.append(ch)
+        parts.append("".join(current))
+        return [p for p in parts if p.strip()]
+
+
+class LocalQueryPlan:
+    """
+    Evaluate a simple KQL pipeline locally over rows of a wider table scan.
+    
+    Supports the operators the audit queries use on a single source
+    table: where, extend, project, mv-expand, order by / sort by,
+    top and take / limit, with comparisons (==, !=, =~, !~, <, <=, >,
+    >=, has, contains, in, in~, !in), and/or, property paths with
+    array indexes, and a handful of scalar functions. Anything else
+    (summarize, join, parse, ...) is rejected with ValueError so the
+    query can be sent to Resource Graph as written.
+    """
+    
+    FUNCTIONS: Dict[str, Callable[..., Any]] = {
+        "tostring": lambda v: LocalQueryPlan._to_text(v),
+        "tolower": lambda v: None if v is None else LocalQueryPlan._to_text(v).lower(),
+        "toupper": lambda v: None if v is None else LocalQueryPlan._to_text(v).upper(),
+        "strlen": lambda v: len(LocalQueryPlan._to_text(v)),
+        "array_length": lambda v: len(v) if isinstance(v, list) else None,
+        "isnull": lambda v: v is None,
+        "isnotnull": lambda v: v is not None,
+        "isempty": lambda v: v is None or v == "",
+        "isnotempty": lambda v: not (v is None or v == ""),
+        "not": lambda v: not v,
+        "tobool": lambda v: None if v is None else str(v).lower() in ("true", "1"),
+        "toint": lambda v: LocalQueryPlan._to_number(v, int),
+        "tolong": lambda v: LocalQueryPlan._to_number(v, int),
+        "todouble": lambda v: LocalQueryPlan._to_number(v, float),
+        "toreal": lambda v: LocalQueryPlan._to_number(v, float),
+    }
+    
+    _TOKEN = re.compile(r"""
+        \s*(?:
+            (?P<string>'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*")
+          | (?P<number>\d+(?:\.\d+)?)
+          | (?P<op>==|!=|=~|!~|<=|>=|!in~|!in\b|in~|!has\b|!contains\b|[<>()\[\],.])
+          | (?P<ident>[A-Za-z_]\w*)
+        )""", re.X)
+    _ASSIGNMENT = re.compile(r'^(?P<alias>[A-Za-z_]\w*)\s*=(?![=~])\s*(?P<expr>.+)$', re.S)
+    _KEYWORD_OPS = {"has", "contains", "in", "and", "or"}
+    
+    def __init__(
+        self,
+        table: str,
+        stages: List[Tuple[str, Any]],
+        columns: List[str],
+        types: Optional[List[str]],
+        order_by: List[Tuple[str, bool]],
+        limit: Optional[int] = None
+    ):
+        """
+        Args:
+            table: Source table the query reads (resources, policyresources, ...)
+            stages: Compiled (kind, payload) row operators in pipeline order
+            columns: Source columns the pipeline reads
+            types: Resource types the leading where clause restricts to (None = any)
+            order_by: (column, descending) pairs applied to the output
+            limit: Maximum number of output rows
+        """
+        self.table = table
+        self.stages = stages
+        self.columns = columns
+        self.types = types
+        self.order_by = order_by
+        self.limit = limit
+    
+    @classmethod
+    def compile(cls, query: str) -> "LocalQueryPlan":
+        """
+        Compile a KQL query into a local plan.
+        
+        Raises:
+            ValueError: If the query uses an operator or function the plan cannot evaluate
+        """
+        text = re.sub(r'//[^\n]*', '', query)
+        operators = [op.strip() for op in SummarizeMerger._split_top_level(text, "|")]
+        if not operators or not re.match(r'^\w+$', operators[0]):
+            raise ValueError("query must start with a table name")
+        
+        table = operators[0].lower()
+        stages: List[Tuple[str, Any]] = []
+        columns: List[str] = []
+        defined: set = set()
+        types = None
+        order_by: List[Tuple[str, bool]] = []
+        limit = None
+        
+        def compile_expr(source: str) -> Callable[[Dict[str, Any]], Any]:
+            node = cls._parse_expression(source)
+            for root in cls._roots(node):
+                if root not in defined and root not in columns:
+                    columns.append(root)
+            return cls._compile_node(node)
+        
+        for position, op in enumerate(operators[1:]):
+            if order_by or limit is not None:
+                if not re.match(r'^(?:take|limit)\s+\d+$', op, re.I):
+                    raise ValueError(f"'{op.split()[0]}' after order by cannot be evaluated locally")
+            where = re.match(r'^where\s+(.+)$', op, re.S | re.I)
+            extend = re.match(r'^extend\s+(.+)$', op, re.S | re.I)
+            project = re.match(r'^project\s+(.+)$', op, re.S | re.I)
+            expand = re.match(r'^mv-expand\s+(.+)$', op, re.S | re.I)
+            sort = re.match(r'^(?:order|sort)\s+by\s+(.+)$', op, re.S | re.I)
+            top = re.match(r'^top\s+(\d+)\s+by\s+(.+)$', op, re.S | re.I)
+            take = re.match(r'^(?:take|limit)\s+(\d+)$', op, re.I)
+            if where:
+                if position == 0:
+                    types = cls._type_filter(cls._parse_expression(where.group(1)))
+                stages.append(("where", compile_expr(where.group(1))))
+            elif extend or project:
+                assignments = []
+                for item in SummarizeMerger._split_top_level((extend or project).group(1), ","):
+                    assigned = cls._ASSIGNMENT.match(item.strip())
+                    alias = assigned.group("alias") if assigned else item.strip()
+                    if not assigned and not re.match(r'^[A-Za-z_]\w*$', alias):
+                        raise ValueError(f"projected expression '{alias}' needs an alias")
+                    assignments.append((alias, compile_expr(assigned.group("expr") if assigned else alias)))
+                    if extend:
+                        # Later extend columns may refer to earlier ones
+                        defined.add(alias)
+                if project:
+                    defined = {alias for alias, _ in assignments}
+                stages.append(("extend" if extend else "project", assignments))
+            elif expand:
+                assigned = cls._ASSIGNMENT.match(expand.group(1).strip())
+                if not assigned:
+                    raise ValueError("mv-expand needs an alias")
+                stages.append(("mv-expand", (assigned.group("alias"), compile_expr(assigned.group("expr")))))
+                defined.add(assigned.group("alias"))
+            elif sort or top:
+                order_by = SummarizeMerger._parse_sort_keys((sort or top).group(sort and 1 or 2))
+                if top:
+                    limit = int(top.group(1))
+            elif take:
+                limit = int(take.group(1)) if limit is None else min(limit, int(take.group(1)))
+            else:
+                raise ValueError(f"'{op.split()[0]}' cannot be evaluated locally")
+        
+        return cls(table, stages, columns, types, order_by, limit)
+    
+    def apply(self, rows: Iterable[Dict[str, Any]], max_results: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Run the pipeline over source rows, yielding output rows.
+        
+        Rows stream through unless the query sorts; a sort keeps only
+        the best min(limit, max_results) rows in memory.
+        """
+        bounds = [n for n in (self.limit, max_results) if n is not None]
+        limit = min(bounds) if bounds else None
+        output = self._evaluate(rows)
+        if self.order_by:
+            key = functools.cmp_to_key(ResultOrdering(self.order_by).compare)
+            output = iter(heapq.nsmallest(limit, output, key=key) if limit is not None
+                          else sorted(output, key=key))
+        for produced, row in enumerate(output):
+            if limit is not None and produced >= limit:
+                break
+            yield row
+    
+    def _evaluate(self, rows: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        stream: Iterable[Dict[str, Any]] = rows
+        for kind, payload in self.stages:
+            stream = self._stage(kind, payload, stream)
+        return iter(stream)
+    
+    @staticmethod
+    def _stage(kind: str, payload: Any, rows: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        if kind == "where":
+            return (row for row in rows if payload(row) is True)
+        if kind == "extend":
+            def extend(row: Dict[str, Any]) -> Dict[str, Any]:
+                row = dict(row)
+                for alias, expr in payload:
+                    row[alias] = expr(row)
+                return row
+            return (extend(row) for row in rows)
+        if kind == "project":
+            return ({alias: expr(row) for alias, expr in payload} for row in rows)
+        
+        alias, expr = payload
+        def expand(rows: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+            for row in rows:
+                values = expr(row)
+                if not isinstance(values, list):
+                    values = [values]
+                # Like Resource Graph, an empty array keeps the row with a null value
+                for value in values or [None]:
+                    expanded = dict(row)
+                    expanded[alias] = value
+                    yield expanded
+        return expand(rows)
+    
+    # -- expression parsing ---------------------------------------------------
+    
+    @classmethod
+    def _parse_expression(cls, source: str) -> Tuple:
+        tokens = []
+        position = 0
+        source = source.strip()
+        while position < len(source):
+            match = cls._TOKEN.match(source, position)
+            if not match or match.end() == position:
+                raise ValueError(f"cannot parse expression near '{source[position:position + 20]}'")
+            kind = match.lastgroup
+            value = match.group(kind)
+            if kind == "string":
+                value = value[1:-1].encode().decode("unicode_escape")
+            elif kind == "number":
+                value = float(value) if "." in value else int(value)
+            elif kind == "ident" and value.lower() in cls._KEYWORD_OPS:
+                kind, value = "op", value.lower()
+            tokens.append((kind, value))
+            position = match.end()
+            while position < len(source) and source[position].isspace():
+                position += 1
+        
+        node, index = cls._parse_or(tokens, 0)
+        if index != len(tokens):
+            raise ValueError(f"unexpected '{tokens[index][1]}' in expression")
+        return node
+    
+    @classmethod
+    def _parse_or(cls, tokens: List[Tuple[str, Any]], i: int) -> Tuple[Tuple, int]:
+        node, i = cls._parse_and(tokens, i)
+        while i < len(tokens) and tokens[i] == ("op", "or"):
+            right, i = cls._parse_and(tokens, i + 1)
+            node = ("or", node, right)
+        return node, i
+    
+    @classmethod
+    def _parse_and(cls, tokens: List[Tuple[str, Any]], i: int) -> Tuple[Tuple, int]:
+        node, i = cls._parse_comparison(tokens, i)
+        while i < len(tokens) and tokens[i] == ("op", "and"):
+            right, i = cls._parse_comparison(tokens, i + 1)
+            node = ("and", node, right)
+        return node, i
+    
+    @classmethod
+    def _parse_comparison(cls, tokens: List[Tuple[str, Any]], i: int) -> Tuple[Tuple, int]:
+        left, i = cls._parse_primary(tokens, i)
+        if i >= len(tokens) or tokens[i][0] != "op":
+            return left, i
+        op = tokens[i][1]
+        if op in ("in", "in~", "!in", "!in~"):
+            if i + 1 >= len(tokens) or tokens[i + 1] != ("op", "("):
+                raise ValueError(f"'{op}' needs a parenthesised list")
+            values, i = cls._parse_arguments(tokens, i + 2)
+            return ("in", op, left, values), i
+        if op in ("==", "!=", "=~", "!~", "<", "<=", ">", ">=", "has", "!has", "contains", "!contains"):
+            right, i = cls._parse_primary(tokens, i + 1)
+            return ("compare", op, left, right), i
+        return left, i
+    
+    @classmethod
+    def _parse_primary(cls, tokens: List[Tuple[str, Any]], i: int) -> Tuple[Tuple, int]:
+        if i >= len(tokens):
+            raise ValueError("expression ends unexpectedly")
+        kind, value = tokens[i]
+        if kind in ("string", "number"):
+            return ("literal", value), i + 1
+        if (kind, value) == ("op", "("):
+            node, i = cls._parse_or(tokens, i + 1)
+            if i >= len(tokens) or tokens[i] != ("op", ")"):
+                raise ValueError("missing ')'")
+            return node, i + 1
+        if kind != "ident":
+            raise ValueError(f"unexpected '{value}' in expression")
+        if value in ("true", "false"):
+            return ("literal", value == "true"), i + 1
+        if value == "dynamic" or (i + 1 < len(tokens) and tokens[i + 1] == ("op", "(")):
+            if value.lower() not in cls.FUNCTIONS:
+                raise ValueError(f"{value}() cannot be evaluated locally")
+            args, i = cls._parse_arguments(tokens, i + 2)
+            if len(args) != 1:
+                raise ValueError(f"{value}() takes one argument")
+            return ("call", value.lower(), args[0]), i
+        
+        path: List[Any] = [value]
+        i += 1
+        while i < len(tokens):
+            if tokens[i] == ("op", ".") and i + 1 < len(tokens) and tokens[i + 1][0] == "ident":
+                path.append(tokens[i + 1][1])
+                i += 2
+            elif tokens[i] == ("op", "[") and i + 2 < len(tokens) and tokens[i + 2] == ("op", "]") \
+                    and tokens[i + 1][0] in ("number", "string"):
+                path.append(tokens[i + 1][1])
+                i += 3
+            else:
+                break
+        return ("path", path), i
+    
+    @classmethod
+    def _parse_arguments(cls, tokens: List[Tuple[str, Any]], i: int) -> Tuple[List[Tuple], int]:
+        args = []
+        while i < len(tokens) and tokens[i] != ("op", ")"):
+            node, i = cls._parse_or(tokens, i)
+            args.append(node)
+            if i < len(tokens) and tokens[i] == ("op", ","):
+                i += 1
+        if i >= len(tokens):
+            raise ValueError("missing ')'")
+        return args, i + 1
+    
+    @classmethod
+    def _roots(cls, node: Tuple) -> Iterator[str]:
+        """Yield the top-level column names an expression reads."""
+        if node[0] == "path":
+            yield node[1][0]
+        elif node[0] == "call":
+            yield from cls._roots(node[2])
+        elif node[0] in ("and", "or"):
+            yield from cls._roots(node[1])
+            yield from cls._roots(node[2])
+        elif node[0] == "compare":
+            yield from cls._roots(node[2])
+            yield from cls._roots(node[3])
+        elif node[0] == "in":
+            yield from cls._roots(node[2])
+            for value in node[3]:
+                yield from cls._roots(value)
+    
+    @classmethod
+    def _type_filter(cls, node: Tuple) -> Optional[List[str]]:
+        """Resource types a where clause restricts to, or None if it is not a pure type filter."""
+        if node[0] == "or":
+            left, right = cls._type_filter(node[1]), cls._type_filter(node[2])
+            return None if left is None or right is None else left + right
+        if node[0] == "compare" and node[1] in ("==", "=~") and node[2] == ("path", ["type"]) \
+                and node[3][0] == "literal":
+            return [str(node[3][1]).lower()]
+        if node[0] == "in" and node[1] in ("in", "in~") and node[2] == ("path", ["type"]) \
+                and all(value[0] == "literal" for value in node[3]):
+            return [str(value[1]).lower() for value in node[3]]
+        return None
+    
+    # -- expression evaluation ------------------------------------------------
+    
+    @classmethod
+    def _compile_node(cls, node: Tuple) -> Callable[[Dict[str, Any]], Any]:
+        kind = node[0]
+        if kind == "literal":
+            value = node[1]
+            return lambda row: value
+        if kind == "path":
+            root, steps = node[1][0], node[1][1:]
+            def resolve(row: Dict[str, Any]) -> Any:
+                value = row.get(root)
+                for step in steps:
+                    if isinstance(step, int):
+                        value = value[step] if isinstance(value, list) and -len(value) <= step < len(value) else None
+                    else:
+                        value = value.get(step) if isinstance(value, dict) else None
+                    if value is None:
+                        return None
+                return value
+            return resolve
+        if kind == "call":
+            func, arg = cls.FUNCTIONS[node[1]], cls._compile_node(node[2])
+            return lambda row: func(arg(row))
+        if kind == "and":
+            left, right = cls._compile_node(node[1]), cls._compile_node(node[2])
+            return lambda row: left(row) is True and right(row) is True
+        if kind == "or":
+            left, right = cls._compile_node(node[1]), cls._compile_node(node[2])
+            return lambda row: left(row) is True or right(row) is True
+        if kind == "in":
+            op, left = node[1], cls._compile_node(node[2])
+            values = [cls._compile_node(value) for value in node[3]]
+            fold = op.endswith("~")
+            def member(row: Dict[str, Any]) -> bool:
+                value = left(row)
+                if value is None:
+                    return op.startswith("!")
+                candidates = [v(row) for v in values]
+                if fold:
+                    found = cls._to_text(value).lower() in {cls._to_text(c).lower() for c in candidates}
+                else:
+                    found = any(cls._equals(value, c) for c in candidates)
+                return not found if op.startswith("!") else found
+            return member
+        
+        op, left, right = node[1], cls._compile_node(node[2]), cls._compile_node(node[3])
+        negate = op.startswith("!") and op != "!="
+        compare = cls._comparator(op.lstrip("!") if negate else op)
+        if negate:
+            return lambda row: cls._negate(compare, left(row), right(row))
+        return lambda row: compare(left(row), right(row))
+    
+    @classmethod
+    def _comparator(cls, op: str) -> Callable[[Any, Any], bool]:
+        text = cls._to_text
+        if op == "==":
+            return cls._equals
+        if op == "!=":
+            return lambda a, b: a is not None and b is not None and not cls._equals(a, b)
+        if op in ("=~", "~"):
+            return lambda a, b: a is not None and b is not None and text(a).lower() == text(b).lower()
+        if op == "has":
+            return cls._has_term
+        if op == "contains":
+            return lambda a, b: a is not None and b is not None and text(b).lower() in text(a).lower()
+        test = {
+            "<": lambda x, y: x < y, "<=": lambda x, y: x <= y,
+            ">": lambda x, y: x > y, ">=": lambda x, y: x >= y
+        }[op]
+        return lambda a, b: cls._ordered(a, b, test)
+    
+    @staticmethod
+    def _negate(compare: Callable[[Any, Any], bool], a: Any, b: Any) -> bool:
+        # Negated string operators are still false when either side is null
+        return a is not None and b is not None and not compare(a, b)
+    
+    @staticmethod
+    def _to_text(value: Any) -> str:
+        """Render a value the way KQL tostring() does."""
+        if value is None:
+            return ""
+        if isinstance(value, bool):
+            return "true" if value else "false"
+        if isinstance(value, (dict, list)):
+            return json.dumps(value, separators=(",", ":"))
+        return str(value)
+    
+    @staticmethod
+    def _to_number(value: Any, kind: type) -> Any:
+        try:
+            return kind(value)
+        except (TypeError, ValueError):
+            return None
+    
+    @classmethod
+    def _equals(cls, a: Any, b: Any) -> bool:
+        if a is None or b is None:
+            return False
+        if isinstance(a, str) != isinstance(b, str):
+            # dynamic vs string literal, e.g. tags == '{}'
+            return cls._to_text(a) == cls._to_text(b)
+        return a == b
+    
+    @classmethod
+    def _ordered(cls, a: Any, b: Any, test: Callable[[Any, Any], bool]) -> bool:
+        if a is None or b is None:
+            return False
+        try:
+            return test(a, b)
+        except TypeError:
+            return test(cls._to_text(a), cls._to_text(b))
+    
+    @classmethod
+    def _has_term(cls, a: Any, b: Any) -> bool:
+        if a is None or b is None:
+            return False
+        term = re.escape(cls._to_text(b))
+        return re.search(rf'(?<![A-Za-z0-9]){term}(?![A-Za-z0-9])', cls._to_text(a), re.I) is not None
+
+
+class ConsolidatedScan:
+    """
+    One Resource Graph scan of a source table that feeds several queries.
+    
+    The scan projects the union of the columns its queries read and, if
+    every query filters on resource type, only those types. Each query
+    is then answered locally by its LocalQueryPlan, so N queries on the
+    same table cost one remote paging run instead of N.
+    """
+    
+    def __init__(self, table: str, plans: Dict[str, LocalQueryPlan]):
+        """
+        Args:
+            table: Source table to scan
+            plans: Query name -> compiled local plan, all reading this table
+        """
+        self.table = table
+        self.plans = plans
+    
+    @property
+    def query(self) -> str:
+        """KQL for the consolidated scan."""
+        columns = ["id", "type"]
+        types: Optional[set] = set()
+        for plan in self.plans.values():
+            columns.extend(c for c in plan.columns if c not in columns)
+            types = None if types is None or plan.types is None else types | set(plan.types)
+        lines = [self.table]
+        if types:
+            lines.append("| where type in~ (" + ", ".join(f"'{t}'" for t in sorted(types)) + ")")
+        lines.append("| project " + ", ".join(columns))
+        return "\n".join(lines)
+    
+    @classmethod
+    def plan(cls, queries: Dict[str, Dict]) -> Tuple[List["ConsolidatedScan"], Dict[str, str]]:
+        """
+        Group query definitions into consolidated scans.
+        
+        Only tables read by two or more locally evaluable queries are
+        consolidated; a single query gains nothing from a wider scan.
+        
+        Returns:
+            (scans, remote) where remote maps each query left to run
+            remotely to the reason it was not consolidated
+        """
+        by_table: Dict[str, Dict[str, LocalQueryPlan]] = {}
+        remote = {}
+        for name, query_def in queries.items():
+            query_text = query_def.get("query", query_def.get("kql", ""))
+            if not query_text:
+                continue
+            try:
+                local = LocalQueryPlan.compile(query_text)
+            except ValueError as e:
+                remote[name] = str(e)
+                continue
+            by_table.setdefault(local.table, {})[name] = local
+        
+        scans = []
+        for table, plans in by_table.items():
+            if len(plans) < 2:
+                remote.update({name: f"only query on {table}" for name in plans})
+            else:
+                scans.append(cls(table, plans))
+        return scans, remote
+
+
+class QueryResultCache:
+    """
+    Content-addressed on-disk cache of query results.
+    
+    Entries are keyed by a SHA-256 of the normalised query text (comments
+    stripped, whitespace collapsed), the sorted subscription set and
+    max_results, and stored as NDJSON so hits stream back page by page.
+    Entries older than the TTL are ignored; when the cache grows past
+    max_bytes the least recently used entries are evicted.
+    """
+    
+    def __init__(
+        self,
+        cache_dir: Path,
+        ttl_seconds: float = 900,
+        max_bytes: int = 1024 * 1024 * 1024
+    ):
+        """
+        Args:
+            cache_dir: Directory holding cache entries (created if missing)
+            ttl_seconds: Age after which an entry is stale
+            max_bytes: Total size above which least recently used entries are evicted
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def make_key(query: str, subscriptions: List[str], max_results: int) -> str:
+        """Hash of (normalised query, subscription set, max_results)."""
+        normalised = " ".join(re.sub(r'//[^\n]*', '', query).split())
+        payload = json.dumps([normalised, sorted(set(subscriptions)), max_results])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    def _paths(self, key: str) -> Tuple[Path, Path]:
+        return self.cache_dir / f"{key}.ndjson", self.cache_dir / f"{key}.meta.json"
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a fresh entry and mark it as recently used.
+        
+        Returns:
+            Entry metadata (created, count, pages, path), or None on a miss
+        """
+        data_path, meta_path = self._paths(key)
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            if time.time() - meta["created"] > self.ttl_seconds or not data_path.exists():
+                return None
+            os.utime(data_path)
+        except (OSError, ValueError, KeyError):
+            return None
+        meta["path"] = data_path
+        return meta
+    
+    def iter_pages(self, entry: Dict[str, Any], page_size: int = 1000) -> Iterator[List[Dict[str, Any]]]:
+        """Stream a cached entry back in pages."""
+        page = []
+        with open(entry["path"]) as f:
+            for line in f:
+                page.append(json.loads(line))
+                if len(page) == page_size:
+                    yield page
+                    page = []
+        if page:
+            yield page
+    
+    def writer(self) -> NdjsonWriter:
+        """Open a temporary NDJSON writer for an entry being filled."""
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        os.close(fd)
+        return NdjsonWriter(Path(tmp_path))
+    
+    def commit(self, key: str, writer: NdjsonWriter, pages: int) -> None:
+        """Publish a completed temporary writer as the entry for key."""
+        writer.close()
+        data_path, meta_path = self._paths(key)
+        os.replace(writer.path, data_path)
+        with open(meta_path, 'w') as f:
+            json.dump({"created": time.time(), "count": writer.count, "pages": pages}, f)
+        self._evict()
+    
+    def discard(self, writer: NdjsonWriter) -> None:
+        """Drop a temporary writer for an entry that did not complete."""
+        writer.close()
+        try:
+            os.remove(writer.path)
+        except OSError:
+            pass
+    
+    def _evict(self) -> None:
+        """Remove least recently used entries until the cache fits in max_bytes."""
+        with self._lock:
+            entries = []
+            for data_path in self.cache_dir.glob("*.ndjson"):
+                try:
+                    stat = data_path.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, data_path))
+            
+            total = sum(size for _, size, _ in entries)
+            for _, size, data_path in sorted(entries):
+                if total <= self.max_bytes:
+                    break
+                for path in self._paths(data_path.name[:-len(".ndjson")]):
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+                total -= size
+                logger.debug(f"Evicted cache entry {data_path.name}")
+
+
 class ALZAuditExecutor:
     """
     Executes Azure Resource Graph queries for ALZ Snapshot Audit.
@@ -56,7 +1583,12 @@ class ALZAuditExecutor:
     def __init__(
         self,
         credential: Optional[Any] = None,
-        subscription_ids: Optional[List[str]] = None
+        subscription_ids: Optional[List[str]] = None,
+        resource_graph_client: Optional[Any] = None,
+        subscription_client: Optional[Any] = None,
+        scheduler: Optional[RateLimitScheduler] = None,
+        shard_size: int = 1000,
+        cache: Optional[QueryResultCache] = None
     ):
         """
         Initialize the executor.
@@ -64,10 +1596,22 @@ class ALZAuditExecutor:
         Args:
             credential: Azure credential object (uses DefaultAzureCredential if None)
             subscription_ids: List of subscription IDs to query (queries all if None)
+            resource_graph_client: Pre-built Resource Graph client (built from credential if None)
+            subscription_client: Pre-built Subscription client (built from credential if None)
+            scheduler: Rate-limit scheduler shared by all queries (default quota if None)
+            shard_size: Maximum subscriptions per Resource Graph request; larger
+                subscription lists are split into shards queried separately
+            cache: Result cache consulted before querying (no caching if None)
         """
-        self.credential = credential or DefaultAzureCredential()
-        self.resource_graph_client = ResourceGraphClient(self.credential)
-        self.subscription_client = SubscriptionClient(self.credential)
+        if resource_graph_client is None or subscription_client is None:
+            self.credential = credential or DefaultAzureCredential()
+        else:
+            self.credential = credential
+        self.resource_graph_client = resource_graph_client or ResourceGraphClient(self.credential)
+        self.subscription_client = subscription_client or SubscriptionClient(self.credential)
+        self.scheduler = scheduler or RateLimitScheduler()
+        self.shard_size = max(1, shard_size)
+        self.cache = cache
         
         # Get subscription IDs if not provided
         if subscription_ids:
@@ -76,6 +1620,9 @@ class ALZAuditExecutor:
             self.subscription_ids = self._get_all_subscriptions()
         
         logger.info(f"Initialized with {len(self.subscription_ids)} subscription(s)")
+        if len(self.subscription_shards) > 1:
+            logger.info(f"Queries will be split into {len(self.subscription_shards)} "
+                        f"subscription shards of up to {self.shard_size}")
     
     def _get_all_subscriptions(self) -> List[str]:
         """Get all accessible subscription IDs."""
@@ -85,84 +1632,353 @@ class ALZAuditExecutor:
                 subscriptions.append(sub.subscription_id)
         return subscriptions
     
-    def execute_query(
+    @property
+    def subscription_shards(self) -> List[List[str]]:
+        """Subscription IDs split into chunks of at most shard_size."""
+        return [
+            self.subscription_ids[i:i + self.shard_size]
+            for i in range(0, len(self.subscription_ids), self.shard_size)
+        ] or [[]]
+    
+    def iter_query_pages(
         self,
         query: str,
-        max_results: int = 10000
-    ) -> Dict[str, Any]:
+        max_results: int = 10000,
+        progress: Optional[Dict[str, Any]] = None,
+        subscriptions: Optional[List[str]] = None
+    ) -> Iterator[List[Dict[str, Any]]]:
         """
-        Execute a single KQL query against Azure Resource Graph.
+        Execute a KQL query and yield its result rows one page at a time.
+        
+        Pages are fetched through the shared rate-limit scheduler, so a
+        throttled page is retried from its own skip_token rather than
+        restarting the query. Errors that exhaust the retries propagate.
         
         Args:
             query: KQL query string
             max_results: Maximum number of results to return
+            progress: Optional dict updated in place with pages, count,
+                skip_token and total_records as paging advances
+            subscriptions: Subscriptions to query (default: all of the executor's)
             
-        Returns:
-            Dict containing query results and metadata
+        Yields:
+            List of result rows for each page
         """
-        all_results = []
-        skip_token = None
-        page_count = 0
+        progress = progress if progress is not None else {}
+        progress.update(pages=0, count=0, skip_token=None, total_records=None)
         
         while True:
-            page_count += 1
-            
             # Configure query options
             options = QueryRequestOptions(
-                top=min(1000, max_results - len(all_results)),
-                skip_token=skip_token
+                top=min(1000, max_results - progress["count"]),
+                skip_token=progress["skip_token"]
             )
             
             # Build request
             request = QueryRequest(
-                subscriptions=self.subscription_ids,
+                subscriptions=subscriptions if subscriptions is not None else self.subscription_ids,
                 query=query,
                 options=options
             )
             
-            try:
-                # Execute query
-                response = self.resource_graph_client.resources(request)
-                
-                # Collect results
-                if response.data:
-                    all_results.extend(response.data)
-                
-                # Check for more pages
-                skip_token = response.skip_token
-                if not skip_token or len(all_results) >= max_results:
+            response = self.scheduler.call(self.resource_graph_client.resources, request)
+            progress["pages"] += 1
+            progress["total_records"] = getattr(response, 'total_records', None)
+            
+            rows = response.data or []
+            progress["count"] += len(rows)
+            progress["skip_token"] = response.skip_token
+            yield rows
+            
+            # Check for more pages
+            if not response.skip_token or progress["count"] >= max_results:
+                break
+    
+    def iter_sharded_query_pages(
+        self,
+        query: str,
+        max_results: int = 10000,
+        progress: Optional[Dict[str, Any]] = None,
+        parallel: int = 1
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Execute a KQL query across subscription shards and yield merged pages.
+        
+        With a single shard this is iter_query_pages. Otherwise each shard
+        is paged in parallel into its own NDJSON spool file, and the spools
+        are replayed so memory stays bounded. Summarize queries are
+        re-aggregated across shards via SummarizeMerger; otherwise the
+        query's trailing order by / top / take is re-applied by merging the
+        ordered spools (ResultOrdering), so the merged rows match the
+        unsharded query. An order by that is not at the end of the query
+        cannot be restored and shard rows then follow shard order. Rows
+        from shards that succeeded are always yielded; if any shard failed,
+        an error is raised afterwards and progress["failed_shards"] lists them.
+        
+        Args:
+            query: KQL query string
+            max_results: Maximum number of merged results to return
+            progress: Optional dict updated in place with pages, count and shard details
+            parallel: Maximum number of shards to query concurrently
+            
+        Yields:
+            List of result rows for each merged page
+        """
+        progress = progress if progress is not None else {}
+        shards = self.subscription_shards
+        if len(shards) == 1:
+            yield from self.iter_query_pages(query, max_results, progress)
+            return
+        
+        try:
+            merger = SummarizeMerger.from_query(query)
+        except ValueError as e:
+            logger.warning(f"  → Cannot re-aggregate summarize across shards ({e}); "
+                           f"shard rows will be concatenated")
+            merger = None
+        ordering = ResultOrdering.from_query(query)
+        if merger is None and not ordering.order_by and re.search(r'\|\s*(?:order|sort)\s+by\b|\|\s*top\b', query, re.I):
+            logger.warning("  → Sort is not the last operator; sharded rows keep shard order")
+        
+        progress.update(pages=0, count=0, skip_token=None, total_records=None, shards=len(shards))
+        
+        with tempfile.TemporaryDirectory(prefix="alz-shards-") as spool_dir:
+            def run_shard(index: int) -> Tuple[Path, Dict[str, Any], Optional[Exception]]:
+                shard_progress = {}
+                spool = NdjsonWriter(Path(spool_dir) / f"shard-{index}.ndjson")
+                try:
+                    for rows in self.iter_query_pages(query, max_results, shard_progress, shards[index]):
+                        spool.write_page(rows)
+                    return spool.path, shard_progress, None
+                except Exception as e:
+                    return spool.path, shard_progress, e
+                finally:
+                    spool.close()
+            
+            with ThreadPoolExecutor(max_workers=max(1, min(parallel, len(shards)))) as pool:
+                shard_results = list(pool.map(run_shard, range(len(shards))))
+            
+            progress["pages"] = sum(p.get("pages", 0) for _, p, _ in shard_results)
+            failed = [
+                {"shard": i, "error": str(err), "resume_skip_token": p.get("skip_token")}
+                for i, (_, p, err) in enumerate(shard_results) if err is not None
+            ]
+            
+            spools = [self._read_spool(path) for path, _, _ in shard_results]
+            if merger is not None:
+                rows = iter(merger.merge(row for spool in spools for row in spool))
+            else:
+                rows = ordering.merge(spools)
+            
+            page = []
+            for row in rows:
+                if progress["count"] >= max_results:
                     break
-                    
-            except Exception as e:
-                logger.error(f"Query execution failed: {e}")
-                return {
-                    "success": False,
-                    "error": str(e),
-                    "data": [],
-                    "count": 0
-                }
+                page.append(row)
+                progress["count"] += 1
+                if len(page) == 1000:
+                    yield page
+                    page = []
+            if page:
+                yield page
+        
+        if failed:
+            progress["failed_shards"] = failed
+            raise RuntimeError(f"{len(failed)} of {len(shards)} subscription shard(s) failed: "
+                               f"{failed[0]['error']}")
+    
+    def iter_cached_query_pages(
+        self,
+        query: str,
+        max_results: int = 10000,
+        progress: Optional[Dict[str, Any]] = None,
+        parallel: int = 1
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Yield query pages from the result cache, or query and fill the cache.
+        
+        Falls through to iter_sharded_query_pages when no cache is
+        configured. A fresh hit sets progress["cached"] = True; a miss is
+        written to the cache only if every page was fetched successfully.
+        """
+        progress = progress if progress is not None else {}
+        if self.cache is None:
+            yield from self.iter_sharded_query_pages(query, max_results, progress, parallel)
+            return
+        
+        key = self.cache.make_key(query, self.subscription_ids, max_results)
+        entry = self.cache.get(key)
+        if entry is not None:
+            progress.update(pages=0, count=0, skip_token=None, total_records=None, cached=True)
+            for rows in self.cache.iter_pages(entry):
+                progress["pages"] += 1
+                progress["count"] += len(rows)
+                yield rows
+            return
+        
+        writer = self.cache.writer()
+        try:
+            for rows in self.iter_sharded_query_pages(query, max_results, progress, parallel):
+                writer.write_page(rows)
+                yield rows
+        except BaseException:
+            self.cache.discard(writer)
+            raise
+        self.cache.commit(key, writer, progress.get("pages", 0))
+    
+    def run_consolidated_scan(
+        self,
+        scan: ConsolidatedScan,
+        spool_path: Path,
+        parallel: int = 1
+    ) -> Dict[str, Any]:
+        """
+        Page a consolidated scan into an NDJSON spool file.
+        
+        The scan is unbounded (each derived query applies its own
+        max_results locally) and goes through the result cache and
+        subscription sharding like any other query.
+        
+        Returns:
+            Scan summary with success, count, pages and cached/error details
+        """
+        progress = {}
+        spool = NdjsonWriter(spool_path)
+        error = None
+        try:
+            for rows in self.iter_cached_query_pages(scan.query, sys.maxsize, progress, parallel):
+                spool.write_page(rows)
+        except Exception as e:
+            error = e
+        finally:
+            spool.close()
+        
+        result = {
+            "queries": list(scan.plans),
+            "success": error is None,
+            "count": progress.get("count", 0),
+            "pages": progress.get("pages", 0)
+        }
+        if progress.get("cached"):
+            result["cached"] = True
+        if error is not None:
+            result["error"] = str(error)
+        return result
+    
+    def iter_local_query_pages(
+        self,
+        plan: LocalQueryPlan,
+        spool_path: Path,
+        max_results: int = 10000,
+        progress: Optional[Dict[str, Any]] = None
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Yield pages of a query evaluated locally over a consolidated scan spool.
+        
+        Sets progress["derived_from"] to the scanned table.
+        """
+        progress = progress if progress is not None else {}
+        progress.update(pages=0, count=0, skip_token=None, total_records=None, derived_from=plan.table)
+        page = []
+        for row in plan.apply(self._read_spool(spool_path), max_results):
+            page.append(row)
+            if len(page) == 1000:
+                progress["pages"] += 1
+                progress["count"] += len(page)
+                yield page
+                page = []
+        if page:
+            progress["pages"] += 1
+            progress["count"] += len(page)
+            yield page
+    
+    @staticmethod
+    def _read_spool(path: Path) -> Iterator[Dict[str, Any]]:
+        """Read rows back from an NDJSON spool file."""
+        with open(path) as f:
+            for line in f:
+                yield json.loads(line)
+    
+    def execute_query(
+        self,
+        query: str,
+        max_results: int = 10000
+    ) -> Dict[str, Any]:
+        """
+        Execute a single KQL query against Azure Resource Graph.
+        
+        Collects every page in memory; use iter_query_pages for large
+        result sets. If retries are exhausted, the rows already fetched
+        are returned alongside the error and the resume token.
+        
+        Args:
+            query: KQL query string
+            max_results: Maximum number of results to return
+            
+        Returns:
+            Dict containing query results and metadata
+        """
+        all_results = []
+        progress = {}
+        
+        try:
+            for rows in self.iter_query_pages(query, max_results, progress):
+                all_results.extend(rows)
+        except Exception as e:
+            logger.error(f"Query execution failed on page {progress['pages'] + 1}: {e}")
+            return {
+                "success": False,
+                "error": str(e),
+                "data": all_results,
+                "count": len(all_results),
+                "pages": progress["pages"],
+                "resume_skip_token": progress["skip_token"]
+            }
         
         return {
             "success": True,
             "data": all_results,
             "count": len(all_results),
-            "total_records": getattr(response, 'total_records', len(all_results)),
-            "pages": page_count
+            "total_records": progress["total_records"] or len(all_results),
+            "pages": progress["pages"]
         }
     
     def execute_query_batch(
         self,
         queries: Dict[str, Dict],
         output_dir: Path,
-        export_format: str = "both"
+        export_format: str = "both",
+        parallel: int = 1,
+        delta_from: Optional[Path] = None,
+        consolidate: bool = False,
+        write_baseline: bool = False
     ) -> Dict[str, Any]:
         """
         Execute multiple queries and export results.
         
+        With write_baseline set, a compact baseline per query is written
+        under output_dir/baseline. With delta_from set, each query exports
+        only the rows added, changed or removed since the baseline in that
+        earlier export directory, instead of the full result set, and a
+        fresh baseline is always written so delta runs can be chained.
+        Rows are matched on the query definition's "key" column(s), or on
+        id / resourceId / ResourceId by default.
+        
+        With consolidate set, queries that read the same source table are
+        answered from one consolidated scan of that table (see
+        ConsolidatedScan) instead of one remote run each. Queries that
+        cannot be evaluated locally, and queries whose scan failed, run
+        remotely as usual.
+        
         Args:
             queries: Dict of query definitions {name: {query, description, output_file}}
             output_dir: Directory to save results
-            export_format: "json", "csv", or "both"
+            export_format: "json", "ndjson", "csv", "both", "parquet" or "arrow"
+            parallel: Total concurrency budget (1 = sequential); split between
+                concurrent queries and the subscription shards each one runs
+            delta_from: Previous export directory to diff against (full export if None)
+            consolidate: Answer same-table queries from one consolidated scan per table
+            write_baseline: Write output_dir/baseline/<output_file>.tsv.gz for later delta runs
             
         Returns:
             Summary of execution results
@@ -178,56 +1994,56 @@ class ALZAuditExecutor:
             "failed": 0,
             "queries": {}
         }
+        if delta_from is not None:
+            results_summary["delta_from"] = str(delta_from)
         
-        for query_name, query_def in queries.items():
-            logger.info(f"Executing: {query_name}")
-            
-            query_text = query_def.get("query", query_def.get("kql", ""))
-            description = query_def.get("description", "")
-            output_file = query_def.get("output_file", f"{query_name}")
+        with tempfile.TemporaryDirectory(prefix="alz-scans-") as spool_dir:
+            page_sources = {}
+            if consolidate:
+                page_sources = self._run_consolidated_scans(
+                    queries, Path(spool_dir), parallel, results_summary
+                )
             
-            if not query_text:
-                logger.warning(f"Skipping {query_name}: No query text")
+            # Split the budget so queries x shards never exceeds parallel
+            active = max(1, min(parallel, len(queries)))
+            shard_parallel = max(1, parallel // active)
+            if active > 1:
+                logger.info(f"Running up to {active} queries concurrently")
+                with ThreadPoolExecutor(max_workers=active) as pool:
+                    futures = {
+                        query_name: pool.submit(
+                            self._execute_and_export,
+                            query_name, query_def, output_dir, export_format, shard_parallel, delta_from,
+                            page_sources.get(query_name), write_baseline
+                        )
+                        for query_name, query_def in queries.items()
+                    }
+                    query_results = {name: future.result() for name, future in futures.items()}
+            else:
+                query_results = {
+                    query_name: self._execute_and_export(
+                        query_name, query_def, output_dir, export_format, shard_parallel, delta_from,
+                        page_sources.get(query_name), write_baseline
+                    )
+                    for query_name, query_def in queries.items()
+                }
+        
+        # Collate in query definition order so the summary is deterministic
+        for query_name in queries:
+            query_result = query_results[query_name]
+            if query_result is None:
                 continue
-            
-            # Execute query
-            result = self.execute_query(query_text)
-            
-            query_result = {
-                "description": description,
-                "success": result["success"],
-                "count": result["count"],
-                "output_files": []
-            }
-            
-            if result["success"]:
+            if query_result["success"]:
                 results_summary["successful"] += 1
-                
-                # Export to JSON
-                if export_format in ("json", "both"):
-                    json_path = output_dir / f"{output_file}.json"
-                    with open(json_path, 'w') as f:
-                        json.dump(result["data"], f, indent=2, default=str)
-                    query_result["output_files"].append(str(json_path))
-                    logger.info(f"  → Exported {result['count']} records to {json_path.name}")
-                
-                # Export to CSV
-                if export_format in ("csv", "both") and result["data"]:
-                    try:
-                        df = pd.DataFrame(result["data"])
-                        csv_path = output_dir / f"{output_file}.csv"
-                        df.to_csv(csv_path, index=False)
-                        query_result["output_files"].append(str(csv_path))
-                        logger.info(f"  → Exported {result['count']} records to {csv_path.name}")
-                    except Exception as e:
-                        logger.warning(f"  → CSV export failed: {e}")
             else:
                 results_summary["failed"] += 1
-                query_result["error"] = result.get("error", "Unknown error")
-                logger.error(f"  → Failed: {query_result['error']}")
-            
             results_summary["queries"][query_name] = query_result
         
+        results_summary["rate_limit"] = {
+            "throttled": self.scheduler.throttled,
+            "retries": self.scheduler.retries
+        }
+        
         # Save execution summary
         summary_path = output_dir / "execution_summary.json"
         with open(summary_path, 'w') as f:
@@ -235,6 +2051,171 @@ class ALZAuditExecutor:
         logger.info(f"\nExecution summary saved to {summary_path}")
         
         return results_summary
+    
+    def _run_consolidated_scans(
+        self,
+        queries: Dict[str, Dict],
+        spool_dir: Path,
+        parallel: int,
+        results_summary: Dict[str, Any]
+    ) -> Dict[str, Callable[[Dict[str, Any]], Iterator[List[Dict[str, Any]]]]]:
+        """
+        Run one consolidated scan per shared source table.
+        
+        Records the plan under results_summary["query_plan"]. The parallel
+        budget is split between concurrent scans and their shards.
+        
+        Returns:
+            Query name -> page source for every query answered from a successful scan
+        """
+        scans, remote = ConsolidatedScan.plan(queries)
+        logger.info(f"Consolidated {sum(len(s.plans) for s in scans)} queries into "
+                    f"{len(scans)} table scan(s); {len(remote)} will run remotely")
+        
+        active = max(1, min(parallel, len(scans)))
+        shard_parallel = max(1, parallel // active)
+        
+        def run(scan: ConsolidatedScan) -> Dict[str, Any]:
+            logger.info(f"Scanning: {scan.table} for {len(scan.plans)} queries")
+            return self.run_consolidated_scan(scan, spool_dir / f"{scan.table}.ndjson", shard_parallel)
+        
+        with ThreadPoolExecutor(max_workers=active) as pool:
+            scan_results = list(pool.map(run, scans))
+        
+        page_sources = {}
+        for scan, scan_result in zip(scans, scan_results):
+            if not scan_result["success"]:
+                logger.warning(f"  → [{scan.table}] Scan failed ({scan_result['error']}); "
+                               f"its queries will run remotely")
+                continue
+            logger.info(f"  → [{scan.table}] Scanned {scan_result['count']} rows "
+                        f"in {scan_result['pages']} page(s)")
+            spool_path = spool_dir / f"{scan.table}.ndjson"
+            for query_name, plan in scan.plans.items():
+                page_sources[query_name] = (
+                    lambda progress, plan=plan, path=spool_path:
+                        self.iter_local_query_pages(plan, path, progress=progress)
+                )
+        
+        results_summary["query_plan"] = {
+            "scans": {scan.table: result for scan, result in zip(scans, scan_results)},
+            "remote": remote
+        }
+        return page_sources
+    
+    def _execute_and_export(
+        self,
+        query_name: str,
+        query_def: Dict,
+        output_dir: Path,
+        export_format: str,
+        parallel: int = 1,
+        delta_from: Optional[Path] = None,
+        page_source: Optional[Callable[[Dict[str, Any]], Iterator[List[Dict[str, Any]]]]] = None,
+        write_baseline: bool = False
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Execute one query definition and write its export files.
+        
+        Args:
+            page_source: Callable taking a progress dict and yielding result
+                pages, used instead of querying Resource Graph (e.g. a
+                consolidated scan); queries remotely if None
+            write_baseline: Also write a baseline for later delta runs
+                (always written when delta_from is set)
+        
+        Returns:
+            Per-query summary entry, or None if the definition has no query text
+        """
+        logger.info(f"Executing: {query_name}")
+        
+        query_text = query_def.get("query", query_def.get("kql", ""))
+        description = query_def.get("description", "")
+        output_file = query_def.get("output_file", f"{query_name}")
+        
+        if not query_text:
+            logger.warning(f"Skipping {query_name}: No query text")
+            return None
+        
+        # Stream pages straight into the export writers
+        key_columns = query_def.get("key")
+        if isinstance(key_columns, str):
+            key_columns = [key_columns]
+        if delta_from is None:
+            writers = open_export_writers(output_dir, output_file, export_format)
+            if write_baseline:
+                writers.append(BaselineWriter(output_dir / "baseline" / f"{output_file}.tsv.gz", key_columns))
+        else:
+            baseline = BaselineWriter(output_dir / "baseline" / f"{output_file}.tsv.gz", key_columns)
+            previous_path = Path(delta_from) / "baseline" / f"{output_file}.tsv.gz"
+            if previous_path.exists():
+                previous = BaselineWriter.load(previous_path)
+            else:
+                logger.warning(f"  → [{query_name}] No baseline in {delta_from}; all rows will be reported as added")
+                previous = {}
+            writers = [SnapshotDelta(
+                previous,
+                baseline,
+                lambda category: open_export_writers(output_dir, f"{output_file}-{category}", export_format)
+            )]
+        progress = {}
+        error = None
+        
+        try:
+            if page_source is not None:
+                pages = page_source(progress)
+            else:
+                pages = self.iter_cached_query_pages(query_text, progress=progress, parallel=parallel)
+            for rows in pages:
+                for writer in list(writers):
+                    try:
+                        writer.write_page(rows)
+                    except Exception as e:
+                        logger.warning(f"  → [{query_name}] {writer.extension.upper()} export failed: {e}")
+                        writer.close()
+                        writers.remove(writer)
+            for writer in writers:
+                if hasattr(writer, "finish"):
+                    writer.finish()
+        except Exception as e:
+            error = e
+        finally:
+            for writer in writers:
+                writer.close()
+        
+        query_result = {
+            "description": description,
+            "success": error is None,
+            "count": progress.get("count", 0),
+            "output_files": []
+        }
+        if progress.get("cached"):
+            query_result["cached"] = True
+        if progress.get("derived_from"):
+            query_result["derived_from"] = progress["derived_from"]
+        
+        for writer in writers:
+            if isinstance(writer, SnapshotDelta):
+                query_result["delta"] = writer.counts
+                logger.info(f"  → [{query_name}] Delta: {writer.counts['added']} added, "
+                            f"{writer.counts['changed']} changed, {writer.counts['removed']} removed")
+            for file_writer in getattr(writer, "writers", [writer]):
+                if file_writer.written:
+                    query_result["output_files"].append(str(file_writer.path))
+                    logger.info(f"  → [{query_name}] Exported {file_writer.count} records to {file_writer.path.name}")
+        
+        if error is not None:
+            query_result["error"] = str(error)
+            if progress.get("skip_token"):
+                query_result["resume_skip_token"] = progress["skip_token"]
+            if progress.get("failed_shards"):
+                query_result["failed_shards"] = progress["failed_shards"]
+            if progress.get("shards"):
+                logger.error(f"  → [{query_name}] Failed: {query_result['error']}")
+            else:
+                logger.error(f"  → [{query_name}] Failed on page {progress.get('pages', 0) + 1}: {query_result['error']}")
+        
+        return query_result
 
 
 def load_queries_from_file(filepath: str) -> Dict[str, Dict]:
@@ -300,7 +2281,8 @@ resources
 | order by ResourceCount desc
 """,
         "description": "Resource count by type",
-        "output_file": "inventory-by-type"
+        "output_file": "inventory-by-type",
+        "key": "type"
     },
     "untagged_resources": {
         "query": """
@@ -329,7 +2311,8 @@ resources
     httpsOnly,
     minTlsVersion,
     allowBlobPublicAccess,
-    networkDefaultAction
+    networkDefaultAction,
+    id
 """,
         "description": "Storage account security configuration (MCSB DP-3, NS-2)",
         "output_file": "storage-security"
@@ -350,7 +2333,8 @@ resources
     enableRbacAuthorization,
     enableSoftDelete,
     enablePurgeProtection,
-    publicNetworkAccess
+    publicNetworkAccess,
+    id
 """,
         "description": "Key Vault configuration (MCSB DP-5, IM-1)",
         "output_file": "keyvaults"
@@ -370,7 +2354,8 @@ resources
     location,
     addressSpace,
     dnsServers,
-    subnets
+    subnets,
+    id
 """,
         "description": "Virtual network inventory",
         "output_file": "vnets"
@@ -392,7 +2377,8 @@ resources
     hasNsg,
     nsgId,
     resourceGroup,
-    subscriptionId
+    subscriptionId,
+    id = tostring(subnet.id)
 """,
         "description": "Subnets with NSG attachment status (MCSB NS-1)",
         "output_file": "subnets-nsg"
@@ -413,7 +2399,8 @@ resources
     peeringState,
     remoteVnet,
     resourceGroup,
-    subscriptionId
+    subscriptionId,
+    id = tostring(peering.id)
 """,
         "description": "VNet peering relationships",
         "output_file": "peerings"
@@ -428,7 +2415,8 @@ resources
     subscriptionId, 
     location,
     rulesCount = array_length(properties.securityRules),
-    defaultRulesCount = array_length(properties.defaultSecurityRules)
+    defaultRulesCount = array_length(properties.defaultSecurityRules),
+    id
 """,
         "description": "Network Security Groups inventory",
         "output_file": "nsgs"
@@ -447,7 +2435,8 @@ authorizationresources
     principalId,
     principalType,
     roleDefinitionId,
-    scope
+    scope,
+    id
 """,
         "description": "RBAC role assignments",
         "output_file": "rbac-assignments"
@@ -465,7 +2454,8 @@ resources
     resourceGroup, 
     subscriptionId,
     identityType,
-    principalId
+    principalId,
+    id
 """,
         "description": "Resources with managed identities (MCSB IM-3)",
         "output_file": "managed-identities"
@@ -484,7 +2474,8 @@ resources
     subscriptionId,
     location,
     minTlsVersion,
-    publicNetworkAccess
+    publicNetworkAccess,
+    id
 """,
         "description": "SQL Server and Database inventory",
         "output_file": "sql-databases"
@@ -505,7 +2496,8 @@ resources
     kind,
     httpsOnly,
     minTlsVersion,
-    ftpsState
+    ftpsState,
+    id
 """,
         "description": "App Service security configuration",
         "output_file": "app-services"
@@ -525,7 +2517,8 @@ policyresources
     policyDefinitionId,
     scope,
     enforcementMode,
-    subscriptionId
+    subscriptionId,
+    id
 """,
         "description": "Azure Policy assignments",
         "output_file": "policy-assignments"
@@ -546,7 +2539,8 @@ securityresources
     severity,
     category,
     resourceId = properties.resourceDetails.Id,
-    subscriptionId
+    subscriptionId,
+    id
 | order by severity asc
 """,
         "description": "Defender for Cloud unhealthy assessments",
@@ -566,7 +2560,8 @@ resources
     location,
     encryptionType,
     diskState,
-    sku = sku.name
+    sku = sku.name,
+    id
 """,
         "description": "Disk encryption status (MCSB DP-4)",
         "output_file": "disk-encryption"
@@ -584,7 +2579,8 @@ resources
     subscriptionId,
     location,
     privateLinkServiceId,
-    groupIds
+    groupIds,
+    id
 """,
         "description": "Private endpoints inventory (MCSB NS-2)",
         "output_file": "private-endpoints"
@@ -604,7 +2600,8 @@ resources
     location,
     ipAddress,
     allocationMethod,
-    associatedResource
+    associatedResource,
+    id
 """,
         "description": "Public IP addresses (exposure analysis)",
         "output_file": "public-ips"
@@ -630,6 +2627,32 @@ Examples:
   # Export only JSON (no CSV)
   python alz_audit_executor.py --format json --output ./exports
 
+  # Export newline-delimited JSON (one resource per line)
+  python alz_audit_executor.py --format ndjson --output ./exports
+
+  # Export typed, compressed columnar files (requires pyarrow)
+  python alz_audit_executor.py --format parquet --output ./exports
+
+  # Run up to 4 queries concurrently
+  python alz_audit_executor.py --parallel 4 --output ./exports
+
+  # Query a large tenant in shards of 200 subscriptions, 8 at a time
+  python alz_audit_executor.py --shard-size 200 --parallel 8 --output ./exports
+
+  # Reuse results cached in the last 10 minutes, or bypass the cache
+  python alz_audit_executor.py --cache-ttl 600 --output ./exports
+  python alz_audit_executor.py --no-cache --output ./exports
+
+  # Record a baseline, then later export only what changed since that run
+  python alz_audit_executor.py --baseline --output ./exports-previous
+  python alz_audit_executor.py --delta-from ./exports-previous --output ./exports
+
+  # Scan each shared table once and derive the per-query exports locally
+  python alz_audit_executor.py --consolidate --output ./exports
+
+  # Lower the Resource Graph request budget and allow more retries
+  python alz_audit_executor.py --quota 10 --max-retries 8 --output ./exports
+
   # Run a single ad-hoc query
   python alz_audit_executor.py --query "resources | summarize count() by type" --output ./exports
         """
@@ -650,7 +2673,7 @@ Examples:
     )
     parser.add_argument(
         "--format", "-f",
-        choices=["json", "csv", "both"],
+        choices=list(EXPORT_FORMATS),
         default="both",
         help="Export format (default: both)"
     )
@@ -663,6 +2686,71 @@ Examples:
         default="adhoc_query",
         help="Name for ad-hoc query output file"
     )
+    parser.add_argument(
+        "--parallel", "-p",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Run up to N Resource Graph requests concurrently, shared between queries "
+             "and their subscription shards (default: 1, sequential)"
+    )
+    parser.add_argument(
+        "--quota",
+        type=int,
+        default=15,
+        help="Resource Graph requests allowed per 5-second window, shared by all queries (default: 15)"
+    )
+    parser.add_argument(
+        "--max-retries",
+        type=int,
+        default=5,
+        help="Retries per page on throttling or transient errors (default: 5)"
+    )
+    parser.add_argument(
+        "--shard-size",
+        type=int,
+        default=1000,
+        help="Maximum subscriptions per Resource Graph request; larger lists are "
+             "queried in parallel shards and merged (default: 1000)"
+    )
+    parser.add_argument(
+        "--cache-dir",
+        default=str(Path.home() / ".cache" / "alz-audit"),
+        help="Directory for cached query results (default: ~/.cache/alz-audit)"
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=900,
+        help="Seconds a cached query result stays valid (default: 900)"
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=int,
+        default=1024,
+        help="Cache size above which least recently used results are evicted (default: 1024)"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always query Resource Graph and do not store results in the cache"
+    )
+    parser.add_argument(
+        "--delta-from",
+        metavar="DIR",
+        help="Previous export directory; export only resources added, changed or removed since then"
+    )
+    parser.add_argument(
+        "--consolidate",
+        action="store_true",
+        help="Scan each source table once and evaluate the queries that share it locally"
+    )
+    parser.add_argument(
+        "--baseline",
+        action="store_true",
+        help="Write a compact baseline/<output>.tsv.gz per query for later --delta-from runs "
+             "(always written with --delta-from)"
+    )
     parser.add_argument(
         "--verbose", "-v",
         action="store_true",
@@ -674,6 +2762,10 @@ Examples:
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
     
+    if args.format in ("parquet", "arrow") and not PYARROW_AVAILABLE:
+        logger.error(f"--format {args.format} requires pyarrow. Run: pip install pyarrow")
+        return 1
+    
     # Parse subscription filter
     subscription_ids = None
     if args.subscriptions:
@@ -684,8 +2776,21 @@ Examples:
     logger.info("ALZ Snapshot Audit - Query Executor")
     logger.info("=" * 60)
     
+    cache = None
+    if not args.no_cache:
+        cache = QueryResultCache(
+            Path(args.cache_dir),
+            ttl_seconds=args.cache_ttl,
+            max_bytes=args.cache_max_mb * 1024 * 1024
+        )
+    
     try:
-        executor = ALZAuditExecutor(subscription_ids=subscription_ids)
+        executor = ALZAuditExecutor(
+            subscription_ids=subscription_ids,
+            scheduler=RateLimitScheduler(quota=args.quota, max_retries=args.max_retries),
+            shard_size=args.shard_size,
+            cache=cache
+        )
     except Exception as e:
         logger.error(f"Failed to initialize Azure connection: {e}")
         logger.error("Ensure you are logged in: az login")
@@ -713,13 +2818,25 @@ Examples:
     logger.info(f"Queries to execute: {len(queries)}")
     logger.info(f"Output directory: {args.output}")
     logger.info(f"Export format: {args.format}")
+    if args.delta_from:
+        logger.info(f"Delta against: {args.delta_from}")
+    elif args.baseline:
+        logger.info("Writing delta baselines")
+    logger.info(f"Parallelism: {args.parallel}")
+    if args.consolidate:
+        logger.info("Query plan: consolidated table scans")
+    logger.info(f"Result cache: {'disabled' if args.no_cache else f'{args.cache_dir} (TTL {args.cache_ttl:g}s)'}")
     logger.info("-" * 60)
     
     # Execute queries
     summary = executor.execute_query_batch(
         queries=queries,
         output_dir=Path(args.output),
-        export_format=args.format
+        export_format=args.format,
+        parallel=max(1, args.parallel),
+        delta_from=Path(args.delta_from) if args.delta_from else None,
+        consolidate=args.consolidate,
+        write_baseline=args.baseline
     )
     
     # Print summary
@@ -10,6 +10,11 @@
 #   ./run_audit.sh                    # Run with defaults
 #   ./run_audit.sh --subscriptions "sub1,sub2"  # Filter subscriptions
 #   ./run_audit.sh --output ./my-exports        # Custom output directory
+#   ./run_audit.sh --parallel 4                 # Run 4 queries concurrently
+#   ./run_audit.sh --no-cache                   # Ignore cached query results
+#   ./run_audit.sh --consolidate                # One scan per table, filter locally
+#   ./run_audit.sh --baseline                   # Also write baseline/*.tsv.gz for delta runs
+#   ./run_audit.sh --delta-from ./prev-exports  # Export only changes since a baseline run
 #
 #===============================================================================
 
@@ -20,6 +25,8 @@ SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 OUTPUT_DIR="${OUTPUT_DIR:-./alz-audit-exports-$(date +%Y%m%d-%H%M%S)}"
 PYTHON_SCRIPT="${SCRIPT_DIR}/alz_audit_executor.py"
 QUERIES_FILE="${SCRIPT_DIR}/05-ALZ-SS-Audit-KQL-Queries-v1.json"
+COMPLIANCE_SCRIPT="${SCRIPT_DIR}/alz_compliance_engine.py"
+MAPPING_FILE="${SCRIPT_DIR}/06-ALZ-SS-Audit-Compliance-Mapping-v1.json"
 
 # Colors for output
 RED='\033[0;31m'
@@ -116,6 +123,36 @@ run_audit() {
         CMD="$CMD --subscriptions $SUBSCRIPTIONS"
     fi
     
+    # Add query concurrency if provided
+    if [[ -n "$PARALLEL" ]]; then
+        CMD="$CMD --parallel $PARALLEL"
+        log_info "Query concurrency: $PARALLEL"
+    fi
+    
+    # Bypass the query result cache if requested
+    if [[ "$NO_CACHE" == true ]]; then
+        CMD="$CMD --no-cache"
+        log_info "Query result cache disabled"
+    fi
+    
+    # Scan each shared table once and derive the exports locally
+    if [[ "$CONSOLIDATE" == true ]]; then
+        CMD="$CMD --consolidate"
+        log_info "Query plan: consolidated table scans"
+    fi
+    
+    # Write baseline/*.tsv.gz fingerprints for later delta runs
+    if [[ "$BASELINE" == true ]]; then
+        CMD="$CMD --baseline"
+        log_info "Writing delta baselines to: $OUTPUT_DIR/baseline"
+    fi
+    
+    # Export only what changed since an earlier baseline run
+    if [[ -n "$DELTA_FROM" ]]; then
+        CMD="$CMD --delta-from $DELTA_FROM"
+        log_info "Delta against: $DELTA_FROM"
+    fi
+    
     # Execute
     echo ""
     log_info "Executing queries..."
@@ -148,6 +185,21 @@ run_defender_export() {
     log_success "Defender data exported"
 }
 
+run_compliance_evaluation() {
+    if [[ ! -f "$COMPLIANCE_SCRIPT" || ! -f "$MAPPING_FILE" ]]; then
+        log_warning "Compliance engine or mapping not found; skipping control evaluation"
+        return
+    fi
+    
+    log_info "Evaluating exports against compliance mapping..."
+    python3 "$COMPLIANCE_SCRIPT" --exports "$OUTPUT_DIR" --mapping "$MAPPING_FILE" \
+        --output "$OUTPUT_DIR/compliance-report.json" || {
+        log_warning "Compliance evaluation failed; exports are unaffected"
+        return
+    }
+    log_success "Compliance report: $OUTPUT_DIR/compliance-report.json"
+}
+
 generate_summary_report() {
     log_info "Generating summary report..."
     
@@ -185,7 +237,7 @@ fi)
 1. Review \`execution_summary.json\` for query results
 2. Import \`*.csv\` files to Excel for analysis
 3. Review \`defender-findings.json\` for security gaps
-4. Map findings to MCSB controls using compliance mapping
+4. Review \`compliance-report.json\` for per-control pass/fail and offending resources
 
 EOF
 
@@ -202,6 +254,13 @@ Options:
     -o, --output DIR        Output directory (default: ./alz-audit-exports-TIMESTAMP)
     -s, --subscriptions IDs Comma-separated subscription IDs to query
     -c, --config FILE       Custom queries JSON file
+    -p, --parallel N        Run up to N queries concurrently
+        --no-cache          Re-run every query instead of reusing cached results
+        --consolidate       Scan each table once and derive per-query exports locally
+        --baseline          Also write baseline/*.tsv.gz (one compact row fingerprint
+                            file per query) so a later run can use --delta-from
+        --delta-from DIR    Export only rows added, changed or removed since the
+                            baseline in DIR (writes a new baseline as well)
     -d, --defender          Also export Defender for Cloud data
     -l, --list-subs         List available subscriptions and exit
     -h, --help              Show this help message
@@ -210,6 +269,9 @@ Examples:
     $0                                  # Run with defaults (all subscriptions)
     $0 -s "sub1-guid,sub2-guid"        # Filter to specific subscriptions
     $0 -o ./my-audit -d                 # Custom output + Defender data
+    $0 -p 4                             # Run 4 queries concurrently
+    $0 -o ./week1 --baseline            # Full export plus delta baseline
+    $0 -o ./week2 --delta-from ./week1  # Only what changed since week1
     $0 -l                               # List subscriptions
 
 EOF
@@ -221,6 +283,11 @@ EOF
 
 # Parse arguments
 SUBSCRIPTIONS=""
+PARALLEL=""
+NO_CACHE=false
+CONSOLIDATE=false
+BASELINE=false
+DELTA_FROM=""
 INCLUDE_DEFENDER=false
 
 while [[ $# -gt 0 ]]; do
@@ -237,6 +304,26 @@ while [[ $# -gt 0 ]]; do
             QUERIES_FILE="$2"
             shift 2
             ;;
+        -p|--parallel)
+            PARALLEL="$2"
+            shift 2
+            ;;
+        --no-cache)
+            NO_CACHE=true
+            shift
+            ;;
+        --consolidate)
+            CONSOLIDATE=true
+            shift
+            ;;
+        --baseline)
+            BASELINE=true
+            shift
+            ;;
+        --delta-from)
+            DELTA_FROM="$2"
+            shift 2
+            ;;
         -d|--defender)
             INCLUDE_DEFENDER=true
             shift
@@ -278,6 +365,8 @@ if [[ "$INCLUDE_DEFENDER" == true ]]; then
     run_defender_export
 fi
 
+run_compliance_evaluation
+
 generate_summary_report
 
 echo ""
@@ -288,4 +377,5 @@ echo "  - $OUTPUT_DIR/AUDIT_SUMMARY.md      (Quick overview)"
 echo "  - $OUTPUT_DIR/execution_summary.json (Detailed results)"
 echo "  - $OUTPUT_DIR/inventory-full.json    (All resources)"
 echo "  - $OUTPUT_DIR/defender-findings.json (Security gaps)"
+echo "  - $OUTPUT_DIR/compliance-report.json (Control pass/fail)"
 echo ""
@@ -0,0 +1,417 @@
+#!/usr/bin/env python3
+"""
+ALZ Snapshot Audit - Offline Resource Graph Emulator
+=====================================================
+Local stand-in for ResourceGraphClient and SubscriptionClient so the
+query executor can be exercised, benchmarked and regression-tested
+without a live Azure tenant.
+
+Synthetic resources are generated deterministically from their position
+in the estate, so millions of rows can be served without holding them
+in memory. The emulator reproduces the behaviour the executor depends on:
+
+    - Paging with top / skip_token and total_records
+    - Subscription scoping of each request
+    - Per-page latency
+    - Quota throttling (HTTP 429 with x-ms-user-quota-resets-after)
+    - Optional random transient failures (HTTP 503)
+
+KQL is not evaluated. Requests are routed by source table and any
+`type == '...'` or `type in~ (...)` filters; summarize queries return a
+count by type. Rows carry both the flattened columns the built-in
+queries project and the raw properties / identity bags, so consolidated
+scans can be evaluated locally by the executor.
+
+Usage:
+    from importlib.util import spec_from_file_location, module_from_spec
+    spec = spec_from_file_location("emulator", "14-ALZ-SS-Audit-RG-Emulator-v1.py")
+    emulator = module_from_spec(spec); spec.loader.exec_module(emulator)
+
+    estate = emulator.SyntheticEstate(subscriptions=50, resources_per_subscription=20000)
+    executor = ALZAuditExecutor(
+        subscription_ids=estate.subscription_ids,
+        resource_graph_client=emulator.EmulatedResourceGraphClient(estate, latency=0.05),
+        subscription_client=emulator.EmulatedSubscriptionClient(estate)
+    )
+"""
+
+import base64
+import random
+import re
+import threading
+import time
+import zlib
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# Resource types served from the resources table, weighted roughly like a real estate
+RESOURCE_TYPES = [
+    ("microsoft.compute/disks", 6),
+    ("microsoft.network/networkinterfaces", 5),
+    ("microsoft.compute/virtualmachines", 4),
+    ("microsoft.storage/storageaccounts", 3),
+    ("microsoft.network/networksecuritygroups", 2),
+    ("microsoft.network/publicipaddresses", 2),
+    ("microsoft.web/sites", 2),
+    ("microsoft.network/virtualnetworks", 1),
+    ("microsoft.keyvault/vaults", 1),
+    ("microsoft.sql/servers", 1),
+    ("microsoft.sql/servers/databases", 1),
+    ("microsoft.network/privateendpoints", 1),
+]
+
+# Single-type tables and the share of the resources count they hold
+SIDE_TABLES = {
+    "authorizationresources": ("microsoft.authorization/roleassignments", 0.25),
+    "policyresources": ("microsoft.authorization/policyassignments", 0.05),
+    "securityresources": ("microsoft.security/assessments", 0.5),
+}
+
+LOCATIONS = ["uksouth", "ukwest", "westeurope", "northeurope"]
+ENVIRONMENTS = ["prod", "nonprod", "dev", "test"]
+
+
+class EmulatedThrottleError(Exception):
+    """HTTP 429 raised when the emulated per-user quota is exhausted."""
+
+    status_code = 429
+
+    def __init__(self, resets_after: float):
+        super().__init__(f"(RateLimiting) Quota exceeded, resets after {resets_after:.2f}s")
+        whole = int(resets_after)
+        fraction = resets_after - whole
+        self.response = SimpleNamespace(headers={
+            "x-ms-user-quota-remaining": "0",
+            "x-ms-user-quota-resets-after":
+                f"{whole // 3600:02d}:{whole % 3600 // 60:02d}:{whole % 60 + fraction:06.3f}"
+        })
+
+
+class EmulatedServiceError(Exception):
+    """HTTP 503 raised for emulated transient failures."""
+
+    status_code = 503
+
+    def __init__(self):
+        super().__init__("(ServiceUnavailable) Emulated transient failure")
+        self.response = SimpleNamespace(headers={})
+
+
+class SyntheticEstate:
+    """
+    A deterministic synthetic Azure estate.
+
+    Every subscription holds the same number of resources; resource j of
+    a subscription has type RESOURCE_TYPES expanded by weight at j modulo
+    the weight total, so rows of one type can be addressed directly.
+    """
+
+    def __init__(
+        self,
+        subscriptions: int = 10,
+        resources_per_subscription: int = 1000,
+        seed: int = 42
+    ):
+        self.subscription_ids = [
+            f"{seed:08x}-0000-4000-8000-{i:012x}" for i in range(subscriptions)
+        ]
+        self.resources_per_subscription = resources_per_subscription
+        self.seed = seed
+        self._type_cycle = [t for t, weight in RESOURCE_TYPES for _ in range(weight)]
+        self._index_cache: Dict[Tuple[str, Tuple[str, ...]], List[int]] = {}
+
+    @property
+    def total_resources(self) -> int:
+        return len(self.subscription_ids) * self.resources_per_subscription
+
+    def type_of(self, table: str, j: int) -> str:
+        """Resource type of local row j in a table."""
+        if table in SIDE_TABLES:
+            return SIDE_TABLES[table][0]
+        return self._type_cycle[j % len(self._type_cycle)]
+
+    def rows_per_subscription(self, table: str, resource_types: Tuple[str, ...] = ()) -> List[int]:
+        """Return the local row indices within one subscription that match a request."""
+        key = (table, resource_types)
+        if key not in self._index_cache:
+            if table in SIDE_TABLES:
+                count = int(self.resources_per_subscription * SIDE_TABLES[table][1])
+            else:
+                count = self.resources_per_subscription
+            self._index_cache[key] = [
+                j for j in range(count)
+                if not resource_types or self.type_of(table, j) in resource_types
+            ]
+        return self._index_cache[key]
+
+    def resource(self, table: str, subscription_id: str, j: int) -> Dict[str, Any]:
+        """Build the row at local index j of a subscription."""
+        resource_type = self.type_of(table, j)
+        short_type = resource_type.rsplit("/", 1)[-1]
+        rg = f"rg-{ENVIRONMENTS[j % len(ENVIRONMENTS)]}-{j % 17:02d}"
+        name = f"{short_type[:10]}-{subscription_id[-4:]}-{j:07d}"
+        rid = (f"/subscriptions/{subscription_id}/resourceGroups/{rg}/providers/"
+               f"{resource_type}/{name}")
+        h = zlib.crc32(f"{self.seed}:{subscription_id}:{j}".encode())
+
+        row = {
+            "id": rid,
+            "name": name,
+            "type": resource_type,
+            "resourceGroup": rg,
+            "subscriptionId": subscription_id,
+            "location": LOCATIONS[h % len(LOCATIONS)],
+            "kind": "",
+            "sku": {"name": "Standard_LRS" if h & 1 else "Premium_LRS"},
+            "tags": {} if h % 5 == 0 else {
+                "environment": ENVIRONMENTS[j % len(ENVIRONMENTS)],
+                "costCentre": f"CC{h % 40:03d}"
+            },
+            "httpsOnly": h % 7 != 0,
+            "minTlsVersion": "TLS1_0" if h % 11 == 0 else "TLS1_2",
+            "publicNetworkAccess": "Enabled" if h % 3 == 0 else "Disabled",
+        }
+        if resource_type == "microsoft.network/virtualnetworks":
+            row["addressSpace"] = [f"10.{h % 256}.0.0/16"]
+            row["subnets"] = 1 + h % 6
+        elif resource_type == "microsoft.network/privateendpoints":
+            row["groupIds"] = ["blob"] if h & 1 else ["vault"]
+        elif resource_type == "microsoft.authorization/roleassignments":
+            row["principalId"] = f"{h:08x}-0000-4000-8000-{j:012x}"
+            row["principalType"] = "User" if h & 1 else "ServicePrincipal"
+            row["scope"] = f"/subscriptions/{subscription_id}"
+        elif resource_type == "microsoft.security/assessments":
+            row["status"] = "Unhealthy" if h % 4 == 0 else "Healthy"
+            row["severity"] = ["High", "Medium", "Low"][h % 3]
+        row["properties"] = self._properties(row, h, j)
+        if h % 4 == 1:
+            row["identity"] = {"type": "SystemAssigned", "principalId": f"{h:08x}-1111-4000-8000-{j:012x}"}
+        return row
+
+    @staticmethod
+    def _properties(row: Dict[str, Any], h: int, j: int) -> Dict[str, Any]:
+        """Raw properties bag for a row, consistent with its flattened columns."""
+        resource_type = row["type"]
+        rid = row["id"]
+        if resource_type == "microsoft.storage/storageaccounts":
+            return {
+                "supportsHttpsTrafficOnly": row["httpsOnly"],
+                "minimumTlsVersion": row["minTlsVersion"],
+                "allowBlobPublicAccess": h % 6 == 0,
+                "networkAcls": {"defaultAction": "Allow" if h % 3 == 0 else "Deny"}
+            }
+        if resource_type == "microsoft.keyvault/vaults":
+            return {
+                "enableRbacAuthorization": h % 2 == 0,
+                "enableSoftDelete": True,
+                "enablePurgeProtection": h % 5 != 0 or None,
+                "publicNetworkAccess": row["publicNetworkAccess"]
+            }
+        if resource_type == "microsoft.network/virtualnetworks":
+            subnets = []
+            for k in range(row["subnets"]):
+                subnet = {"name": f"snet-{k}", "properties": {"addressPrefix": f"10.{h % 256}.{k}.0/24"}}
+                if (h + k) % 4:
+                    subnet["properties"]["networkSecurityGroup"] = {"id": f"{rid}-nsg-{k}"}
+                subnets.append(subnet)
+            return {
+                "addressSpace": {"addressPrefixes": row["addressSpace"]},
+                "dhcpOptions": {"dnsServers": []},
+                "subnets": subnets,
+                "virtualNetworkPeerings": [
+                    {"name": f"peer-hub-{j}", "properties": {
+                        "peeringState": "Connected" if h % 9 else "Disconnected",
+                        "remoteVirtualNetwork": {"id": f"{rid.rsplit('/', 1)[0]}/vnet-hub"}
+                    }}
+                ] if h % 3 else []
+            }
+        if resource_type == "microsoft.network/networksecuritygroups":
+            return {"securityRules": [{"name": f"rule-{k}"} for k in range(h % 8)],
+                    "defaultSecurityRules": [{"name": f"default-{k}"} for k in range(6)]}
+        if resource_type in ("microsoft.sql/servers", "microsoft.sql/servers/databases"):
+            return {"minimalTlsVersion": "1.0" if h % 11 == 0 else "1.2",
+                    "publicNetworkAccess": row["publicNetworkAccess"]}
+        if resource_type == "microsoft.web/sites":
+            return {"httpsOnly": row["httpsOnly"],
+                    "siteConfig": {"minTlsVersion": "1.0" if h % 11 == 0 else "1.2",
+                                   "ftpsState": "AllAllowed" if h % 5 == 0 else "FtpsOnly"}}
+        if resource_type == "microsoft.compute/disks":
+            return {"encryption": {"type": "EncryptionAtRestWithPlatformKey"},
+                    "diskState": "Attached" if h % 6 else "Unattached"}
+        if resource_type == "microsoft.network/privateendpoints":
+            return {"privateLinkServiceConnections": [{"properties": {
+                "privateLinkServiceId": f"{rid}-target", "groupIds": row["groupIds"]}}]}
+        if resource_type == "microsoft.network/publicipaddresses":
+            return {"ipAddress": f"20.{h % 256}.{j % 256}.{(h >> 8) % 256}",
+                    "publicIPAllocationMethod": "Static" if h & 1 else "Dynamic"}
+        if resource_type == "microsoft.authorization/roleassignments":
+            return {"principalId": row["principalId"], "principalType": row["principalType"],
+                    "roleDefinitionId": f"/providers/Microsoft.Authorization/roleDefinitions/{h % 5}",
+                    "scope": row["scope"]}
+        if resource_type == "microsoft.authorization/policyassignments":
+            return {"displayName": f"Policy {j}", "policyDefinitionId": f"/providers/policy/{h % 50}",
+                    "scope": f"/subscriptions/{row['subscriptionId']}",
+                    "enforcementMode": "Default" if h % 4 else "DoNotEnforce"}
+        if resource_type == "microsoft.security/assessments":
+            return {"displayName": f"Assessment {h % 60}", "status": {"code": row["status"]},
+                    "metadata": {"severity": row["severity"], "categories": ["Compute"]},
+                    "resourceDetails": {"Id": f"/subscriptions/{row['subscriptionId']}/resource-{j}"}}
+        return {}
+
+
+class EmulatedResourceGraphClient:
+    """
+    Drop-in replacement for ResourceGraphClient backed by a SyntheticEstate.
+
+    Thread-safe; counters (calls, pages, rows, throttled, failures) can be
+    read after a run to check how the executor behaved.
+    """
+
+    def __init__(
+        self,
+        estate: SyntheticEstate,
+        latency: float = 0.0,
+        latency_per_row: float = 0.0,
+        quota: int = 0,
+        quota_window: float = 5.0,
+        failure_rate: float = 0.0,
+        seed: int = 0
+    ):
+        """
+        Args:
+            estate: Synthetic estate to serve
+            latency: Fixed seconds of latency per request
+            latency_per_row: Additional seconds of latency per returned row
+            quota: Requests allowed per quota window (0 disables throttling)
+            quota_window: Length of the quota window in seconds
+            failure_rate: Probability of a transient 503 per request
+            seed: Seed for the failure generator
+        """
+        self.estate = estate
+        self.latency = latency
+        self.latency_per_row = latency_per_row
+        self.quota = quota
+        self.quota_window = quota_window
+        self.failure_rate = failure_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._window_start = time.monotonic()
+        self._window_used = 0
+        self.calls = 0
+        self.pages = 0
+        self.rows = 0
+        self.throttled = 0
+        self.failures = 0
+
+    def resources(self, query_request: Any) -> SimpleNamespace:
+        """Serve one page of a Resource Graph query."""
+        with self._lock:
+            self.calls += 1
+            self._check_quota()
+            if self.failure_rate and self._random.random() < self.failure_rate:
+                self.failures += 1
+                raise EmulatedServiceError()
+
+        table, resource_types, summarize = self._route(query_request.query)
+        subscriptions = query_request.subscriptions or self.estate.subscription_ids
+        options = query_request.options
+        top = (getattr(options, "top", None) or 1000) if options else 1000
+        offset = self._decode_token(getattr(options, "skip_token", None) if options else None)
+
+        if summarize:
+            data, total = self._summarize(table, resource_types, subscriptions), None
+            next_token = None
+        else:
+            data, total = self._page(table, resource_types, subscriptions, offset, top)
+            next_token = self._encode_token(offset + len(data)) if offset + len(data) < total else None
+
+        delay = self.latency + self.latency_per_row * len(data)
+        if delay:
+            time.sleep(delay)
+
+        with self._lock:
+            self.pages += 1
+            self.rows += len(data)
+
+        count = len(data)
+        return SimpleNamespace(
+            data=data,
+            skip_token=next_token,
+            total_records=total if total is not None else count,
+            count=count,
+            result_truncated="false"
+        )
+
+    def _check_quota(self) -> None:
+        if not self.quota:
+            return
+        now = time.monotonic()
+        if now - self._window_start >= self.quota_window:
+            self._window_start = now
+            self._window_used = 0
+        if self._window_used >= self.quota:
+            self.throttled += 1
+            raise EmulatedThrottleError(self.quota_window - (now - self._window_start))
+        self._window_used += 1
+
+    @staticmethod
+    def _route(query: str) -> Tuple[str, Tuple[str, ...], bool]:
+        text = re.sub(r'//[^\n]*', '', query).strip()
+        table = text.split("|", 1)[0].strip().lower() or "resources"
+        types = re.findall(r"\btype\s*(?:==|=~)\s*'([^']+)'", text, re.I)
+        for listed in re.findall(r"\btype\s+in~?\s*\(([^)]*)\)", text, re.I):
+            types.extend(re.findall(r"'([^']+)'", listed))
+        summarize = re.search(r'\|\s*summarize\b', text, re.I) is not None
+        return table, tuple(sorted({t.lower() for t in types})), summarize
+
+    def _page(
+        self,
+        table: str,
+        resource_types: Tuple[str, ...],
+        subscriptions: List[str],
+        offset: int,
+        top: int
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        local = self.estate.rows_per_subscription(table, resource_types)
+        total = len(local) * len(subscriptions)
+        data = []
+        for position in range(offset, min(offset + top, total)):
+            sub_index, local_index = divmod(position, len(local))
+            data.append(self.estate.resource(table, subscriptions[sub_index], local[local_index]))
+        return data, total
+
+    def _summarize(
+        self,
+        table: str,
+        resource_types: Tuple[str, ...],
+        subscriptions: List[str]
+    ) -> List[Dict[str, Any]]:
+        counts: Dict[str, int] = {}
+        for j in self.estate.rows_per_subscription(table, resource_types):
+            t = self.estate.type_of(table, j)
+            counts[t] = counts.get(t, 0) + len(subscriptions)
+        return [
+            {"type": t, "ResourceCount": n}
+            for t, n in sorted(counts.items(), key=lambda item: item[1], reverse=True)
+        ]
+
+    @staticmethod
+    def _encode_token(offset: int) -> str:
+        return base64.urlsafe_b64encode(f"offset:{offset}".encode()).decode()
+
+    @staticmethod
+    def _decode_token(token: Optional[str]) -> int:
+        if not token:
+            return 0
+        return int(base64.urlsafe_b64decode(token.encode()).decode().split(":", 1)[1])
+
+
+class EmulatedSubscriptionClient:
+    """Drop-in replacement for SubscriptionClient listing the estate's subscriptions."""
+
+    def __init__(self, estate: SyntheticEstate):
+        self.subscriptions = SimpleNamespace(list=lambda: [
+            SimpleNamespace(subscription_id=sub, display_name=f"sub-{i:04d}", state="Enabled")
+            for i, sub in enumerate(estate.subscription_ids)
+        ])
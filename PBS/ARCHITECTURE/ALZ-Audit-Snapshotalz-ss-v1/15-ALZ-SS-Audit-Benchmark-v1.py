@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+ALZ Snapshot Audit - Executor Benchmark
+========================================
+Measures ALZAuditExecutor.execute_query_batch throughput against the
+offline Resource Graph emulator, so performance changes can be compared
+without a live Azure tenant.
+
+Each scenario (concurrency x export format) runs in its own process and
+reports rows/s, pages/s and peak RSS for that run alone.
+
+Requirements:
+    pip install azure-identity azure-mgmt-resourcegraph azure-mgmt-resource
+    pip install pyarrow   # only for parquet/arrow scenarios
+
+Usage:
+    python 15-ALZ-SS-Audit-Benchmark-v1.py
+    python 15-ALZ-SS-Audit-Benchmark-v1.py --subscriptions 50 --resources-per-subscription 20000
+    python 15-ALZ-SS-Audit-Benchmark-v1.py --parallel 1,4,8 --formats json,csv,parquet --latency 0.05
+    python 15-ALZ-SS-Audit-Benchmark-v1.py --quota 15 --report benchmark.json
+    python 15-ALZ-SS-Audit-Benchmark-v1.py --consolidate both --quota 15
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from importlib.util import module_from_spec, spec_from_file_location
+from pathlib import Path
+from typing import Any, Dict, List
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+EXECUTOR_FILE = SCRIPT_DIR / "11-ALZ-SS-Audit-Query-Executor-v1.py"
+EMULATOR_FILE = SCRIPT_DIR / "14-ALZ-SS-Audit-RG-Emulator-v1.py"
+
+
+def load_module(name: str, path: Path) -> Any:
+    """Import a numbered script file as a module."""
+    spec = spec_from_file_location(name, path)
+    module = module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB (0 if unavailable)."""
+    if resource is None:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KB on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_scenario(scenario: Dict[str, Any]) -> Dict[str, Any]:
+    """Run one benchmark scenario in the current (fresh) process."""
+    executor_module = load_module("alz_audit_executor", EXECUTOR_FILE)
+    emulator = load_module("alz_rg_emulator", EMULATOR_FILE)
+    executor_module.logger.setLevel("WARNING")
+
+    estate = emulator.SyntheticEstate(
+        subscriptions=scenario["subscriptions"],
+        resources_per_subscription=scenario["resources_per_subscription"]
+    )
+    client = emulator.EmulatedResourceGraphClient(
+        estate,
+        latency=scenario["latency"],
+        quota=scenario["quota"]
+    )
+    executor = executor_module.ALZAuditExecutor(
+        subscription_ids=estate.subscription_ids,
+        resource_graph_client=client,
+        subscription_client=emulator.EmulatedSubscriptionClient(estate),
+        scheduler=executor_module.RateLimitScheduler(quota=scenario["quota"] or 1_000_000),
+        shard_size=scenario["shard_size"]
+    )
+
+    queries = executor_module.BUILTIN_QUERIES
+    baseline_rss = peak_rss_mb()
+    with tempfile.TemporaryDirectory(prefix="alz-bench-") as output_dir:
+        started = time.perf_counter()
+        summary = executor.execute_query_batch(
+            queries=queries,
+            output_dir=Path(output_dir),
+            export_format=scenario["format"],
+            parallel=scenario["parallel"],
+            consolidate=scenario["consolidate"]
+        )
+        elapsed = time.perf_counter() - started
+        output_bytes = sum(p.stat().st_size for p in Path(output_dir).rglob("*") if p.is_file())
+
+    rows = sum(q["count"] for q in summary["queries"].values())
+    return {
+        **scenario,
+        "seconds": round(elapsed, 3),
+        "rows": rows,
+        "pages": client.pages,
+        "calls": client.calls,
+        "rows_per_sec": round(rows / elapsed, 1) if elapsed else None,
+        "pages_per_sec": round(client.pages / elapsed, 1) if elapsed else None,
+        "throttled": client.throttled,
+        "failed_queries": summary["failed"],
+        "output_mb": round(output_bytes / (1024 * 1024), 2),
+        "import_rss_mb": round(baseline_rss, 1),
+        "peak_rss_mb": round(peak_rss_mb(), 1)
+    }
+
+
+def run_isolated(scenario: Dict[str, Any]) -> Dict[str, Any]:
+    """Run a scenario in a fresh worker process so peak RSS is per scenario."""
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        return pool.submit(run_scenario, scenario).result()
+
+
+def print_table(results: List[Dict[str, Any]]) -> None:
+    """Print benchmark results as a fixed-width table."""
+    columns = [
+        ("format", 8), ("parallel", 8), ("consolidate", 11), ("rows", 10), ("calls", 6), ("seconds", 9),
+        ("rows_per_sec", 13), ("pages_per_sec", 13), ("throttled", 9),
+        ("output_mb", 10), ("peak_rss_mb", 11)
+    ]
+    print(" ".join(f"{name:>{width}}" for name, width in columns))
+    print(" ".join("-" * width for _, width in columns))
+    for result in results:
+        print(" ".join(f"{str(result[name]):>{width}}" for name, width in columns))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the ALZ audit executor against the offline Resource Graph emulator"
+    )
+    parser.add_argument("--subscriptions", type=int, default=10,
+                        help="Synthetic subscriptions (default: 10)")
+    parser.add_argument("--resources-per-subscription", type=int, default=5000,
+                        help="Synthetic resources per subscription (default: 5000)")
+    parser.add_argument("--parallel", default="1,4,8",
+                        help="Comma-separated query concurrency levels (default: 1,4,8)")
+    parser.add_argument("--formats", default="json,csv,ndjson",
+                        help="Comma-separated export formats (default: json,csv,ndjson)")
+    parser.add_argument("--latency", type=float, default=0.02,
+                        help="Emulated seconds of latency per page (default: 0.02)")
+    parser.add_argument("--quota", type=int, default=0,
+                        help="Emulated requests per 5s window; 0 disables throttling (default: 0)")
+    parser.add_argument("--shard-size", type=int, default=1000,
+                        help="Executor subscription shard size (default: 1000)")
+    parser.add_argument("--consolidate", choices=["off", "on", "both"], default="off",
+                        help="Run with per-table consolidated scans off, on, or both (default: off)")
+    parser.add_argument("--report", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    scenarios = [
+        {
+            "format": fmt.strip(),
+            "parallel": int(parallel),
+            "subscriptions": args.subscriptions,
+            "resources_per_subscription": args.resources_per_subscription,
+            "latency": args.latency,
+            "quota": args.quota,
+            "shard_size": args.shard_size,
+            "consolidate": consolidate
+        }
+        for fmt in args.formats.split(",")
+        for parallel in args.parallel.split(",")
+        for consolidate in {"off": [False], "on": [True], "both": [False, True]}[args.consolidate]
+    ]
+
+    print(f"Estate: {args.subscriptions} subscriptions x {args.resources_per_subscription} resources "
+          f"({args.subscriptions * args.resources_per_subscription:,} rows), "
+          f"latency {args.latency}s/page, quota {args.quota or 'unlimited'}")
+    print()
+
+    results = []
+    for scenario in scenarios:
+        results.append(run_isolated(scenario))
+        print(f"  done: {scenario['format']} x{scenario['parallel']}"
+              f"{' consolidated' if scenario['consolidate'] else ''} in {results[-1]['seconds']}s")
+    print()
+    print_table(results)
+
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump({"results": results}, f, indent=2)
+        print(f"\nReport saved to {args.report}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
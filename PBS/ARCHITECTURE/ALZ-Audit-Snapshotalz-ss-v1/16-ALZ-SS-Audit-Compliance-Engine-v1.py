@@ -0,0 +1,640 @@
+#!/usr/bin/env python3
+"""
+ALZ Snapshot Audit - Compliance Evaluation Engine
+==================================================
+Evaluates the query executor's exports against the control mappings in
+06-ALZ-SS-Audit-Compliance-Mapping-v1.json and reports, per control,
+how many resources pass or fail and which resources fail.
+
+Each export is loaded once into a columnar pandas DataFrame (reading
+only the columns the checks need), and every check is a vectorised
+predicate over whole columns, e.g. httpsOnly == false or
+minTlsVersion < 1.2. No Python loop runs per row, so estates with
+millions of resources are evaluated in seconds.
+
+Checks are declared in CONTROL_CHECKS, keyed by control ID. Framework
+references (MCSB v1/v2, NIST, NCSC, ISO) come from the mapping's
+controlMappings, and its auditChecklist deliverables are checked for
+presence in the export directory.
+
+Requirements:
+    pip install "pandas>=1.5"   # factorize(use_na_sentinel=...)
+    pip install pyarrow   # only to read parquet/arrow exports
+
+Usage:
+    python alz_compliance_engine.py --exports ./exports
+    python alz_compliance_engine.py --exports ./exports --output ./compliance-report.json
+    python alz_compliance_engine.py --exports ./exports --max-offenders 100
+"""
+
+import argparse
+import json
+import logging
+import re
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+try:
+    import numpy as np
+    import pandas as pd
+except ImportError as e:
+    print(f"Missing required package: {e}")
+    print("\nInstall requirements:")
+    print('  pip install "pandas>=1.5"')
+    sys.exit(1)
+
+try:
+    import pyarrow.feather as feather
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s | %(levelname)-8s | %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAPPING = Path(__file__).resolve().parent / "06-ALZ-SS-Audit-Compliance-Mapping-v1.json"
+
+# Export extensions in order of preference (columnar formats load fastest)
+EXPORT_EXTENSIONS = ["parquet", "arrow", "ndjson", "json", "csv"]
+
+FRAMEWORK_FIELDS = ["mcsbV1", "mcsbV2", "nist", "ncsc", "iso"]
+
+ARM_ID = "/subscriptions/{subscriptionId}/resourceGroups/{resourceGroup}/providers/{type}/{name}"
+
+
+# Checks per control. A check reads one export (by output_file stem) and
+# fails each row matching fail_when; "where" narrows the rows evaluated,
+# and expect="exists" instead passes if any row matches. Predicates are
+# {column, op, value} with op one of ==, !=, <, <=, >, >=, in, !in,
+# isnull, isnotnull, isempty; "as": "version" compares TLS versions
+# numerically (TLS1_2 / 1.2). A list of predicates fails if any matches.
+# Nulls compare unequal, so "!= true" fails resources with no value.
+CONTROL_CHECKS: Dict[str, List[Dict[str, Any]]] = {
+    "CTL-001": [
+        {
+            "id": "rbac-orphaned-principals",
+            "description": "Role assignments to deleted or unknown principals",
+            "export": "rbac-assignments",
+            "fail_when": {"column": "principalType", "op": "in", "value": ["Unknown", ""]},
+            "resource_id": "{scope}/providers/Microsoft.Authorization/roleAssignments/{name}"
+        }
+    ],
+    "CTL-004": [
+        {
+            "id": "peering-connected",
+            "description": "VNet peerings not in Connected state",
+            "export": "peerings",
+            "fail_when": {"column": "peeringState", "op": "!=", "value": "Connected"},
+            "resource_id": "/subscriptions/{subscriptionId}/resourceGroups/{resourceGroup}/providers/"
+                           "microsoft.network/virtualnetworks/{vnetName}/virtualNetworkPeerings/{peeringName}"
+        }
+    ],
+    "CTL-005": [
+        {
+            "id": "subnet-nsg",
+            "description": "Subnets without an NSG attached",
+            "export": "subnets-nsg",
+            "fail_when": {"column": "hasNsg", "op": "!=", "value": True},
+            "resource_id": "/subscriptions/{subscriptionId}/resourceGroups/{resourceGroup}/providers/"
+                           "microsoft.network/virtualnetworks/{vnetName}/subnets/{subnetName}"
+        }
+    ],
+    "CTL-006": [
+        {
+            "id": "storage-network-default-deny",
+            "description": "Storage accounts whose network default action allows all networks",
+            "export": "storage-security",
+            "resource_type": "microsoft.storage/storageaccounts",
+            "fail_when": {"column": "networkDefaultAction", "op": "==", "value": "Allow"}
+        },
+        {
+            "id": "storage-blob-public-access",
+            "description": "Storage accounts allowing anonymous blob access",
+            "export": "storage-security",
+            "resource_type": "microsoft.storage/storageaccounts",
+            "fail_when": {"column": "allowBlobPublicAccess", "op": "==", "value": True}
+        },
+        {
+            "id": "keyvault-public-network",
+            "description": "Key Vaults reachable from public networks",
+            "export": "keyvaults",
+            "resource_type": "microsoft.keyvault/vaults",
+            "fail_when": {"column": "publicNetworkAccess", "op": "==", "value": "Enabled"}
+        },
+        {
+            "id": "sql-public-network",
+            "description": "SQL servers and databases reachable from public networks",
+            "export": "sql-databases",
+            "fail_when": {"column": "publicNetworkAccess", "op": "==", "value": "Enabled"}
+        }
+    ],
+    "CTL-007": [
+        {
+            "id": "storage-https-only",
+            "description": "Storage accounts accepting plain HTTP",
+            "export": "storage-security",
+            "resource_type": "microsoft.storage/storageaccounts",
+            "fail_when": {"column": "httpsOnly", "op": "!=", "value": True}
+        },
+        {
+            "id": "storage-min-tls",
+            "description": "Storage accounts allowing TLS below 1.2",
+            "export": "storage-security",
+            "resource_type": "microsoft.storage/storageaccounts",
+            "fail_when": {"column": "minTlsVersion", "op": "<", "value": 1.2, "as": "version"}
+        },
+        {
+            "id": "appservice-https-only",
+            "description": "App Services accepting plain HTTP",
+            "export": "app-services",
+            "resource_type": "microsoft.web/sites",
+            "fail_when": {"column": "httpsOnly", "op": "!=", "value": True}
+        },
+        {
+            "id": "appservice-min-tls",
+            "description": "App Services allowing TLS below 1.2 or unencrypted FTP",
+            "export": "app-services",
+            "resource_type": "microsoft.web/sites",
+            "fail_when": [
+                {"column": "minTlsVersion", "op": "<", "value": 1.2, "as": "version"},
+                {"column": "ftpsState", "op": "==", "value": "AllAllowed"}
+            ]
+        },
+        {
+            "id": "sql-min-tls",
+            "description": "SQL servers and databases allowing TLS below 1.2",
+            "export": "sql-databases",
+            "fail_when": {"column": "minTlsVersion", "op": "<", "value": 1.2, "as": "version"}
+        }
+    ],
+    "CTL-008": [
+        {
+            "id": "disk-encryption",
+            "description": "Managed disks without encryption at rest",
+            "export": "disk-encryption",
+            "resource_type": "microsoft.compute/disks",
+            "fail_when": {"column": "encryptionType", "op": "isempty"}
+        }
+    ],
+    "CTL-009": [
+        {
+            "id": "keyvault-soft-delete",
+            "description": "Key Vaults without soft delete",
+            "export": "keyvaults",
+            "resource_type": "microsoft.keyvault/vaults",
+            "fail_when": {"column": "enableSoftDelete", "op": "!=", "value": True}
+        },
+        {
+            "id": "keyvault-purge-protection",
+            "description": "Key Vaults without purge protection",
+            "export": "keyvaults",
+            "resource_type": "microsoft.keyvault/vaults",
+            "fail_when": {"column": "enablePurgeProtection", "op": "!=", "value": True}
+        }
+    ],
+    "CTL-010": [
+        {
+            "id": "log-analytics-present",
+            "description": "At least one Log Analytics workspace exists",
+            "export": "inventory-full",
+            "where": {"column": "type", "op": "==", "value": "microsoft.operationalinsights/workspaces"},
+            "expect": "exists"
+        }
+    ],
+    "CTL-011": [
+        {
+            "id": "defender-high-severity",
+            "description": "Unhealthy Defender for Cloud assessments of high severity",
+            "export": "defender-findings",
+            "fail_when": {"column": "severity", "op": "==", "value": "High"},
+            "resource_id": "{resourceId}"
+        }
+    ],
+    "CTL-012": [
+        {
+            "id": "resource-tags",
+            "description": "Resources without tags",
+            "export": "inventory-full",
+            "fail_when": {"column": "tags", "op": "isempty"}
+        }
+    ],
+    "CTL-013": [
+        {
+            "id": "policy-enforced",
+            "description": "Policy assignments not enforced",
+            "export": "policy-assignments",
+            "fail_when": {"column": "enforcementMode", "op": "==", "value": "DoNotEnforce"},
+            "resource_id": "{scope}/providers/Microsoft.Authorization/policyAssignments/{name}"
+        }
+    ]
+}
+
+Predicate = Union[Dict[str, Any], List[Dict[str, Any]]]
+
+
+class ExportStore:
+    """
+    Loads executor exports into DataFrames, once per export and column set.
+
+    Exports are looked up by output_file stem in EXPORT_EXTENSIONS order,
+    so a parquet export is preferred over the JSON or CSV of the same run.
+    """
+
+    def __init__(self, export_dir: Path):
+        """
+        Args:
+            export_dir: Directory written by the query executor
+        """
+        self.export_dir = Path(export_dir)
+        self.missing_columns: Dict[str, set] = {}
+        self._frames: Dict[str, Optional[pd.DataFrame]] = {}
+
+    def find(self, stem: str) -> Optional[Path]:
+        """Return the preferred export file for a stem, or None."""
+        for extension in EXPORT_EXTENSIONS:
+            path = self.export_dir / f"{stem}.{extension}"
+            if path.exists() and (extension not in ("parquet", "arrow") or PYARROW_AVAILABLE):
+                return path
+        return None
+
+    def load(self, stem: str, columns: List[str]) -> Optional[pd.DataFrame]:
+        """
+        Load the columns of an export needed by all checks on it.
+
+        Columns missing from the export are returned as all-null and
+        recorded in missing_columns.
+
+        Returns:
+            DataFrame, or None if the export does not exist
+        """
+        if stem not in self._frames:
+            path = self.find(stem)
+            self._frames[stem] = None if path is None else self._read(path, columns)
+        frame = self._frames[stem]
+        if frame is None:
+            return None
+        for column in columns:
+            if column not in frame.columns:
+                frame[column] = None
+                self.missing_columns.setdefault(stem, set()).add(column)
+        return frame
+
+    @staticmethod
+    def _read(path: Path, columns: List[str]) -> pd.DataFrame:
+        extension = path.suffix.lstrip(".")
+        if extension == "parquet":
+            available = set(pq.read_schema(path).names)
+            return pq.read_table(path, columns=[c for c in columns if c in available]).to_pandas()
+        if extension == "arrow":
+            table = feather.read_table(path)
+            return table.select([c for c in columns if c in table.column_names]).to_pandas()
+        if extension == "ndjson":
+            frame = pd.read_json(path, lines=True, dtype=False)
+        elif extension == "json":
+            frame = pd.read_json(path, orient="records", dtype=False)
+        else:
+            frame = pd.read_csv(path, usecols=lambda c: c in columns, dtype=str, keep_default_na=False,
+                                na_values=[""])
+        return frame[[c for c in columns if c in frame.columns]]
+
+
+class ComplianceEngine:
+    """
+    Evaluates control checks over exported audit results.
+    """
+
+    def __init__(
+        self,
+        mapping: Dict[str, Any],
+        checks: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+        max_offenders: Optional[int] = None
+    ):
+        """
+        Args:
+            mapping: Parsed compliance mapping (controlMappings, auditChecklist, ...)
+            checks: Checks per control ID (CONTROL_CHECKS if None)
+            max_offenders: Maximum offending resource IDs listed per check (all if None)
+        """
+        self.mapping = mapping
+        self.checks = checks if checks is not None else CONTROL_CHECKS
+        self.max_offenders = max_offenders
+
+    @classmethod
+    def from_file(cls, mapping_path: Path, **kwargs) -> "ComplianceEngine":
+        """Build an engine from a compliance mapping JSON file."""
+        with open(mapping_path) as f:
+            return cls(json.load(f), **kwargs)
+
+    def evaluate(self, export_dir: Path) -> Dict[str, Any]:
+        """
+        Evaluate every mapped control against an export directory.
+
+        Returns:
+            Compliance report with a summary, per-control results and
+            audit checklist deliverable status
+        """
+        store = ExportStore(export_dir)
+        columns = self._columns_by_export()
+
+        controls = []
+        for control in self.mapping.get("controlMappings", []):
+            results = [
+                self._evaluate_check(
+                    check,
+                    store.load(check["export"], columns[check["export"]]),
+                    store.missing_columns.get(check["export"], set())
+                )
+                for check in self.checks.get(control["id"], [])
+            ]
+            controls.append({
+                "id": control["id"],
+                "name": control.get("name", ""),
+                "frameworks": {field: control.get(field, []) for field in FRAMEWORK_FIELDS},
+                "status": self._control_status(results),
+                "passed": sum(r["passed"] for r in results),
+                "failed": sum(r["failed"] for r in results),
+                "checks": results
+            })
+
+        summary = {"controls": len(controls)}
+        for status in ("passed", "failed", "not_assessed"):
+            summary[status] = sum(1 for c in controls if c["status"] == status)
+
+        metadata = self.mapping.get("metadata", {})
+        return {
+            "generated": datetime.utcnow().isoformat(),
+            "export_dir": str(export_dir),
+            "mapping": {"name": metadata.get("name"), "version": metadata.get("version")},
+            "summary": summary,
+            "controls": controls,
+            "deliverables": self._check_deliverables(store)
+        }
+
+    def _columns_by_export(self) -> Dict[str, List[str]]:
+        """Columns each export must provide for the checks that read it."""
+        columns: Dict[str, List[str]] = {}
+        for checks in self.checks.values():
+            for check in checks:
+                needed = columns.setdefault(check["export"], [])
+                for predicate in self._predicates(check.get("where")) + self._predicates(check.get("fail_when")):
+                    needed.append(predicate["column"])
+                needed.extend(re.findall(r'\{(\w+)\}', check.get("resource_id", ARM_ID)))
+                needed.extend(["id", "resourceId"])
+        return {export: list(dict.fromkeys(names)) for export, names in columns.items()}
+
+    def _evaluate_check(
+        self,
+        check: Dict[str, Any],
+        frame: Optional[pd.DataFrame],
+        missing_columns: set
+    ) -> Dict[str, Any]:
+        result = {
+            "id": check["id"],
+            "description": check.get("description", ""),
+            "export": check["export"],
+            "evaluated": 0,
+            "passed": 0,
+            "failed": 0,
+            "offending": []
+        }
+        if frame is None:
+            result["status"] = "not_assessed"
+            result["reason"] = f"export '{check['export']}' not found"
+            return result
+
+        absent = [
+            p["column"] for p in self._predicates(check.get("where")) + self._predicates(check.get("fail_when"))
+            if p["column"] in missing_columns
+        ]
+        if absent:
+            result["status"] = "not_assessed"
+            result["reason"] = f"export '{check['export']}' has no column {', '.join(absent)}"
+            return result
+
+        if check.get("where"):
+            frame = frame[self._mask(frame, check["where"])]
+        result["evaluated"] = len(frame)
+
+        if check.get("expect") == "exists":
+            result["status"] = "passed" if len(frame) else "failed"
+            result["passed"], result["failed"] = (1, 0) if len(frame) else (0, 1)
+            return result
+
+        failing = self._mask(frame, check["fail_when"])
+        result["failed"] = int(failing.sum())
+        result["passed"] = result["evaluated"] - result["failed"]
+        result["status"] = "failed" if result["failed"] else "passed"
+
+        offenders = frame[failing]
+        if self.max_offenders is not None:
+            result["offending_truncated"] = len(offenders) > self.max_offenders
+            offenders = offenders.head(self.max_offenders)
+        result["offending"] = self._resource_ids(offenders, check).tolist()
+        return result
+
+    @staticmethod
+    def _control_status(results: List[Dict[str, Any]]) -> str:
+        assessed = [r for r in results if r["status"] != "not_assessed"]
+        if not assessed:
+            return "not_assessed"
+        return "failed" if any(r["status"] == "failed" for r in assessed) else "passed"
+
+    @staticmethod
+    def _predicates(predicate: Optional[Predicate]) -> List[Dict[str, Any]]:
+        if predicate is None:
+            return []
+        return predicate if isinstance(predicate, list) else [predicate]
+
+    @classmethod
+    def _mask(cls, frame: pd.DataFrame, predicate: Predicate) -> pd.Series:
+        """Boolean Series of rows matching a predicate (any of a list)."""
+        mask = pd.Series(False, index=frame.index)
+        for p in cls._predicates(predicate):
+            mask |= cls._apply(frame[p["column"]], p)
+        return mask
+
+    @classmethod
+    def _apply(cls, series: pd.Series, predicate: Dict[str, Any]) -> pd.Series:
+        op = predicate["op"]
+        value = predicate.get("value")
+        null = series.isna()
+
+        if op == "isnull":
+            return null
+        if op == "isnotnull":
+            return ~null
+        if op == "isempty":
+            text = series.astype(str).str.strip()
+            return null | text.isin(["", "{}", "[]", "None", "nan"])
+
+        if predicate.get("as") == "version":
+            series = cls._as_version(series)
+        elif isinstance(value, bool) or (isinstance(value, list) and value and isinstance(value[0], bool)):
+            series = cls._as_bool(series)
+        elif isinstance(value, (int, float)):
+            series = pd.to_numeric(series, errors="coerce")
+
+        if op == "in":
+            return series.isin(value)
+        if op == "!in":
+            return ~series.isin(value) & series.notna()
+        if op == "!=":
+            # Nulls compare unequal to every value
+            return (series != value) | series.isna()
+        compare = {"==": np.equal, "<": np.less, "<=": np.less_equal,
+                   ">": np.greater, ">=": np.greater_equal}[op]
+        valid = series.notna()
+        result = pd.Series(False, index=series.index)
+        result[valid] = compare(series[valid].to_numpy(), value)
+        return result
+
+    @staticmethod
+    def _as_bool(series: pd.Series) -> pd.Series:
+        """Normalise bools exported as JSON booleans or CSV text."""
+        if series.dtype == bool:
+            return series
+        return ComplianceEngine._map_distinct(
+            series, lambda v: {"true": True, "false": False, "1": True, "0": False}.get(str(v).lower())
+        )
+
+    @staticmethod
+    def _as_version(series: pd.Series) -> pd.Series:
+        """Parse TLS versions such as TLS1_2, 1.2 or 1.0 into floats."""
+        def parse(value: Any) -> Optional[float]:
+            match = re.search(r'(\d+)(?:[._](\d+))?', str(value))
+            return float(f"{match.group(1)}.{match.group(2) or 0}") if match else None
+        return ComplianceEngine._map_distinct(series, parse).astype(float)
+
+    @staticmethod
+    def _map_distinct(series: pd.Series, func: Any) -> pd.Series:
+        """
+        Apply func to each distinct non-null value and broadcast the results.
+
+        Settings columns hold a handful of distinct values, so this costs
+        a factorize plus a few Python calls however many rows there are.
+        """
+        codes, uniques = pd.factorize(series, use_na_sentinel=True)
+        mapped = np.array([func(v) for v in uniques] + [None], dtype=object)
+        return pd.Series(mapped[codes], index=series.index)
+
+    @staticmethod
+    def _resource_ids(frame: pd.DataFrame, check: Dict[str, Any]) -> pd.Series:
+        """Resource IDs of rows: id / resourceId if exported, else built from a template."""
+        for column in ("id", "resourceId"):
+            if column in frame.columns and frame[column].notna().all() and "resource_id" not in check:
+                return frame[column].astype(str)
+
+        template = check.get("resource_id", ARM_ID)
+        ids = pd.Series("", index=frame.index)
+        for literal, field in re.findall(r'([^{]*)(?:\{(\w+)\})?', template):
+            ids = ids + literal
+            if not field:
+                continue
+            if field == "type" and frame[field].isna().all() and check.get("resource_type"):
+                ids = ids + check["resource_type"]
+            else:
+                ids = ids + frame[field].fillna("").astype(str)
+        return ids
+
+    def _check_deliverables(self, store: ExportStore) -> List[Dict[str, Any]]:
+        """Presence of each audit checklist deliverable, in any export format."""
+        deliverables = []
+        for item in self.mapping.get("auditChecklist", {}).get("phase1Deliverables", []):
+            stem = Path(item["file"]).stem
+            path = store.export_dir / item["file"]
+            found = path if path.exists() else store.find(stem)
+            deliverables.append({
+                "file": item["file"],
+                "description": item.get("description", ""),
+                "present": found is not None,
+                "path": str(found) if found is not None else None
+            })
+        return deliverables
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="ALZ Snapshot Audit - Compliance Evaluation Engine",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  # Evaluate an export directory against the default control mapping
+  python alz_compliance_engine.py --exports ./exports
+
+  # Write the report somewhere else and cap the listed offenders per check
+  python alz_compliance_engine.py --exports ./exports --output ./report.json --max-offenders 100
+        """
+    )
+
+    parser.add_argument(
+        "--exports", "-e",
+        required=True,
+        help="Export directory written by the query executor"
+    )
+    parser.add_argument(
+        "--mapping", "-m",
+        default=str(DEFAULT_MAPPING),
+        help="Compliance mapping JSON (default: 06-ALZ-SS-Audit-Compliance-Mapping-v1.json)"
+    )
+    parser.add_argument(
+        "--output", "-o",
+        help="Report file (default: <exports>/compliance-report.json)"
+    )
+    parser.add_argument(
+        "--max-offenders",
+        type=int,
+        help="Maximum offending resource IDs listed per check (default: all)"
+    )
+    parser.add_argument(
+        "--verbose", "-v",
+        action="store_true",
+        help="Enable verbose logging"
+    )
+
+    args = parser.parse_args()
+
+    if args.verbose:
+        logging.getLogger().setLevel(logging.DEBUG)
+
+    export_dir = Path(args.exports)
+    if not export_dir.is_dir():
+        logger.error(f"Export directory not found: {export_dir}")
+        return 1
+
+    engine = ComplianceEngine.from_file(Path(args.mapping), max_offenders=args.max_offenders)
+    started = datetime.utcnow()
+    report = engine.evaluate(export_dir)
+    elapsed = (datetime.utcnow() - started).total_seconds()
+
+    output = Path(args.output) if args.output else export_dir / "compliance-report.json"
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2, default=str)
+
+    logger.info("=" * 60)
+    logger.info("COMPLIANCE SUMMARY")
+    logger.info("=" * 60)
+    for control in report["controls"]:
+        logger.info(f"{control['id']}  {control['status'].upper():<13} "
+                    f"{control['passed']:>8} pass {control['failed']:>8} fail  {control['name']}")
+    summary = report["summary"]
+    logger.info("-" * 60)
+    logger.info(f"Controls: {summary['controls']} | Passed: {summary['passed']} | "
+                f"Failed: {summary['failed']} | Not assessed: {summary['not_assessed']}")
+    missing = [d["file"] for d in report["deliverables"] if not d["present"]]
+    if missing:
+        logger.info(f"Missing deliverables: {', '.join(missing)}")
+    logger.info(f"Evaluated in {elapsed:.2f}s; report saved to {output}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,766 @@
+#!/usr/bin/env python3
+"""
+ALZ Snapshot Audit - Query Executor Tests
+==========================================
+Regression tests for ALZAuditExecutor run offline against the Resource
+Graph emulator and small scripted fakes, so no Azure tenant is needed.
+
+Covers deterministic parallel runs and the shared concurrency budget,
+429 retry/resume, streamed exports, subscription sharding, the result
+cache, snapshot deltas and consolidated table scans, plus the compliance
+engine's checks over small export directories.
+
+Requirements:
+    pip install azure-identity azure-mgmt-resourcegraph azure-mgmt-resource
+    pip install "pandas>=1.5" pyarrow   # optional: CSV parity, Arrow and compliance tests
+
+Usage:
+    python 17-ALZ-SS-Audit-Executor-Tests-v1.py
+    python 17-ALZ-SS-Audit-Executor-Tests-v1.py -v TestRateLimitRetry
+"""
+
+import csv
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from importlib.util import module_from_spec, spec_from_file_location
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+EXECUTOR_FILE = SCRIPT_DIR / "11-ALZ-SS-Audit-Query-Executor-v1.py"
+EMULATOR_FILE = SCRIPT_DIR / "14-ALZ-SS-Audit-RG-Emulator-v1.py"
+COMPLIANCE_FILE = SCRIPT_DIR / "16-ALZ-SS-Audit-Compliance-Engine-v1.py"
+
+
+def load_module(name: str, path: Path) -> Any:
+    """Import a numbered script file as a module."""
+    spec = spec_from_file_location(name, path)
+    module = module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+alz = load_module("alz_audit_executor", EXECUTOR_FILE)
+emulator = load_module("alz_rg_emulator", EMULATOR_FILE)
+alz.logger.setLevel("CRITICAL")
+
+try:
+    import pandas as pd
+    PANDAS_AVAILABLE = True
+except ImportError:
+    PANDAS_AVAILABLE = False
+
+# The compliance engine exits on import without pandas
+compliance = load_module("alz_compliance_engine", COMPLIANCE_FILE) if PANDAS_AVAILABLE else None
+if compliance is not None:
+    compliance.logger.setLevel("CRITICAL")
+
+
+# =============================================================================
+# FAKES
+# =============================================================================
+
+class ScriptedResourceGraphClient:
+    """Resource Graph fake that replays scripted pages and errors in call order."""
+
+    def __init__(self, script: List[Any]):
+        """
+        Args:
+            script: Items returned per call; an exception instance is raised,
+                a (rows, skip_token) tuple is returned as a response page
+        """
+        self.script = list(script)
+        self.requests = []
+
+    def resources(self, query_request: Any) -> SimpleNamespace:
+        self.requests.append(query_request)
+        item = self.script.pop(0)
+        if isinstance(item, Exception):
+            raise item
+        rows, skip_token = item
+        return SimpleNamespace(data=rows, skip_token=skip_token, total_records=None)
+
+
+class TableResourceGraphClient:
+    """
+    Resource Graph fake serving fixed tables, evaluating queries with LocalQueryPlan.
+
+    Pages hold page_size rows; latency maps a query substring to seconds of
+    delay per call. The peak number of concurrent calls is recorded.
+    """
+
+    def __init__(self, tables: Dict[str, List[Dict[str, Any]]], page_size: int = 1000,
+                 latency: Dict[str, float] = None):
+        self.tables = tables
+        self.page_size = page_size
+        self.latency = latency or {}
+        self.calls = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._lock = threading.Lock()
+
+    def resources(self, query_request: Any) -> SimpleNamespace:
+        with self._lock:
+            self.calls += 1
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            for marker, delay in self.latency.items():
+                if marker in query_request.query:
+                    time.sleep(delay)
+            plan = alz.LocalQueryPlan.compile(query_request.query)
+            subscriptions = set(query_request.subscriptions or [])
+            rows = [
+                row for row in self.tables[plan.table]
+                if not subscriptions or row.get("subscriptionId") in subscriptions
+            ]
+            rows = list(plan.apply(rows))
+            offset = int(query_request.options.skip_token or 0)
+            top = min(self.page_size, query_request.options.top or self.page_size)
+            page = rows[offset:offset + top]
+            end = offset + len(page)
+            return SimpleNamespace(
+                data=page,
+                skip_token=str(end) if end < len(rows) else None,
+                total_records=len(rows)
+            )
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+class FakeClock:
+    """Monotonic clock advanced only by its own sleep()."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def make_executor(client: Any, subscriptions: List[str], **kwargs) -> Any:
+    """Executor over a fake client with an effectively unlimited quota."""
+    kwargs.setdefault("scheduler", alz.RateLimitScheduler(quota=1_000_000, window_seconds=1.0))
+    return alz.ALZAuditExecutor(
+        subscription_ids=subscriptions,
+        resource_graph_client=client,
+        subscription_client=SimpleNamespace(subscriptions=SimpleNamespace(list=lambda: [])),
+        **kwargs
+    )
+
+
+def estate_table(estate: Any, table: str = "resources") -> List[Dict[str, Any]]:
+    """Materialise every row of an emulated table."""
+    return [
+        estate.resource(table, sub, j)
+        for sub in estate.subscription_ids
+        for j in estate.rows_per_subscription(table)
+    ]
+
+
+def read_ndjson(path: Path) -> List[Dict[str, Any]]:
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+class TempDirTestCase(unittest.TestCase):
+    """Test case with a scratch directory removed afterwards."""
+
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp(prefix="alz-test-"))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+
+# =============================================================================
+# PARALLEL EXECUTION
+# =============================================================================
+
+class TestParallelExecution(TempDirTestCase):
+    """Parallel batches match sequential ones and stay within the concurrency budget."""
+
+    QUERIES = {
+        "slow": {"query": "resources | where type == 'microsoft.compute/disks' | project id, name",
+                 "output_file": "slow"},
+        "medium": {"query": "resources | where type == 'microsoft.web/sites' | project id, name",
+                   "output_file": "medium"},
+        "fast": {"query": "resources | where type == 'microsoft.keyvault/vaults' | project id, name",
+                 "output_file": "fast"},
+    }
+
+    def setUp(self):
+        super().setUp()
+        self.estate = emulator.SyntheticEstate(subscriptions=4, resources_per_subscription=200)
+        self.tables = {"resources": estate_table(self.estate)}
+
+    def run_batch(self, name: str, parallel: int, shard_size: int = 1000):
+        # Completion order is the reverse of definition order
+        client = TableResourceGraphClient(
+            self.tables, page_size=50,
+            latency={"disks": 0.03, "sites": 0.015, "vaults": 0.0}
+        )
+        executor = make_executor(client, self.estate.subscription_ids, shard_size=shard_size)
+        summary = executor.execute_query_batch(
+            self.QUERIES, self.tmp / name, export_format="ndjson", parallel=parallel
+        )
+        return summary, client
+
+    def test_parallel_summary_and_files_match_sequential(self):
+        sequential, _ = self.run_batch("seq", parallel=1)
+        parallel, _ = self.run_batch("par", parallel=3)
+
+        self.assertEqual(list(parallel["queries"]), list(self.QUERIES))
+        for summary in (sequential, parallel):
+            summary.pop("execution_time")
+            for result in summary["queries"].values():
+                result.pop("output_files")
+        self.assertEqual(parallel, sequential)
+        for name in self.QUERIES:
+            self.assertEqual(
+                (self.tmp / "par" / f"{name}.ndjson").read_bytes(),
+                (self.tmp / "seq" / f"{name}.ndjson").read_bytes()
+            )
+
+    def test_queries_and_shards_share_the_parallel_budget(self):
+        # 3 queries x 4 shards would allow 12 concurrent calls without the split
+        _, client = self.run_batch("budget", parallel=3, shard_size=1)
+        self.assertLessEqual(client.peak_in_flight, 3)
+
+
+# =============================================================================
+# RATE LIMITING
+# =============================================================================
+
+class TestRateLimitRetry(unittest.TestCase):
+    """Throttled pages are retried after the server hint from the same skip_token."""
+
+    def run_throttled(self, error: Exception):
+        clock = FakeClock()
+        scheduler = alz.RateLimitScheduler(
+            quota=100, backoff_base=0.0, clock=clock, sleep=clock.sleep
+        )
+        client = ScriptedResourceGraphClient([
+            ([{"id": "a"}], "token-1"),
+            error,
+            ([{"id": "b"}], None),
+        ])
+        executor = make_executor(client, ["sub-1"], scheduler=scheduler)
+        rows = [row for page in executor.iter_query_pages("resources") for row in page]
+        return rows, client, scheduler, clock
+
+    def test_retry_after_header(self):
+        error = emulator.EmulatedThrottleError(0)
+        error.response = SimpleNamespace(headers={"Retry-After": "3"})
+        rows, client, scheduler, clock = self.run_throttled(error)
+
+        self.assertEqual(rows, [{"id": "a"}, {"id": "b"}])
+        self.assertEqual([r.options.skip_token for r in client.requests], [None, "token-1", "token-1"])
+        self.assertEqual(scheduler.throttled, 1)
+        self.assertAlmostEqual(sum(clock.sleeps), 3.0)
+
+    def test_quota_resets_after_header(self):
+        rows, client, scheduler, clock = self.run_throttled(emulator.EmulatedThrottleError(2.5))
+
+        self.assertEqual(rows, [{"id": "a"}, {"id": "b"}])
+        self.assertEqual([r.options.skip_token for r in client.requests], [None, "token-1", "token-1"])
+        self.assertEqual(scheduler.throttled, 1)
+        self.assertAlmostEqual(sum(clock.sleeps), 2.5)
+
+    def test_exhausted_retries_report_resume_token(self):
+        clock = FakeClock()
+        scheduler = alz.RateLimitScheduler(
+            max_retries=1, backoff_base=0.0, clock=clock, sleep=clock.sleep
+        )
+        client = ScriptedResourceGraphClient([
+            ([{"id": "a"}], "token-1"),
+            emulator.EmulatedServiceError(),
+            emulator.EmulatedServiceError(),
+        ])
+        result = make_executor(client, ["sub-1"], scheduler=scheduler).execute_query("resources")
+
+        self.assertFalse(result["success"])
+        self.assertEqual(result["data"], [{"id": "a"}])
+        self.assertEqual(result["resume_skip_token"], "token-1")
+
+
+# =============================================================================
+# STREAMED EXPORTS
+# =============================================================================
+
+class TestStreamedExports(TempDirTestCase):
+    """Page-by-page writers produce the same files as the old in-memory export."""
+
+    def pages(self) -> List[List[Dict[str, Any]]]:
+        estate = emulator.SyntheticEstate(subscriptions=3, resources_per_subscription=700)
+        rows = estate_table(estate)
+        return [rows[i:i + 1000] for i in range(0, len(rows), 1000)]
+
+    def write(self, writer_class: Any, pages: List[List[Dict[str, Any]]]) -> Path:
+        writer = writer_class(self.tmp / f"out.{writer_class.extension}")
+        for page in pages:
+            writer.write_page(page)
+        writer.close()
+        return writer.path
+
+    def test_json_matches_json_dump(self):
+        pages = self.pages()
+        rows = [row for page in pages for row in page]
+        expected = json.dumps(rows, indent=2, default=str)
+        self.assertEqual(self.write(alz.JsonArrayWriter, pages).read_text(), expected)
+        self.assertEqual(self.write(alz.JsonArrayWriter, []).read_text(), json.dumps([], indent=2))
+
+    def test_ndjson_matches_one_dump_per_row(self):
+        pages = self.pages()
+        expected = "".join(json.dumps(row, default=str) + "\n" for page in pages for row in page)
+        self.assertEqual(self.write(alz.NdjsonWriter, pages).read_text(), expected)
+
+    @unittest.skipUnless(PANDAS_AVAILABLE, "pandas not installed")
+    def test_csv_matches_dataframe_to_csv_for_flat_rows(self):
+        # pandas writes nested values as reprs and ints in columns with gaps as floats
+        columns = ["id", "name", "type", "resourceGroup", "location", "kind", "httpsOnly", "minTlsVersion"]
+        flat = [[{k: row[k] for k in columns} for row in page] for page in self.pages()]
+        rows = [row for page in flat for row in page]
+        expected = self.tmp / "expected.csv"
+        pd.DataFrame(rows).to_csv(expected, index=False)
+        self.assertEqual(self.write(alz.CsvPageWriter, flat).read_text(), expected.read_text())
+
+    def test_csv_writes_nested_values_as_json(self):
+        path = self.write(alz.CsvPageWriter, [[{"id": "a", "tags": {"env": "prod"}, "ips": ["10.0.0.1"]}]])
+        with open(path, newline='') as f:
+            row = next(csv.DictReader(f))
+        self.assertEqual(json.loads(row["tags"]), {"env": "prod"})
+        self.assertEqual(json.loads(row["ips"]), ["10.0.0.1"])
+
+    @unittest.skipUnless(alz.PYARROW_AVAILABLE, "pyarrow not installed")
+    def test_arrow_widens_conflicting_columns(self):
+        import pyarrow as pa
+        path = self.write(alz.ArrowPageWriter, [
+            [{"id": "a", "n": 1, "flag": True}, {"id": "b", "n": 2.5, "flag": "yes", "late": "x"}],
+        ])
+        table = pa.ipc.open_file(str(path)).read_all()
+        self.assertEqual(table.schema.names, ["id", "n", "flag", "late"])
+        self.assertEqual(table.column("n").to_pylist(), [1.0, 2.5])
+        self.assertEqual(table.column("flag").to_pylist(), ["true", "yes"])
+
+
+# =============================================================================
+# SUBSCRIPTION SHARDING
+# =============================================================================
+
+class TestSubscriptionSharding(unittest.TestCase):
+    """Sharded runs merge to the same rows as one unsharded request."""
+
+    def setUp(self):
+        self.estate = emulator.SyntheticEstate(subscriptions=5, resources_per_subscription=300)
+
+    def rows(self, query: str, shard_size: int, parallel: int = 2) -> List[Dict[str, Any]]:
+        executor = make_executor(
+            emulator.EmulatedResourceGraphClient(self.estate),
+            self.estate.subscription_ids,
+            shard_size=shard_size
+        )
+        pages = executor.iter_sharded_query_pages(query, max_results=100000, parallel=parallel)
+        return [row for page in pages for row in page]
+
+    def test_summarize_shards_merge_to_unsharded_counts(self):
+        query = alz.BUILTIN_QUERIES["resource_count_by_type"]["query"]
+        unsharded = self.rows(query, shard_size=1000)
+        sharded = self.rows(query, shard_size=2)
+
+        self.assertEqual(
+            sorted(sharded, key=lambda r: r["type"]),
+            sorted(unsharded, key=lambda r: r["type"])
+        )
+        self.assertEqual([r["ResourceCount"] for r in sharded], [r["ResourceCount"] for r in unsharded])
+
+    def test_row_shards_concatenate_in_subscription_order(self):
+        query = "resources | where type == 'microsoft.storage/storageaccounts'"
+        self.assertEqual(self.rows(query, shard_size=2), self.rows(query, shard_size=1000))
+
+    def table_rows(self, query: str, shard_size: int) -> List[Dict[str, Any]]:
+        client = TableResourceGraphClient({"resources": estate_table(self.estate)}, page_size=100)
+        executor = make_executor(client, self.estate.subscription_ids, shard_size=shard_size)
+        pages = executor.iter_sharded_query_pages(query, max_results=100000, parallel=2)
+        return [row for page in pages for row in page]
+
+    def test_ordered_take_merges_across_shards(self):
+        # Names embed the subscription, so a global sort interleaves the shards
+        query = ("resources | where type == 'microsoft.storage/storageaccounts' "
+                 "| project id, name, location | order by location asc, name desc | take 40")
+        unsharded = self.table_rows(query, shard_size=1000)
+        sharded = self.table_rows(query, shard_size=3)
+        self.assertEqual(len(unsharded), 40)
+        self.assertEqual(sharded, unsharded)
+
+    def test_top_and_builtin_order_merge_across_shards(self):
+        for query in ("resources | project id, name | top 15 by name asc",
+                      alz.BUILTIN_QUERIES["resource_inventory"]["query"]):
+            self.assertEqual(self.table_rows(query, shard_size=2), self.table_rows(query, shard_size=1000))
+
+
+# =============================================================================
+# RESULT CACHE
+# =============================================================================
+
+class TestQueryResultCache(TempDirTestCase):
+    """Cache hits, TTL expiry and least-recently-used eviction."""
+
+    def fill(self, cache: Any, key: str, rows: List[Dict[str, Any]]) -> None:
+        writer = cache.writer()
+        writer.write_page(rows)
+        cache.commit(key, writer, pages=1)
+
+    def test_executor_serves_repeat_query_from_cache(self):
+        estate = emulator.SyntheticEstate(subscriptions=2, resources_per_subscription=600)
+        client = emulator.EmulatedResourceGraphClient(estate)
+        executor = make_executor(client, estate.subscription_ids, cache=alz.QueryResultCache(self.tmp))
+        query = "resources | where type == 'microsoft.compute/disks'"
+
+        first = {}
+        miss = [row for page in executor.iter_cached_query_pages(query, progress=first) for row in page]
+        calls = client.calls
+        second = {}
+        hit = [row for page in executor.iter_cached_query_pages(query, progress=second) for row in page]
+
+        self.assertEqual(hit, miss)
+        self.assertEqual(client.calls, calls)
+        self.assertTrue(second.get("cached"))
+        self.assertFalse(first.get("cached"))
+
+    def test_key_ignores_comments_whitespace_and_subscription_order(self):
+        a = alz.QueryResultCache.make_key("resources\n| take 5 // note", ["s2", "s1"], 10)
+        b = alz.QueryResultCache.make_key("resources | take 5", ["s1", "s2"], 10)
+        self.assertEqual(a, b)
+        self.assertNotEqual(a, alz.QueryResultCache.make_key("resources | take 5", ["s1"], 10))
+
+    def test_stale_entry_is_a_miss(self):
+        cache = alz.QueryResultCache(self.tmp, ttl_seconds=60)
+        self.fill(cache, "k", [{"id": "a"}])
+        self.assertIsNotNone(cache.get("k"))
+
+        meta_path = self.tmp / "k.meta.json"
+        meta = json.loads(meta_path.read_text())
+        meta["created"] -= 61
+        meta_path.write_text(json.dumps(meta))
+        self.assertIsNone(cache.get("k"))
+
+    def test_least_recently_used_entry_is_evicted(self):
+        row = [{"id": "x" * 100}]
+        entry_size = len(json.dumps(row[0]) + "\n")
+        cache = alz.QueryResultCache(self.tmp, max_bytes=2 * entry_size)
+        self.fill(cache, "a", row)
+        self.fill(cache, "b", row)
+        os.utime(self.tmp / "a.ndjson", (1000, 1000))
+        os.utime(self.tmp / "b.ndjson", (2000, 2000))
+
+        self.assertIsNotNone(cache.get("a"))  # a is now the most recently used
+        self.fill(cache, "c", row)
+
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("c"))
+        self.assertFalse((self.tmp / "b.meta.json").exists())
+
+
+# =============================================================================
+# SNAPSHOT DELTA
+# =============================================================================
+
+class TestSnapshotDelta(TempDirTestCase):
+    """Delta runs report added, changed and removed rows against a baseline."""
+
+    QUERIES = {"vaults": {"query": "resources | project id, name, sku", "output_file": "vaults"}}
+
+    def run_batch(self, rows: List[Dict[str, Any]], name: str, **kwargs) -> Dict[str, Any]:
+        executor = make_executor(ScriptedResourceGraphClient([(rows, None)]), ["sub-1"])
+        return executor.execute_query_batch(
+            self.QUERIES, self.tmp / name, export_format="ndjson", **kwargs
+        )
+
+    def test_baseline_is_opt_in(self):
+        self.run_batch([{"id": "A"}], "plain")
+        self.assertFalse((self.tmp / "plain" / "baseline").exists())
+
+    def test_added_changed_and_removed(self):
+        self.run_batch([
+            {"id": "/kv/A", "name": "a", "sku": "standard"},
+            {"id": "/kv/B", "name": "b", "sku": "standard"},
+            {"id": "/kv/C", "name": "c", "sku": "standard"},
+        ], "before", write_baseline=True)
+        summary = self.run_batch([
+            {"id": "/kv/A", "name": "a", "sku": "standard"},
+            {"id": "/kv/B", "name": "b", "sku": "premium"},
+            {"id": "/kv/D", "name": "d", "sku": "standard"},
+        ], "after", delta_from=self.tmp / "before")
+
+        after = self.tmp / "after"
+        self.assertEqual(summary["queries"]["vaults"]["delta"], {"added": 1, "changed": 1, "removed": 1})
+        self.assertEqual([r["id"] for r in read_ndjson(after / "vaults-added.ndjson")], ["/kv/D"])
+        self.assertEqual(read_ndjson(after / "vaults-changed.ndjson")[0]["sku"], "premium")
+        self.assertEqual(read_ndjson(after / "vaults-removed.ndjson"), [{"id": "/kv/c"}])
+        self.assertTrue((after / "baseline" / "vaults.tsv.gz").exists())
+
+    def test_keyless_rows_compare_as_a_multiset(self):
+        before = alz.BaselineWriter(self.tmp / "before.tsv.gz")
+        before.write_page([{"v": 1}, {"v": 1}, {"v": 2}])
+        before.finish()
+        before.close()
+
+        categories = {}
+        delta = alz.SnapshotDelta(
+            alz.BaselineWriter.load(self.tmp / "before.tsv.gz"),
+            alz.BaselineWriter(self.tmp / "after.tsv.gz"),
+            lambda category: categories.setdefault(category, [alz.NdjsonWriter(self.tmp / f"{category}.ndjson")])
+        )
+        delta.write_page([{"v": 1}, {"v": 1}, {"v": 1}, {"v": 2}])
+        delta.finish()
+        delta.close()
+
+        self.assertEqual(delta.counts, {"added": 1, "changed": 0, "removed": 0})
+        self.assertEqual(read_ndjson(self.tmp / "added.ndjson"), [{"v": 1}])
+
+    def test_query_key_column(self):
+        baseline = alz.BaselineWriter(self.tmp / "b.tsv.gz", ["type"])
+        self.assertEqual(baseline.fingerprint({"type": "Microsoft.Web/Sites", "n": 1})[0], "microsoft.web/sites")
+        self.assertEqual(baseline.fingerprint({"n": 1})[0][:4], "row:")
+        baseline.close()
+        self.assertFalse(baseline.path.exists())  # never finished, never published
+
+
+# =============================================================================
+# CONSOLIDATED SCANS
+# =============================================================================
+
+class TestConsolidatedScan(TempDirTestCase):
+    """Queries answered from one table scan match running each query on its own."""
+
+    def test_consolidated_batch_matches_separate_queries(self):
+        estate = emulator.SyntheticEstate(subscriptions=3, resources_per_subscription=400)
+        tables = {"resources": estate_table(estate)}
+        scans, _ = alz.ConsolidatedScan.plan(alz.BUILTIN_QUERIES)
+        queries = {name: alz.BUILTIN_QUERIES[name] for scan in scans for name in scan.plans}
+        self.assertGreater(len(queries), 2)
+
+        results = {}
+        for consolidate in (False, True):
+            client = TableResourceGraphClient(tables, page_size=500)
+            executor = make_executor(client, estate.subscription_ids)
+            output = self.tmp / f"consolidate-{consolidate}"
+            summary = executor.execute_query_batch(
+                queries, output, export_format="ndjson", parallel=2, consolidate=consolidate
+            )
+            self.assertEqual(summary["failed"], 0)
+            results[consolidate] = (client.calls, {
+                name: (output / f"{query['output_file']}.ndjson").read_text()
+                for name, query in queries.items()
+            })
+
+        separate_calls, separate = results[False]
+        consolidated_calls, consolidated = results[True]
+        self.assertEqual(consolidated, separate)
+        self.assertLess(consolidated_calls, separate_calls)
+
+
+
+# =============================================================================
+# COMPLIANCE ENGINE
+# =============================================================================
+
+@unittest.skipUnless(PANDAS_AVAILABLE, "pandas not installed")
+class TestComplianceEngine(TempDirTestCase):
+    """Vectorised checks, value normalisation and control status over exports."""
+
+    MAPPING = {
+        "metadata": {"name": "test-mapping", "version": "1.0"},
+        "controlMappings": [
+            {"id": "CTL-A", "name": "Storage transport", "mcsbV1": ["DP-3"]},
+            {"id": "CTL-B", "name": "Tagging"},
+            {"id": "CTL-C", "name": "Missing export"},
+            {"id": "CTL-D", "name": "Workspace"}
+        ],
+        "auditChecklist": {"phase1Deliverables": [
+            {"file": "storage.json", "description": "Storage"},
+            {"file": "policy.csv", "description": "Policy"}
+        ]}
+    }
+
+    CHECKS = {
+        "CTL-A": [
+            {"id": "https", "export": "storage",
+             "fail_when": {"column": "httpsOnly", "op": "!=", "value": True}},
+            {"id": "tls", "export": "storage",
+             "fail_when": {"column": "minTlsVersion", "op": "<", "value": 1.2, "as": "version"}}
+        ],
+        "CTL-B": [
+            {"id": "tags", "export": "inventory", "fail_when": {"column": "tags", "op": "isempty"}},
+            {"id": "kind", "export": "inventory", "fail_when": {"column": "kind", "op": "isempty"}}
+        ],
+        "CTL-C": [
+            {"id": "policy", "export": "policy",
+             "fail_when": {"column": "enforcementMode", "op": "==", "value": "DoNotEnforce"}}
+        ],
+        "CTL-D": [
+            {"id": "workspace", "export": "inventory", "expect": "exists",
+             "where": {"column": "type", "op": "==", "value": "microsoft.operationalinsights/workspaces"}},
+            {"id": "sku", "export": "inventory", "expect": "exists",
+             "where": {"column": "sku", "op": "==", "value": "Standard"}}
+        ]
+    }
+
+    # (httpsOnly, minTlsVersion) as exported by JSON, mixing booleans and text
+    STORAGE = [
+        ("sa1", True, "TLS1_2"),
+        ("sa2", "false", "TLS1_0"),
+        ("sa3", "False", "1.0"),
+        ("sa4", False, None),
+        ("sa5", "true", "1.2"),
+        ("sa6", None, "TLS1_3"),
+    ]
+    HTTPS_FAILING = ["sa2", "sa3", "sa4", "sa6"]
+    TLS_FAILING = ["sa2", "sa3"]
+
+    INVENTORY = [
+        {"id": "vm1", "type": "microsoft.compute/virtualmachines", "tags": {"env": "prod"}},
+        {"id": "vm2", "type": "microsoft.compute/virtualmachines", "tags": {}},
+        {"id": "law", "type": "microsoft.operationalinsights/workspaces", "tags": None},
+    ]
+
+    def storage_rows(self, typed: bool = False) -> List[Dict[str, Any]]:
+        """Storage rows; typed=True converts text booleans to bool for parquet."""
+        rows = []
+        for name, https, tls in self.STORAGE:
+            if typed and isinstance(https, str):
+                https = https.lower() == "true"
+            rows.append({"id": f"/storage/{name}", "name": name, "httpsOnly": https, "minTlsVersion": tls})
+        return rows
+
+    def write_export(self, stem: str, rows: List[Dict[str, Any]], fmt: str) -> None:
+        path = self.tmp / f"{stem}.{fmt}"
+        if fmt == "json":
+            path.write_text(json.dumps(rows))
+        elif fmt == "csv":
+            with open(path, "w", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=list(rows[0]))
+                writer.writeheader()
+                writer.writerows({k: "" if v is None else v for k, v in row.items()} for row in rows)
+        else:
+            pd.DataFrame(rows).to_parquet(path)
+
+    def evaluate(self, **kwargs) -> Dict[str, Any]:
+        engine = compliance.ComplianceEngine(self.MAPPING, checks=self.CHECKS, **kwargs)
+        report = engine.evaluate(self.tmp)
+        return {c["id"]: c for c in report["controls"]}, report
+
+    def check(self, controls: Dict[str, Any], control: str, check: str) -> Dict[str, Any]:
+        return next(r for r in controls[control]["checks"] if r["id"] == check)
+
+    def test_predicates_over_json_csv_and_parquet(self):
+        formats = ["json", "csv"] + (["parquet"] if compliance.PYARROW_AVAILABLE else [])
+        for fmt in formats:
+            with self.subTest(fmt=fmt):
+                for path in self.tmp.iterdir():
+                    path.unlink()
+                self.write_export("storage", self.storage_rows(typed=fmt == "parquet"), fmt)
+                controls, _ = self.evaluate()
+
+                https = self.check(controls, "CTL-A", "https")
+                self.assertEqual((https["evaluated"], https["failed"], https["passed"]), (6, 4, 2))
+                self.assertEqual(https["offending"], [f"/storage/{n}" for n in self.HTTPS_FAILING])
+                tls = self.check(controls, "CTL-A", "tls")
+                self.assertEqual(tls["offending"], [f"/storage/{n}" for n in self.TLS_FAILING])
+                self.assertEqual(controls["CTL-A"]["status"], "failed")
+                self.assertEqual(controls["CTL-A"]["frameworks"]["mcsbV1"], ["DP-3"])
+
+    def test_bool_normalisation(self):
+        series = pd.Series(["false", False, "False", "TRUE", "1", "0", None, "maybe"])
+        self.assertEqual(
+            compliance.ComplianceEngine._as_bool(series).tolist(),
+            [False, False, False, True, True, False, None, None]
+        )
+        typed = pd.Series([True, False])
+        self.assertIs(compliance.ComplianceEngine._as_bool(typed), typed)
+
+    def test_tls_version_parsing(self):
+        series = pd.Series(["TLS1_2", "1.0", "TLS1_0", "1.2", "TLS1_3", None, "unset"])
+        parsed = compliance.ComplianceEngine._as_version(series)
+        self.assertEqual(parsed[:5].tolist(), [1.2, 1.0, 1.0, 1.2, 1.3])
+        self.assertTrue(parsed[5:].isna().all())
+        below = compliance.ComplianceEngine._apply(series, {"op": "<", "value": 1.2, "as": "version"})
+        # Missing or unparseable versions are not reported as below the floor
+        self.assertEqual(below.tolist(), [False, True, True, False, False, False, False])
+
+    def test_isempty_and_exists_on_absent_columns(self):
+        self.write_export("inventory", self.INVENTORY, "json")
+        controls, _ = self.evaluate()
+
+        tags = self.check(controls, "CTL-B", "tags")
+        self.assertEqual((tags["status"], tags["offending"]), ("failed", ["vm2", "law"]))
+        kind = self.check(controls, "CTL-B", "kind")
+        self.assertEqual(kind["status"], "not_assessed")
+        self.assertIn("no column kind", kind["reason"])
+
+        workspace = self.check(controls, "CTL-D", "workspace")
+        self.assertEqual((workspace["status"], workspace["evaluated"]), ("passed", 1))
+        sku = self.check(controls, "CTL-D", "sku")
+        self.assertEqual(sku["status"], "not_assessed")
+        self.assertEqual(controls["CTL-D"]["status"], "passed")
+
+    def test_offending_ids_are_truncated(self):
+        self.write_export("storage", self.storage_rows(), "json")
+        controls, _ = self.evaluate(max_offenders=2)
+        https = self.check(controls, "CTL-A", "https")
+        self.assertEqual(https["failed"], 4)
+        self.assertEqual(https["offending"], ["/storage/sa2", "/storage/sa3"])
+        self.assertTrue(https["offending_truncated"])
+        self.assertFalse(self.check(controls, "CTL-A", "tls")["offending_truncated"])
+
+    def test_resource_ids_from_template(self):
+        frame = pd.DataFrame({"scope": ["/subscriptions/s1"], "name": ["pa1"], "id": [None]})
+        check = {"resource_id": "{scope}/providers/Microsoft.Authorization/policyAssignments/{name}"}
+        self.assertEqual(
+            compliance.ComplianceEngine._resource_ids(frame, check).tolist(),
+            ["/subscriptions/s1/providers/Microsoft.Authorization/policyAssignments/pa1"]
+        )
+        frame = pd.DataFrame({"subscriptionId": ["s1"], "resourceGroup": ["rg"], "type": [None], "name": ["sa"]})
+        self.assertEqual(
+            compliance.ComplianceEngine._resource_ids(frame, {"resource_type": "microsoft.storage/storageaccounts"}).tolist(),
+            ["/subscriptions/s1/resourceGroups/rg/providers/microsoft.storage/storageaccounts/sa"]
+        )
+
+    def test_status_when_exports_are_missing(self):
+        self.write_export("storage", self.storage_rows(), "json")
+        controls, report = self.evaluate()
+
+        policy = self.check(controls, "CTL-C", "policy")
+        self.assertEqual(policy["status"], "not_assessed")
+        self.assertIn("'policy' not found", policy["reason"])
+        self.assertEqual(controls["CTL-C"]["status"], "not_assessed")
+        self.assertEqual(controls["CTL-B"]["status"], "not_assessed")
+        self.assertEqual(report["summary"],
+                         {"controls": 4, "passed": 0, "failed": 1, "not_assessed": 3})
+        self.assertEqual([d["present"] for d in report["deliverables"]], [True, False])
+
+        self.assertEqual(compliance.ComplianceEngine._control_status([
+            {"status": "not_assessed"}, {"status": "passed"}
+        ]), "passed")
+        self.assertEqual(compliance.ComplianceEngine._control_status([
+            {"status": "passed"}, {"status": "failed"}, {"status": "not_assessed"}
+        ]), "failed")
+        self.assertEqual(compliance.ComplianceEngine._control_status([]), "not_assessed")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,172 @@
+"""
+VHF Graph Builder Benchmark
+Compare bulk OntologyGraphBuilder.build_graph with per-item insertion.
+
+PerItemGraphBuilder reproduces the original build path (one add_node /
+add_edge call per entity and relationship, with membership checks for
+placeholder endpoints). Both builders run on the same synthetic ontology
+at each size; the graphs they produce are checked to be identical
+(nodes, edges, attributes and iteration order) before timing.
+
+Each synthetic ontology has --sizes entities, as many relationships, a
+subclass edge for most entities and a small share of relationship
+endpoints and parents that are not defined (placeholder nodes).
+
+Usage:
+    python benchmark_graph_builder.py
+    python benchmark_graph_builder.py --sizes 10000 100000 --repeat 5 --report bench.json
+"""
+
+import argparse
+import gc
+import json
+import sys
+from typing import Any, Dict, List
+
+import networkx as nx
+
+from benchmark_loader import best_of
+from graph_builder import OntologyGraphBuilder
+from ontology_loader import Entity, Ontology, Relationship
+
+DEFAULT_SIZES = (10_000, 100_000, 1_000_000)
+
+ENTITY_TYPES = ("Core", "Framework", "Supporting", "Class", "Agent", "Process")
+
+
+class PerItemGraphBuilder(OntologyGraphBuilder):
+    """The original one-call-per-item build path, kept as the benchmark baseline."""
+
+    def _add_entity_nodes(self, G: nx.DiGraph, entities: List[Entity]) -> None:
+        for entity in entities:
+            G.add_node(
+                entity.id,
+                label=entity.label,
+                description=entity.description,
+                entity_type=entity.entity_type,
+                properties=entity.properties,
+                node_type='entity',
+                color=self._get_entity_color(entity.entity_type)
+            )
+
+    def _add_relationship_edges(self, G: nx.DiGraph, relationships: List[Relationship]) -> None:
+        for rel in relationships:
+            if rel.source and rel.target:
+                if rel.source not in G:
+                    G.add_node(rel.source, label=rel.source, node_type='entity')
+                if rel.target not in G:
+                    G.add_node(rel.target, label=rel.target, node_type='entity')
+                G.add_edge(
+                    rel.source,
+                    rel.target,
+                    id=rel.id,
+                    label=rel.label,
+                    cardinality=rel.cardinality,
+                    description=rel.description,
+                    edge_type='relationship',
+                    color='#666666'
+                )
+
+    def _add_inheritance_edges(self, G: nx.DiGraph, entities: List[Entity]) -> None:
+        for entity in entities:
+            if entity.parent_class:
+                parent_id = entity.parent_class
+                if parent_id not in G:
+                    G.add_node(parent_id, label=parent_id, node_type='external')
+                G.add_edge(
+                    entity.id,
+                    parent_id,
+                    label='subClassOf',
+                    edge_type='inheritance',
+                    color='#999999',
+                    style='dashed'
+                )
+
+
+def synthetic_ontology(size: int) -> Ontology:
+    """An in-memory ontology with size entities and size relationships."""
+    entities = [
+        Entity(
+            id=f"syn:Class{i}",
+            label=f"Class {i}",
+            description=f"Synthetic class {i}",
+            entity_type=ENTITY_TYPES[i % len(ENTITY_TYPES)],
+            properties={"weight": i} if i % 3 == 0 else {},
+            # Roots subclass an external type; every 50th parent is undefined
+            parent_class=("schema:Thing" if i < 10 else
+                          f"ext:Base{i // 50}" if i % 50 == 0 else f"syn:Class{i // 10}")
+        )
+        for i in range(size)
+    ]
+    relationships = [
+        Relationship(
+            id=f"syn:relates{i}",
+            label=f"relates {i}",
+            source=f"syn:Class{i}",
+            # Every 100th target is not a defined entity
+            target=f"ext:Target{i}" if i % 100 == 0 else f"syn:Class{(i * 7 + 3) % size}",
+            cardinality="1:*"
+        )
+        for i in range(size)
+    ]
+    return Ontology("syn:ontology", "Synthetic", "1.0.0", "", {}, entities, relationships)
+
+
+def same_graph(a: nx.DiGraph, b: nx.DiGraph) -> bool:
+    """Identical nodes, edges, attributes and iteration order."""
+    return (list(a.nodes(data=True)) == list(b.nodes(data=True))
+            and list(a.edges(data=True)) == list(b.edges(data=True))
+            and a.graph == b.graph)
+
+
+def benchmark(size: int, repeat: int) -> Dict[str, Any]:
+    """Time per-item and bulk builds of one synthetic ontology."""
+    ontology = synthetic_ontology(size)
+    baseline, bulk = PerItemGraphBuilder(), OntologyGraphBuilder()
+    expected = baseline.build_graph(ontology)
+    if not same_graph(expected, bulk.build_graph(ontology)):
+        raise AssertionError(f"bulk build differs from per-item build at {size:,} entities")
+    result = {
+        "entities": size,
+        "relationships": len(ontology.relationships),
+        "nodes": expected.number_of_nodes(),
+        "edges": expected.number_of_edges()
+    }
+    del expected
+    gc.collect()
+    result["per_item_s"] = round(best_of(repeat, lambda: baseline.build_graph(ontology)), 4)
+    result["bulk_s"] = round(best_of(repeat, lambda: bulk.build_graph(ontology)), 4)
+    result["speedup"] = round(result["per_item_s"] / result["bulk_s"], 2) if result["bulk_s"] else None
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark bulk OntologyGraphBuilder.build_graph")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES),
+                        help="Entity counts of the synthetic ontologies (default: 10k 100k 1M)")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="Runs per measurement; the fastest is reported (default: 3)")
+    parser.add_argument("--report", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    columns = [("entities", 10), ("relationships", 13), ("nodes", 10), ("edges", 10),
+               ("per_item_s", 11), ("bulk_s", 9), ("speedup", 8)]
+    print(" ".join(f"{name:>{width}}" for name, width in columns))
+    print(" ".join("-" * width for _, width in columns))
+
+    results = []
+    for size in args.sizes:
+        result = benchmark(size, args.repeat)
+        results.append(result)
+        print(" ".join(f"{str(result[name]):>{width}}" for name, width in columns))
+
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump({"results": results}, f, indent=2)
+        print(f"\nReport saved to {args.report}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,493 @@
+"""
+VHF CSR Graph
+Compact, immutable directed graph for registry-scale ontology graphs.
+
+CSRGraph numbers nodes 0..n-1 and stores adjacency as compressed sparse
+row (successors) and column (predecessors) arrays, with one column per
+node and edge attribute. Node ids and attribute values are references to
+the shared (interned) objects the loader produced, so a graph costs tens
+of bytes per edge instead of the hundreds of a networkx dict-of-dicts.
+
+It provides the traversals the analysis code needs (successors,
+predecessors, degree, BFS, shortest path, weakly connected components,
+acyclicity) under the networkx method names those callers use, so code
+written against DiGraph.nodes(data=True) / successors() / subgraph()
+runs on either. to_networkx() converts for everything else.
+
+Node and edge order match the networkx graph built from the same items;
+attribute dicts returned by nodes[...] and edges[...] are copies.
+
+Usage:
+    csr = OntologyGraphBuilder().build_csr(ontology)
+    list(csr.successors(node_id))
+    get_graph_stats(csr)
+    G = csr.to_networkx()
+"""
+
+import sys
+from array import array
+from collections import deque
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Optional, Set, Tuple
+
+import networkx as nx
+
+
+class _Absent:
+    """Marks a node or edge without a given attribute in an attribute column."""
+
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "<absent>"
+
+    def __reduce__(self) -> str:
+        # Unpickles as the module singleton, so identity checks keep working
+        return "_ABSENT"
+
+
+_ABSENT = _Absent()
+
+
+def _offsets(ids: array, n: int) -> array:
+    """Row start offsets (length n + 1) for rows numbered by ids."""
+    offsets = array("q", [0]) * (n + 1)
+    for i in ids:
+        offsets[i + 1] += 1
+    for i in range(n):
+        offsets[i + 1] += offsets[i]
+    return offsets
+
+
+def _columns(rows: List[Dict[str, Any]], order: Optional[array] = None) -> Dict[str, List[Any]]:
+    """Attribute columns from per-row dicts, taking rows in order (default: as given)."""
+    names: Dict[str, None] = {}
+    for attrs in rows:
+        if attrs.keys() - names.keys():
+            names.update(dict.fromkeys(attrs))
+    if order is not None:
+        rows = [rows[slot] for slot in order]
+    return {name: [attrs.get(name, _ABSENT) for attrs in rows] for name in names}
+
+
+class _NodeView:
+    """G.nodes: call for (node, data) iteration, index for a node's attributes."""
+
+    def __init__(self, graph: "CSRGraph"):
+        self._graph = graph
+
+    def __call__(self, data: bool = False) -> Iterator[Any]:
+        graph = self._graph
+        if not data:
+            return iter(graph._keys)
+        return ((key, graph._node_attrs(i)) for i, key in enumerate(graph._keys))
+
+    def __getitem__(self, key: Hashable) -> Dict[str, Any]:
+        return self._graph._node_attrs(self._graph._id(key))
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._graph._keys)
+
+    def __len__(self) -> int:
+        return len(self._graph._keys)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._graph
+
+
+class _EdgeView:
+    """G.edges: call for (u, v[, data]) iteration, index [u, v] for an edge's attributes."""
+
+    def __init__(self, graph: "CSRGraph"):
+        self._graph = graph
+
+    def __call__(self, data: bool = False) -> Iterator[Tuple]:
+        graph = self._graph
+        keys, indptr, indices = graph._keys, graph._indptr, graph._indices
+        for u in range(len(keys)):
+            for position in range(indptr[u], indptr[u + 1]):
+                if data:
+                    yield keys[u], keys[indices[position]], graph._edge_attrs(position)
+                else:
+                    yield keys[u], keys[indices[position]]
+
+    def __getitem__(self, edge: Tuple[Hashable, Hashable]) -> Dict[str, Any]:
+        position = self._graph._edge_position(*edge)
+        if position is None:
+            raise KeyError(f"The edge {edge} is not in the graph.")
+        return self._graph._edge_attrs(position)
+
+    def __iter__(self) -> Iterator[Tuple]:
+        return self()
+
+    def __len__(self) -> int:
+        return self._graph.number_of_edges()
+
+
+class CSRGraph:
+    """Directed graph in CSR/CSC arrays with node and edge attribute columns."""
+
+    def __init__(
+        self,
+        keys: List[Any],
+        node_columns: Dict[str, List[Any]],
+        indptr: array,
+        indices: array,
+        in_indptr: array,
+        in_indices: array,
+        in_edges: array,
+        edge_columns: Dict[str, List[Any]],
+        graph: Optional[Dict[str, Any]] = None
+    ):
+        """Use from_items(), from_networkx() or OntologyGraphBuilder.build_csr()."""
+        self._keys = keys
+        self._index = {key: i for i, key in enumerate(keys)}
+        self._node_columns = node_columns
+        # Successors of node u are indices[indptr[u]:indptr[u + 1]]; edge
+        # attributes are stored at the same (CSR) positions
+        self._indptr = indptr
+        self._indices = indices
+        # Predecessors likewise; in_edges maps each to its CSR position
+        self._in_indptr = in_indptr
+        self._in_indices = in_indices
+        self._in_edges = in_edges
+        self._edge_columns = edge_columns
+        self.graph: Dict[str, Any] = graph if graph is not None else {}
+
+    # ------------------------------------------------------------------
+    # Construction and conversion
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_items(
+        cls,
+        nodes: Iterable[Tuple[Any, Dict[str, Any]]],
+        edges: Iterable[Tuple[Any, Any, Dict[str, Any]]],
+        graph: Optional[Dict[str, Any]] = None
+    ) -> "CSRGraph":
+        """
+        Build from (node, attrs) pairs and (u, v, attrs) triples with
+        DiGraph semantics: repeated nodes and edges merge their attributes,
+        and edge endpoints that are not listed nodes are added bare.
+        """
+        nodes = list(nodes)
+        keys = [key for key, _ in nodes]
+        node_attrs = [attrs for _, attrs in nodes]
+        index = {key: i for i, key in enumerate(keys)}
+        if len(index) != len(keys):
+            keys, node_attrs = cls._merge(keys, node_attrs)
+            index = {key: i for i, key in enumerate(keys)}
+
+        edges = edges if isinstance(edges, list) else list(edges)
+        ends = [end for u, v, _ in edges for end in (u, v)]
+        missing = set(ends).difference(index)
+        if missing:
+            for end in ends:
+                if end in missing and end not in index:
+                    index[end] = len(keys)
+                    keys.append(end)
+                    node_attrs.append({})
+        n = len(keys)
+
+        sources = array("i", [index[u] for u, _, _ in edges])
+        targets = array("i", [index[v] for _, v, _ in edges])
+        edge_attrs = [attrs for _, _, attrs in edges]
+        pairs = [u * n + v for u, v in zip(sources, targets)]
+        if len(set(pairs)) != len(pairs):
+            # Repeated (u, v) pairs: keep the first position, merge attributes
+            pairs, edge_attrs = cls._merge(pairs, edge_attrs)
+            sources = array("i", [pair // n for pair in pairs])
+            targets = array("i", [pair % n for pair in pairs])
+        del pairs, index
+        m = len(edge_attrs)
+
+        # Counting sort by source; first-seen order within each row
+        indptr = _offsets(sources, n)
+        cursor = indptr[:-1]
+        indices = array("i", [0]) * m
+        positions = array("q", [0]) * m
+        order = array("q", [0]) * m
+        for slot in range(m):
+            u = sources[slot]
+            position = cursor[u]
+            cursor[u] = position + 1
+            indices[position] = targets[slot]
+            positions[slot] = position
+            order[position] = slot
+
+        in_indptr = _offsets(targets, n)
+        cursor = in_indptr[:-1]
+        in_indices = array("i", [0]) * m
+        in_edges = array("q", [0]) * m
+        for slot in range(m):
+            v = targets[slot]
+            position = cursor[v]
+            cursor[v] = position + 1
+            in_indices[position] = sources[slot]
+            in_edges[position] = positions[slot]
+
+        return cls(
+            keys, _columns(node_attrs), indptr, indices,
+            in_indptr, in_indices, in_edges, _columns(edge_attrs, order),
+            dict(graph) if graph else {}
+        )
+
+    @staticmethod
+    def _merge(keys: List[Any], rows: List[Dict[str, Any]]) -> Tuple[List[Any], List[Dict[str, Any]]]:
+        """Collapse repeated keys to their first position, later attributes winning."""
+        merged: Dict[Any, Dict[str, Any]] = {}
+        for key, attrs in zip(keys, rows):
+            merged[key] = {**merged[key], **attrs} if key in merged else attrs
+        return list(merged), list(merged.values())
+
+    @classmethod
+    def from_networkx(cls, G: nx.DiGraph) -> "CSRGraph":
+        """Compact a networkx DiGraph."""
+        if not G.is_directed() or G.is_multigraph():
+            raise ValueError("CSRGraph holds directed graphs without parallel edges")
+        return cls.from_items(G.nodes(data=True), list(G.edges(data=True)), G.graph)
+
+    def to_networkx(self) -> nx.DiGraph:
+        """An equivalent networkx DiGraph (attribute dicts are new copies)."""
+        G = nx.DiGraph()
+        G.graph.update(self.graph)
+        G.add_nodes_from(self._keys)
+        node_data = [data for _, data in G.nodes(data=True)]
+        for name, column in self._node_columns.items():
+            for data, value in zip(node_data, column):
+                if value is not _ABSENT:
+                    data[name] = value
+        G.add_edges_from(self.edges(data=True))
+        return G
+
+    def copy(self) -> "CSRGraph":
+        """A copy with its own graph attributes (the arrays are immutable and shared)."""
+        clone = object.__new__(CSRGraph)
+        clone.__dict__.update(self.__dict__)
+        clone.graph = dict(self.graph)
+        return clone
+
+    def subgraph(self, nodes: Iterable[Hashable]) -> "CSRGraph":
+        """The induced subgraph on nodes, in this graph's node and edge order."""
+        keep = bytearray(len(self._keys))
+        for key in nodes:
+            i = self._index.get(key)
+            if i is not None:
+                keep[i] = 1
+        keys, indptr, indices = self._keys, self._indptr, self._indices
+        return CSRGraph.from_items(
+            ((keys[i], self._node_attrs(i)) for i in range(len(keys)) if keep[i]),
+            [
+                (keys[u], keys[indices[p]], self._edge_attrs(p))
+                for u in range(len(keys)) if keep[u]
+                for p in range(indptr[u], indptr[u + 1]) if keep[indices[p]]
+            ],
+            self.graph
+        )
+
+    # ------------------------------------------------------------------
+    # Nodes, edges and attributes
+    # ------------------------------------------------------------------
+
+    @property
+    def nodes(self) -> _NodeView:
+        return _NodeView(self)
+
+    @property
+    def edges(self) -> _EdgeView:
+        return _EdgeView(self)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._keys)
+
+    def __contains__(self, key: Hashable) -> bool:
+        try:
+            return key in self._index
+        except TypeError:
+            return False
+
+    def __repr__(self) -> str:
+        return f"CSRGraph({self.number_of_nodes()} nodes, {self.number_of_edges()} edges)"
+
+    def number_of_nodes(self) -> int:
+        return len(self._keys)
+
+    def number_of_edges(self) -> int:
+        return len(self._indices)
+
+    def has_edge(self, u: Hashable, v: Hashable) -> bool:
+        return self._edge_position(u, v) is not None
+
+    def node_values(self, name: str, default: Any = None) -> List[Any]:
+        """One attribute for every node, in node order (default where absent)."""
+        column = self._node_columns.get(name)
+        if column is None:
+            return [default] * len(self._keys)
+        return [default if value is _ABSENT else value for value in column]
+
+    def edge_values(self, name: str, default: Any = None) -> List[Any]:
+        """One attribute for every edge, in edge order (default where absent)."""
+        column = self._edge_columns.get(name)
+        if column is None:
+            return [default] * len(self._indices)
+        return [default if value is _ABSENT else value for value in column]
+
+    def nbytes(self) -> int:
+        """Approximate bytes used by the structure (excluding shared ids and values)."""
+        arrays = (self._indptr, self._indices, self._in_indptr, self._in_indices, self._in_edges)
+        columns = list(self._node_columns.values()) + list(self._edge_columns.values())
+        return (sum(a.itemsize * len(a) for a in arrays) + sum(sys.getsizeof(c) for c in columns)
+                + sys.getsizeof(self._keys) + sys.getsizeof(self._index))
+
+    def _id(self, key: Hashable) -> int:
+        try:
+            return self._index[key]
+        except (KeyError, TypeError):
+            raise nx.NetworkXError(f"The node {key} is not in the digraph.") from None
+
+    def _node_attrs(self, i: int) -> Dict[str, Any]:
+        return {name: column[i] for name, column in self._node_columns.items() if column[i] is not _ABSENT}
+
+    def _edge_attrs(self, position: int) -> Dict[str, Any]:
+        return {
+            name: column[position]
+            for name, column in self._edge_columns.items()
+            if column[position] is not _ABSENT
+        }
+
+    def _edge_position(self, u: Hashable, v: Hashable) -> Optional[int]:
+        if u not in self or v not in self:
+            return None
+        ui, vi = self._index[u], self._index[v]
+        indices = self._indices
+        for position in range(self._indptr[ui], self._indptr[ui + 1]):
+            if indices[position] == vi:
+                return position
+        return None
+
+    # ------------------------------------------------------------------
+    # Neighbours and degree
+    # ------------------------------------------------------------------
+
+    def successors(self, key: Hashable) -> Iterator[Any]:
+        i = self._id(key)
+        keys = self._keys
+        return (keys[j] for j in self._indices[self._indptr[i]:self._indptr[i + 1]])
+
+    def predecessors(self, key: Hashable) -> Iterator[Any]:
+        i = self._id(key)
+        keys = self._keys
+        return (keys[j] for j in self._in_indices[self._in_indptr[i]:self._in_indptr[i + 1]])
+
+    def out_degree(self, key: Hashable) -> int:
+        i = self._id(key)
+        return self._indptr[i + 1] - self._indptr[i]
+
+    def in_degree(self, key: Hashable) -> int:
+        i = self._id(key)
+        return self._in_indptr[i + 1] - self._in_indptr[i]
+
+    def degree(self, key: Optional[Hashable] = None) -> Any:
+        """In plus out degree of key, or (node, degree) pairs for every node."""
+        if key is not None:
+            return self.in_degree(key) + self.out_degree(key)
+        indptr, in_indptr = self._indptr, self._in_indptr
+        return (
+            (node, indptr[i + 1] - indptr[i] + in_indptr[i + 1] - in_indptr[i])
+            for i, node in enumerate(self._keys)
+        )
+
+    # ------------------------------------------------------------------
+    # Traversal
+    # ------------------------------------------------------------------
+
+    def _neighbour_ids(self, i: int, direction: str) -> Iterable[int]:
+        if direction != "in":
+            yield from self._indices[self._indptr[i]:self._indptr[i + 1]]
+        if direction != "out":
+            yield from self._in_indices[self._in_indptr[i]:self._in_indptr[i + 1]]
+
+    def _bfs_ids(self, start: int, seen: bytearray, direction: str) -> Iterator[int]:
+        seen[start] = 1
+        queue = deque([start])
+        while queue:
+            i = queue.popleft()
+            yield i
+            for j in self._neighbour_ids(i, direction):
+                if not seen[j]:
+                    seen[j] = 1
+                    queue.append(j)
+
+    def bfs(self, source: Hashable, direction: str = "out") -> Iterator[Any]:
+        """
+        Nodes reachable from source in breadth-first order, source first.
+
+        direction is "out" (follow successors), "in" (predecessors) or
+        "both" (ignore edge direction).
+        """
+        if direction not in ("out", "in", "both"):
+            raise ValueError(f"Unknown BFS direction: {direction}")
+        keys = self._keys
+        seen = bytearray(len(keys))
+        return (keys[i] for i in self._bfs_ids(self._id(source), seen, direction))
+
+    def shortest_path(self, source: Hashable, target: Hashable) -> List[Any]:
+        """Fewest-edges directed path from source to target."""
+        for key in (source, target):
+            if key not in self:
+                raise nx.NodeNotFound(f"Node {key} not in graph")
+        start, goal = self._index[source], self._index[target]
+        parents = {start: start}
+        queue = deque([start])
+        while queue and goal not in parents:
+            i = queue.popleft()
+            for j in self._indices[self._indptr[i]:self._indptr[i + 1]]:
+                if j not in parents:
+                    parents[j] = i
+                    queue.append(j)
+        if goal not in parents:
+            raise nx.NetworkXNoPath(f"No path between {source} and {target}.")
+        path = [goal]
+        while path[-1] != start:
+            path.append(parents[path[-1]])
+        return [self._keys[i] for i in reversed(path)]
+
+    def weakly_connected_components(self) -> Iterator[Set[Any]]:
+        """Node sets of the weakly connected components, in node order."""
+        keys = self._keys
+        seen = bytearray(len(keys))
+        for start in range(len(keys)):
+            if not seen[start]:
+                yield {keys[i] for i in self._bfs_ids(start, seen, "both")}
+
+    def number_weakly_connected_components(self) -> int:
+        seen = bytearray(len(self._keys))
+        count = 0
+        for start in range(len(self._keys)):
+            if not seen[start]:
+                count += 1
+                for _ in self._bfs_ids(start, seen, "both"):
+                    pass
+        return count
+
+    def is_directed_acyclic_graph(self) -> bool:
+        """True when the graph has no directed cycle (Kahn's algorithm)."""
+        n = len(self._keys)
+        in_indptr, indptr, indices = self._in_indptr, self._indptr, self._indices
+        remaining = array("q", (in_indptr[i + 1] - in_indptr[i] for i in range(n)))
+        queue = deque(i for i in range(n) if not remaining[i])
+        visited = 0
+        while queue:
+            i = queue.popleft()
+            visited += 1
+            for j in indices[indptr[i]:indptr[i + 1]]:
+                remaining[j] -= 1
+                if not remaining[j]:
+                    queue.append(j)
+        return visited == n
+
+    def density(self) -> float:
+        n = len(self._keys)
+        return self.number_of_edges() / (n * (n - 1)) if n > 1 else 0.0
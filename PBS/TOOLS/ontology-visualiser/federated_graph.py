@@ -0,0 +1,199 @@
+"""
+VHF Federated Graph
+One deduplicated node and edge store shared by many ontologies.
+
+FederatedGraph keeps a single networkx DiGraph (the store) and records,
+for each member (an ontology, or an overlay such as a value chain's layer
+edges), the node ids and (u, v) edge ids it contributes. view(key)
+returns a read-only networkx subgraph view restricted to those ids, so a
+member behaves like the graph build_graph would have produced for it
+while its nodes, edges and attribute dicts are stored once no matter how
+many members share them.
+
+A node or edge has one record in the store. The first member to add it
+defines its attributes, except that a placeholder node (no entity_type)
+is replaced when a member defining the entity is added. Records stay in
+the store until the last member referencing them is removed.
+
+Usage:
+    federation = FederatedGraph()
+    builder = OntologyGraphBuilder()
+    for ontology in ontologies:
+        builder.add_to_federation(federation, ontology)
+    G = federation.view(ontology.id)
+    combined = federation.view(*federation.keys())
+"""
+
+from typing import Any, Dict, Hashable, Iterable, KeysView, List, Optional, Tuple
+
+import networkx as nx
+
+
+class _NodeMembers:
+    """Node filter for nx.subgraph_view over a member's node ids (in insertion order)."""
+
+    __slots__ = ("nodes", "length")
+
+    def __init__(self, nodes: Dict[Hashable, None]):
+        # FilterAtlas iterates .nodes and uses .length instead of scanning the store
+        self.nodes = nodes
+        self.length = len(nodes)
+
+    def __call__(self, node: Hashable) -> bool:
+        return node in self.nodes
+
+
+class _EdgeMembers:
+    """Edge filter for nx.subgraph_view over a member's (u, v) edge ids."""
+
+    __slots__ = ("edges",)
+
+    def __init__(self, edges: Dict[Tuple[Hashable, Hashable], None]):
+        self.edges = edges
+
+    def __call__(self, u: Hashable, v: Hashable) -> bool:
+        return (u, v) in self.edges
+
+
+class FederatedGraph:
+    """Members as node/edge id sets over one deduplicated DiGraph store."""
+
+    def __init__(self):
+        """Create an empty federation."""
+        self.store = nx.DiGraph()
+        self._nodes: Dict[str, Dict[Hashable, None]] = {}
+        self._edges: Dict[str, Dict[Tuple[Hashable, Hashable], None]] = {}
+        self._graphs: Dict[str, Dict[str, Any]] = {}
+        self._node_refs: Dict[Hashable, int] = {}
+        self._edge_refs: Dict[Tuple[Hashable, Hashable], int] = {}
+
+    # ------------------------------------------------------------------
+    # Members
+    # ------------------------------------------------------------------
+
+    def add_items(
+        self,
+        key: str,
+        nodes: Iterable[Tuple[Hashable, Dict[str, Any]]],
+        edges: Iterable[Tuple[Hashable, Hashable, Dict[str, Any]]],
+        graph: Optional[Dict[str, Any]] = None
+    ) -> nx.DiGraph:
+        """
+        Add (or replace) a member from (node, attrs) and (u, v, attrs) items.
+
+        Items follow DiGraph semantics: repeated nodes and edges merge their
+        attributes and edge endpoints that are not listed nodes are added
+        bare.
+
+        Returns:
+            The member's view
+        """
+        if key in self._nodes:
+            self.remove(key)
+
+        own_nodes: Dict[Hashable, Dict[str, Any]] = {}
+        for node, attrs in nodes:
+            own_nodes[node] = {**own_nodes[node], **attrs} if node in own_nodes else attrs
+        own_edges: Dict[Tuple[Hashable, Hashable], Dict[str, Any]] = {}
+        for u, v, attrs in edges:
+            edge = (u, v)
+            own_edges[edge] = {**own_edges[edge], **attrs} if edge in own_edges else attrs
+            own_nodes.setdefault(u, {})
+            own_nodes.setdefault(v, {})
+
+        store_nodes = self.store.nodes
+        node_refs = self._node_refs
+        new_nodes = []
+        for node, attrs in own_nodes.items():
+            if node not in node_refs:
+                new_nodes.append((node, attrs))
+            elif 'entity_type' in attrs and 'entity_type' not in store_nodes[node]:
+                # A defined entity replaces a placeholder for it
+                store_nodes[node].clear()
+                store_nodes[node].update(attrs)
+            node_refs[node] = node_refs.get(node, 0) + 1
+        self.store.add_nodes_from(new_nodes)
+
+        edge_refs = self._edge_refs
+        new_edges = []
+        for edge, attrs in own_edges.items():
+            if edge not in edge_refs:
+                new_edges.append((edge[0], edge[1], attrs))
+            edge_refs[edge] = edge_refs.get(edge, 0) + 1
+        self.store.add_edges_from(new_edges)
+
+        self._nodes[key] = dict.fromkeys(own_nodes)
+        self._edges[key] = dict.fromkeys(own_edges)
+        self._graphs[key] = dict(graph) if graph else {}
+        return self.view(key)
+
+    def add_graph(self, key: str, G: nx.DiGraph) -> nx.DiGraph:
+        """Add (or replace) a member with the nodes, edges and metadata of G; returns its view."""
+        return self.add_items(key, G.nodes(data=True), G.edges(data=True), G.graph)
+
+    def remove(self, key: str) -> None:
+        """Drop a member; store records no other member references are deleted."""
+        nodes = self._nodes.pop(key)
+        edges = self._edges.pop(key)
+        del self._graphs[key]
+        self.store.remove_edges_from(self._release(self._edge_refs, edges))
+        self.store.remove_nodes_from(self._release(self._node_refs, nodes))
+
+    def _release(self, refs: Dict[Any, int], ids: Iterable[Any]) -> List[Any]:
+        """Decrement reference counts; return the ids no longer referenced."""
+        unused = []
+        for item in ids:
+            count = refs[item] - 1
+            if count:
+                refs[item] = count
+            else:
+                del refs[item]
+                unused.append(item)
+        return unused
+
+    def keys(self) -> KeysView:
+        """Member keys in the order they were added."""
+        return self._nodes.keys()
+
+    def nodes_of(self, key: str) -> KeysView:
+        """Node ids of a member."""
+        return self._nodes[key].keys()
+
+    def edges_of(self, key: str) -> KeysView:
+        """(u, v) edge ids of a member."""
+        return self._edges[key].keys()
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._nodes
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __repr__(self) -> str:
+        return (f"<FederatedGraph members={len(self)} nodes={self.store.number_of_nodes()} "
+                f"edges={self.store.number_of_edges()}>")
+
+    # ------------------------------------------------------------------
+    # Views
+    # ------------------------------------------------------------------
+
+    def view(self, *keys: str) -> nx.DiGraph:
+        """
+        Read-only view of one member, or of the union of several.
+
+        The view shares the store's records (use .copy() for an independent
+        graph). Its graph metadata is the members', later keys winning.
+        """
+        if len(keys) == 1:
+            nodes, edges = self._nodes[keys[0]], self._edges[keys[0]]
+        else:
+            nodes, edges = {}, {}
+            for key in keys:
+                nodes.update(self._nodes[key])
+                edges.update(self._edges[key])
+
+        view = nx.subgraph_view(self.store, filter_node=_NodeMembers(nodes), filter_edge=_EdgeMembers(edges))
+        view.graph = {}
+        for key in keys:
+            view.graph.update(self._graphs[key])
+        return view
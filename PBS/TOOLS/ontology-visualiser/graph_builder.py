@@ -8,21 +8,50 @@ Features:
 - Business rules as edge metadata
 - Agent context integration
 - VE value chain paths
+- Compact CSR graphs for registry-scale ontologies (build_csr)
+- Federated graphs sharing one node store across ontologies (add_to_federation)
+- Incrementally maintained graph statistics (TrackedDiGraph)
 """
 
 import networkx as nx
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, Iterable, List, Any, Optional, Tuple
 from pathlib import Path
 
+from csr_graph import CSRGraph
+from federated_graph import FederatedGraph
+from graph_stats import TrackedDiGraph
+from ontology_cache import OntologyCache, default_cache
+from ontology_context import resolver_for
 from ontology_loader import Ontology, Entity, Relationship, OntologyLoader
 
 
+def _display_label(node: Any) -> Any:
+    """Placeholder label: full IRIs in a standard namespace shortened to prefix:local."""
+    return resolver_for(None).compact(node) if isinstance(node, str) else node
+
+
 class OntologyGraphBuilder:
     """Build NetworkX graphs from ontology structures."""
 
-    def __init__(self):
-        """Initialize the graph builder."""
-        self.loader = OntologyLoader()
+    ENTITY_COLORS = {
+        'Core': '#4CAF50',      # Green
+        'Framework': '#2196F3',  # Blue
+        'Supporting': '#FF9800', # Orange
+        'External': '#9E9E9E',   # Grey
+        'Class': '#673AB7',      # Purple
+        'Agent': '#E91E63',      # Pink
+    }
+    DEFAULT_ENTITY_COLOR = '#607D8B'  # Default blue-grey
+
+    def __init__(self, cache: Optional[OntologyCache] = None):
+        """
+        Initialize the graph builder.
+
+        With a cache, from_file reuses graphs built by earlier runs while
+        the source file is unchanged.
+        """
+        self.cache = cache
+        self.loader = OntologyLoader(cache=cache)
 
     def build_graph(self, ontology: Ontology) -> nx.DiGraph:
         """
@@ -33,14 +62,12 @@ class OntologyGraphBuilder:
 
         Returns:
             NetworkX DiGraph with entities as nodes and relationships as edges
+            (a TrackedDiGraph, so get_graph_stats stays cheap as it changes)
         """
-        G = nx.DiGraph()
+        G = TrackedDiGraph()
 
         # Add metadata to graph
-        G.graph['name'] = ontology.name
-        G.graph['version'] = ontology.version
-        G.graph['description'] = ontology.description
-        G.graph['ontology_id'] = ontology.id
+        G.graph.update(self._graph_attributes(ontology))
 
         # Add entity nodes
         self._add_entity_nodes(G, ontology.entities)
@@ -51,76 +78,145 @@ class OntologyGraphBuilder:
         # Add inheritance edges (parent class relationships)
         self._add_inheritance_edges(G, ontology.entities)
 
-        # Add business rules as graph attributes
-        G.graph['business_rules'] = ontology.business_rules
-
         return G
 
+    def build_csr(self, ontology: Ontology) -> CSRGraph:
+        """
+        Build the same graph as build_graph as a compact CSRGraph.
+
+        No networkx graph is created; call to_networkx() on the result
+        for algorithms CSRGraph does not provide.
+        """
+        nodes, edges = self.graph_items(ontology)
+        return CSRGraph.from_items(nodes.items(), edges, self._graph_attributes(ontology))
+
+    def add_to_federation(self, federation: FederatedGraph, ontology: Ontology, key: Optional[str] = None) -> nx.DiGraph:
+        """
+        Add an ontology to a FederatedGraph (keyed by its id unless given).
+
+        Nodes and edges already in the federation's store are shared, not
+        copied; no standalone graph is built.
+
+        Returns:
+            Read-only view equal to build_graph's graph for the ontology
+            (apart from attributes of nodes another member defined first)
+        """
+        nodes, edges = self.graph_items(ontology)
+        return federation.add_items(key or ontology.id, nodes.items(), edges, self._graph_attributes(ontology))
+
+    def graph_items(self, ontology: Ontology) -> Tuple[Dict[Any, Dict[str, Any]], List[Tuple[Any, Any, Dict[str, Any]]]]:
+        """Node attributes by id and (u, v, attrs) edges, in build_graph's insertion order."""
+        nodes = self._entity_nodes(ontology.entities)
+        relationships = self._relationship_edges(ontology.relationships)
+        nodes.update(self._placeholders(nodes, [end for u, v, _ in relationships for end in (u, v)], 'entity'))
+        inheritance = self._inheritance_edges(ontology.entities)
+        nodes.update(self._placeholders(nodes, [v for _, v, _ in inheritance], 'external'))
+        return nodes, relationships + inheritance
+
+    def _graph_attributes(self, ontology: Ontology) -> Dict[str, Any]:
+        """Graph-level metadata, including business rules."""
+        return {
+            'name': ontology.name,
+            'version': ontology.version,
+            'description': ontology.description,
+            'ontology_id': ontology.id,
+            'business_rules': ontology.business_rules
+        }
+
+    # Nodes and edges are prepared as attribute tuples in one pass and
+    # inserted with add_nodes_from/add_edges_from: per-item add_node and
+    # add_edge calls dominate build time on large ontologies. Insertion
+    # order (and so node/edge iteration order) matches adding one by one.
+
     def _add_entity_nodes(self, G: nx.DiGraph, entities: List[Entity]) -> None:
         """Add entity nodes with attributes."""
-        for entity in entities:
-            G.add_node(
-                entity.id,
-                label=entity.label,
-                description=entity.description,
-                entity_type=entity.entity_type,
-                properties=entity.properties,
-                node_type='entity',
-                color=self._get_entity_color(entity.entity_type)
-            )
+        nodes = self._entity_nodes(entities)
+        if len(G):
+            G.add_nodes_from(nodes.items())
+            return
+        # (node, attrs) pairs take a slow exception path in add_nodes_from;
+        # add bare ids, then fill the new attribute dicts in insertion order
+        G.add_nodes_from(nodes)
+        for (_, data), attrs in zip(G.nodes(data=True), nodes.values()):
+            data.update(attrs)
 
     def _add_relationship_edges(self, G: nx.DiGraph, relationships: List[Relationship]) -> None:
         """Add relationship edges with attributes."""
-        for rel in relationships:
-            if rel.source and rel.target:
-                # Ensure source and target nodes exist
-                if rel.source not in G:
-                    G.add_node(rel.source, label=rel.source, node_type='entity')
-                if rel.target not in G:
-                    G.add_node(rel.target, label=rel.target, node_type='entity')
-
-                G.add_edge(
-                    rel.source,
-                    rel.target,
-                    id=rel.id,
-                    label=rel.label,
-                    cardinality=rel.cardinality,
-                    description=rel.description,
-                    edge_type='relationship',
-                    color='#666666'
-                )
+        edges = self._relationship_edges(relationships)
+        # Endpoints that are not entities become placeholder nodes
+        G.add_nodes_from(self._placeholders(G, [end for u, v, _ in edges for end in (u, v)], 'entity').items())
+        G.add_edges_from(edges)
 
     def _add_inheritance_edges(self, G: nx.DiGraph, entities: List[Entity]) -> None:
         """Add inheritance edges for class hierarchy."""
-        for entity in entities:
-            if entity.parent_class:
-                parent_id = entity.parent_class
-                if parent_id not in G:
-                    G.add_node(parent_id, label=parent_id, node_type='external')
+        edges = self._inheritance_edges(entities)
+        G.add_nodes_from(self._placeholders(G, [v for _, v, _ in edges], 'external').items())
+        G.add_edges_from(edges)
+
+    def _entity_nodes(self, entities: List[Entity]) -> Dict[Any, Dict[str, Any]]:
+        """Entity node attributes by id."""
+        colors = self.ENTITY_COLORS
+        default = self.DEFAULT_ENTITY_COLOR
+        # Keyed by id: a repeated id keeps its first position and last attributes
+        return {
+            entity.id: {
+                'label': entity.label,
+                'description': entity.description,
+                'entity_type': entity.entity_type,
+                'properties': entity.properties,
+                'node_type': 'entity',
+                'color': colors.get(entity.entity_type, default)
+            }
+            for entity in entities
+        }
 
-                G.add_edge(
-                    entity.id,
-                    parent_id,
-                    label='subClassOf',
-                    edge_type='inheritance',
-                    color='#999999',
-                    style='dashed'
-                )
+    def _relationship_edges(self, relationships: List[Relationship]) -> List[Tuple[Any, Any, Dict[str, Any]]]:
+        """(source, target, attributes) for relationships with both endpoints."""
+        return [
+            (rel.source, rel.target, {
+                'id': rel.id,
+                'label': rel.label,
+                'cardinality': rel.cardinality,
+                'description': rel.description,
+                'edge_type': 'relationship',
+                'color': '#666666'
+            })
+            for rel in relationships
+            if rel.source and rel.target
+        ]
+
+    def _inheritance_edges(self, entities: List[Entity]) -> List[Tuple[Any, Any, Dict[str, Any]]]:
+        """(entity, parent, attributes) subClassOf edges."""
+        return [
+            (entity.id, entity.parent_class, {
+                'label': 'subClassOf',
+                'edge_type': 'inheritance',
+                'color': '#999999',
+                'style': 'dashed'
+            })
+            for entity in entities
+            if entity.parent_class
+        ]
+
+    def _placeholders(self, present: Iterable[Any], ids: List[Any], node_type: str) -> Dict[Any, Dict[str, Any]]:
+        """Labelled placeholder nodes for ids not in present, in first-seen order."""
+        missing = set(ids).difference(present)
+        placeholders = {}
+        if missing:
+            for node in ids:
+                if node in missing and node not in placeholders:
+                    placeholders[node] = {'label': _display_label(node), 'node_type': node_type}
+        return placeholders
 
     def _get_entity_color(self, entity_type: str) -> str:
         """Get color based on entity type."""
-        colors = {
-            'Core': '#4CAF50',      # Green
-            'Framework': '#2196F3',  # Blue
-            'Supporting': '#FF9800', # Orange
-            'External': '#9E9E9E',   # Grey
-            'Class': '#673AB7',      # Purple
-            'Agent': '#E91E63',      # Pink
-        }
-        return colors.get(entity_type, '#607D8B')  # Default blue-grey
+        return self.ENTITY_COLORS.get(entity_type, self.DEFAULT_ENTITY_COLOR)
 
     def from_file(self, file_path: str | Path) -> nx.DiGraph:
         """Load ontology from file and build graph."""
+        if self.cache is not None:
+            kind = f"graph:{type(self).__qualname__}"
+            return self.cache.cached(file_path, lambda: self.build_graph(self.loader.load_file(file_path)), kind)
         ontology = self.loader.load_file(file_path)
         return self.build_graph(ontology)
 
@@ -133,6 +229,8 @@ class OntologyGraphBuilder:
 class AgentContextGraphBuilder:
     """Build graphs showing agent-ontology relationships."""
 
+    BINDING_TYPES = ('CONSUMES', 'PRODUCES', 'REQUIRES')
+
     def __init__(self):
         """Initialize the agent context builder."""
         self.base_builder = OntologyGraphBuilder()
@@ -145,6 +243,10 @@ class AgentContextGraphBuilder:
         """
         Build a graph showing agent relationships to ontologies.
 
+        Each distinct bound ontology graph is merged once, in place, at its
+        first binding, with the same result as composing it into the agent
+        graph there.
+
         Args:
             agent_bindings: Agent specification with CONSUMES/PRODUCES/REQUIRES
             ontology_graphs: Dict mapping ontology IDs to their graphs
@@ -153,10 +255,75 @@ class AgentContextGraphBuilder:
             Combined graph with agent context
         """
         G = nx.DiGraph()
+        self._add_agent(G, agent_bindings, ontology_graphs, set())
+        return G
+
+    def build_registry_context_graphs(
+        self,
+        registry: Dict[str, Any] | str | Path,
+        ontology_graphs: Optional[Dict[str, nx.DiGraph]] = None,
+        federation: Optional[FederatedGraph] = None
+    ) -> Dict[str, nx.DiGraph]:
+        """
+        Build context graphs for every agent in an agent registry in one pass.
 
-        # Add agent node
-        agent_id = agent_bindings.get('agentId', 'agent')
-        agent_name = agent_bindings.get('agentName', agent_id)
+        All agents share one registry graph into which each bound ontology
+        graph is merged once; an agent's context graph is a read-only view
+        of its node, its ontology nodes and their ontology graphs (use
+        .copy() for an independent graph).
+
+        With a federation, bound ontologies are its members instead: each
+        agent is added as a member (keyed by agent ID) and its context graph
+        is a view over the agent and the members it binds.
+
+        Args:
+            registry: Agent registry dict or path (e.g. sample-ontologies/agent-registry.json)
+            ontology_graphs: Dict mapping ontology IDs to their graphs
+            federation: FederatedGraph holding the ontologies, by ontology ID
+
+        Returns:
+            Dict mapping agent IDs to their context graphs
+        """
+        if not isinstance(registry, dict):
+            with open(registry, 'rb') as f:
+                registry = self.base_builder.loader.json.loads(f.read())
+
+        if federation is not None:
+            views = {}
+            for agent in registry.get('agents', []):
+                agent_graph = nx.DiGraph()
+                agent_id, ontology_ids = self._add_agent(agent_graph, agent, {}, set())
+                federation.add_graph(agent_id, agent_graph)
+                members = [agent_id] + [o for o in dict.fromkeys(ontology_ids) if o in federation and o != agent_id]
+                views[agent_id] = federation.view(*members)
+            return views
+
+        ontology_graphs = ontology_graphs or {}
+        G = nx.DiGraph()
+        merged = set()
+        members = {}
+        for agent in registry.get('agents', []):
+            agent_id, ontology_ids = self._add_agent(G, agent, ontology_graphs, merged)
+            nodes = members.setdefault(agent_id, set())
+            nodes.add(agent_id)
+            nodes.update(ontology_ids)
+            for ont_id in ontology_ids:
+                if ont_id in ontology_graphs:
+                    nodes.update(ontology_graphs[ont_id])
+
+        return {agent_id: G.subgraph(nodes) for agent_id, nodes in members.items()}
+
+    def _add_agent(
+        self,
+        G: nx.DiGraph,
+        agent: Dict[str, Any],
+        ontology_graphs: Dict[str, nx.DiGraph],
+        merged: set
+    ) -> Tuple[str, List[str]]:
+        """Add an agent, its bindings and any ontology graphs not yet in merged."""
+        # Registry entries use id/name, agent specifications agentId/agentName
+        agent_id = agent.get('agentId') or agent.get('id') or 'agent'
+        agent_name = agent.get('agentName') or agent.get('name') or agent_id
 
         G.add_node(
             agent_id,
@@ -166,12 +333,13 @@ class AgentContextGraphBuilder:
         )
 
         # Process ontology bindings
-        bindings = agent_bindings.get('ontologyBindings', {})
+        bindings = agent.get('ontologyBindings', {})
+        ontology_ids = []
 
-        for binding_type in ['CONSUMES', 'PRODUCES', 'REQUIRES']:
-            ontologies = bindings.get(binding_type, [])
-            for ont_ref in ontologies:
+        for binding_type in self.BINDING_TYPES:
+            for ont_ref in bindings.get(binding_type, []):
                 ont_id = ont_ref if isinstance(ont_ref, str) else ont_ref.get('ontologyId', '')
+                ontology_ids.append(ont_id)
 
                 # Add ontology node
                 if ont_id not in G:
@@ -188,12 +356,15 @@ class AgentContextGraphBuilder:
                 else:
                     G.add_edge(ont_id, agent_id, label=binding_type, edge_type='binding')
 
-                # Merge ontology graph if available
-                if ont_id in ontology_graphs:
+                # Merge ontology graph if available (attributes from it win, as in nx.compose)
+                if ont_id in ontology_graphs and ont_id not in merged:
+                    merged.add(ont_id)
                     ont_graph = ontology_graphs[ont_id]
-                    G = nx.compose(G, ont_graph)
+                    G.graph.update(ont_graph.graph)
+                    G.add_nodes_from(ont_graph.nodes(data=True))
+                    G.add_edges_from(ont_graph.edges(data=True))
 
-        return G
+        return agent_id, ontology_ids
 
 
 class VEValueChainBuilder:
@@ -212,13 +383,22 @@ class VEValueChainBuilder:
 
     def build_value_chain_graph(
         self,
-        layer_ontologies: Dict[str, nx.DiGraph]
+        layer_ontologies: Dict[str, nx.DiGraph | str],
+        federation: Optional[FederatedGraph] = None,
+        key: str = 've:value-chain'
     ) -> nx.DiGraph:
         """
         Build a VE value chain graph connecting 8 business layers.
 
+        With a federation, the layer nodes and edges are added as its member
+        key and the result is a read-only view over that member and the
+        layer ontologies; ontology nodes and edges are not copied.
+
         Args:
             layer_ontologies: Dict mapping layer names to their ontology graphs
+                (federation member keys when a federation is given)
+            federation: FederatedGraph holding the layer ontologies
+            key: Member key for the value chain's own nodes and edges
 
         Returns:
             Connected value chain graph
@@ -245,6 +425,24 @@ class VEValueChainBuilder:
                     weight=1.0
                 )
 
+        if federation is not None:
+            members = []
+            for layer_name, member in layer_ontologies.items():
+                layer_idx = self._find_layer_index(layer_name)
+                if layer_idx is not None:
+                    members.append(member)
+                    for node in federation.nodes_of(member):
+                        G.add_edge(
+                            f"layer_{layer_idx}",
+                            node,
+                            label='contains',
+                            edge_type='layer_content'
+                        )
+            federation.add_graph(key, G)
+            view = federation.view(key, *members)
+            view.graph = {}
+            return view
+
         # Merge ontology graphs into relevant layers
         for layer_name, ont_graph in layer_ontologies.items():
             layer_idx = self._find_layer_index(layer_name)
@@ -289,13 +487,33 @@ class VEValueChainBuilder:
 
 
 def build_ontology_graph(file_path: str | Path) -> nx.DiGraph:
-    """Convenience function to build graph from file."""
-    builder = OntologyGraphBuilder()
+    """Convenience function to build graph from file (via the default cache)."""
+    builder = OntologyGraphBuilder(cache=default_cache())
     return builder.from_file(file_path)
 
 
-def get_graph_stats(G: nx.DiGraph) -> Dict[str, Any]:
-    """Get statistics about a graph."""
+def get_graph_stats(G: nx.DiGraph | CSRGraph, recompute: bool = False) -> Dict[str, Any]:
+    """
+    Get statistics about a graph (a networkx DiGraph or a CSRGraph).
+
+    A TrackedDiGraph (as build_graph returns) answers from its stats
+    tracker, which is kept current as the graph changes; recompute forces
+    a full pass (e.g. after attribute dicts were edited directly).
+    """
+    if isinstance(G, TrackedDiGraph) and not nx.is_frozen(G):
+        if recompute:
+            G.stats.recompute()
+        return G.stats.summary()
+    if isinstance(G, CSRGraph):
+        return {
+            'nodes': G.number_of_nodes(),
+            'edges': G.number_of_edges(),
+            'density': G.density(),
+            'is_dag': G.is_directed_acyclic_graph(),
+            'components': G.number_weakly_connected_components(),
+            'node_types': _count_node_types(G),
+            'edge_types': _count_edge_types(G)
+        }
     return {
         'nodes': G.number_of_nodes(),
         'edges': G.number_of_edges(),
@@ -307,20 +525,26 @@ def get_graph_stats(G: nx.DiGraph) -> Dict[str, Any]:
     }
 
 
-def _count_node_types(G: nx.DiGraph) -> Dict[str, int]:
+def _count_node_types(G: nx.DiGraph | CSRGraph) -> Dict[str, int]:
     """Count nodes by type."""
+    if isinstance(G, CSRGraph):
+        values = G.node_values('node_type', 'unknown')
+    else:
+        values = (data.get('node_type', 'unknown') for node, data in G.nodes(data=True))
     types = {}
-    for node, data in G.nodes(data=True):
-        node_type = data.get('node_type', 'unknown')
+    for node_type in values:
         types[node_type] = types.get(node_type, 0) + 1
     return types
 
 
-def _count_edge_types(G: nx.DiGraph) -> Dict[str, int]:
+def _count_edge_types(G: nx.DiGraph | CSRGraph) -> Dict[str, int]:
     """Count edges by type."""
+    if isinstance(G, CSRGraph):
+        values = G.edge_values('edge_type', 'unknown')
+    else:
+        values = (data.get('edge_type', 'unknown') for u, v, data in G.edges(data=True))
     types = {}
-    for u, v, data in G.edges(data=True):
-        edge_type = data.get('edge_type', 'unknown')
+    for edge_type in values:
         types[edge_type] = types.get(edge_type, 0) + 1
     return types
 
@@ -0,0 +1,395 @@
+"""
+VHF Graph Stats
+Graph statistics kept up to date as a graph changes.
+
+TrackedDiGraph is a networkx DiGraph with a GraphStats tracker. The first
+stats query computes everything in one pass; after that the tracker
+follows add/remove calls on the graph, so node and edge counts, node and
+edge type histograms, density, weakly connected components (union-find)
+and acyclicity (an incremental topological order) are answered without
+walking the graph:
+
+- Adding nodes and edges updates every statistic. An added edge that
+  runs against the current topological order reorders only the nodes
+  between its endpoints (Pearce-Kelly) or detects a cycle.
+- Removing edges or non-isolated nodes cannot split a union-find, so
+  components are recounted on the next query; a graph with a cycle
+  likewise re-checks acyclicity. Counts and histograms stay exact.
+- Attribute dicts changed directly (G.nodes[n]["node_type"] = ...) are
+  not seen; use set_node_data / set_edge_data, or recompute().
+
+OntologyGraphBuilder.build_graph returns TrackedDiGraphs and
+get_graph_stats uses their tracker (get_graph_stats(G, recompute=True)
+forces a full pass).
+
+Usage:
+    G = OntologyGraphBuilder().build_graph(ontology)
+    get_graph_stats(G)          # full pass
+    G.add_edge("a", "b", edge_type="relationship")
+    get_graph_stats(G)          # incremental
+"""
+
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+import networkx as nx
+
+UNKNOWN = 'unknown'
+
+
+def _node_type(data: Dict[str, Any]) -> Any:
+    return data.get('node_type', UNKNOWN)
+
+
+def _edge_type(data: Dict[str, Any]) -> Any:
+    return data.get('edge_type', UNKNOWN)
+
+
+def _tally(counts: Dict[Any, int], key: Any, delta: int) -> None:
+    count = counts.get(key, 0) + delta
+    if count:
+        counts[key] = count
+    else:
+        del counts[key]
+
+
+class GraphStats:
+    """Counts, type histograms, components and acyclicity of one DiGraph."""
+
+    def __init__(self, G: nx.DiGraph):
+        """Track G; nothing is computed until the first query."""
+        self.G = G
+        self.valid = False
+        self.edges = 0
+        self.node_types: Dict[Any, int] = {}
+        self.edge_types: Dict[Any, int] = {}
+        # Union-find over weakly connected components; None until recounted
+        self._parent: Dict[Hashable, Hashable] = {}
+        self._size: Dict[Hashable, int] = {}
+        self._components: Optional[int] = None
+        # Topological order while acyclic; None while unknown
+        self._order: Dict[Hashable, int] = {}
+        self._next_order = 0
+        self._is_dag: Optional[bool] = None
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def summary(self) -> Dict[str, Any]:
+        """The get_graph_stats dict."""
+        if not self.valid:
+            self.recompute()
+        n = len(self.G)
+        return {
+            'nodes': n,
+            'edges': self.edges,
+            'density': self.edges / (n * (n - 1)) if n > 1 else 0,
+            'is_dag': self.is_dag(),
+            'components': self.components(),
+            'node_types': dict(self.node_types),
+            'edge_types': dict(self.edge_types)
+        }
+
+    def components(self) -> int:
+        """Number of weakly connected components."""
+        if self._components is None:
+            self._recount_components()
+        return self._components
+
+    def is_dag(self) -> bool:
+        """Whether the graph is acyclic."""
+        if self._is_dag is None:
+            self._recheck_dag()
+        return self._is_dag
+
+    def recompute(self) -> None:
+        """Full pass over the graph; incremental tracking resumes from here."""
+        G = self.G
+        self.node_types = {}
+        for _, data in G.nodes(data=True):
+            _tally(self.node_types, _node_type(data), 1)
+        self.edge_types = {}
+        self.edges = 0
+        for _, _, data in G.edges(data=True):
+            _tally(self.edge_types, _edge_type(data), 1)
+            self.edges += 1
+        self._recount_components()
+        self._recheck_dag()
+        self.valid = True
+
+    def _recount_components(self) -> None:
+        self._parent = {node: node for node in self.G}
+        self._size = dict.fromkeys(self._parent, 1)
+        self._components = len(self._parent)
+        for u, v in self.G.edges():
+            self._union(u, v)
+
+    def _recheck_dag(self) -> None:
+        # Kahn's algorithm; the visiting order is a topological order
+        G = self.G
+        indegree = {node: d for node, d in G.in_degree()}
+        ready = [node for node, d in indegree.items() if d == 0]
+        order: Dict[Hashable, int] = {}
+        while ready:
+            node = ready.pop()
+            order[node] = len(order)
+            for succ in G.successors(node):
+                indegree[succ] -= 1
+                if indegree[succ] == 0:
+                    ready.append(succ)
+        self._is_dag = len(order) == len(G)
+        self._order = order if self._is_dag else {}
+        self._next_order = len(order)
+
+    # ------------------------------------------------------------------
+    # Union-find
+    # ------------------------------------------------------------------
+
+    def _find(self, node: Hashable) -> Hashable:
+        parent = self._parent
+        root = node
+        while parent[root] != root:
+            root = parent[root]
+        while parent[node] != root:
+            parent[node], node = root, parent[node]
+        return root
+
+    def _union(self, u: Hashable, v: Hashable) -> None:
+        ru, rv = self._find(u), self._find(v)
+        if ru == rv:
+            return
+        if self._size[ru] < self._size[rv]:
+            ru, rv = rv, ru
+        self._parent[rv] = ru
+        self._size[ru] += self._size.pop(rv)
+        self._components -= 1
+
+    # ------------------------------------------------------------------
+    # Updates (called by TrackedDiGraph after each change)
+    # ------------------------------------------------------------------
+
+    def node_added(self, node: Hashable, node_type: Any) -> None:
+        _tally(self.node_types, node_type, 1)
+        if self._components is not None:
+            self._parent[node] = node
+            self._size[node] = 1
+            self._components += 1
+        if self._is_dag:
+            # A new node has no edges: last in the order is as good as any
+            self._order[node] = self._next_order
+            self._next_order += 1
+
+    def node_retyped(self, old: Any, new: Any) -> None:
+        if old != new:
+            _tally(self.node_types, old, -1)
+            _tally(self.node_types, new, 1)
+
+    def node_removed(self, node: Hashable, node_type: Any, edge_types: List[Any]) -> None:
+        _tally(self.node_types, node_type, -1)
+        for edge_type in edge_types:
+            self.edge_removed(edge_type)
+        if self._components is not None:
+            if edge_types:
+                self._components = None
+            else:
+                # Isolated, so a singleton set in an up-to-date union-find
+                del self._parent[node], self._size[node]
+                self._components -= 1
+        if self._is_dag:
+            del self._order[node]
+
+    def edge_added(self, u: Hashable, v: Hashable, edge_type: Any) -> None:
+        _tally(self.edge_types, edge_type, 1)
+        self.edges += 1
+        if self._components is not None:
+            self._union(u, v)
+        if self._is_dag:
+            self._is_dag = self._keep_order(u, v)
+            if not self._is_dag:
+                self._order = {}
+
+    def edge_retyped(self, old: Any, new: Any) -> None:
+        if old != new:
+            _tally(self.edge_types, old, -1)
+            _tally(self.edge_types, new, 1)
+
+    def edge_removed(self, edge_type: Any) -> None:
+        _tally(self.edge_types, edge_type, -1)
+        self.edges -= 1
+        # A union-find cannot split; a cycle may have been broken
+        self._components = None
+        if self._is_dag is False:
+            self._is_dag = None
+
+    def _keep_order(self, u: Hashable, v: Hashable) -> bool:
+        """Restore the topological order after adding u -> v; False on a cycle."""
+        order = self._order
+        upper, lower = order[u], order[v]
+        if upper < lower:
+            return True
+        if u == v:
+            return False
+        G = self.G
+        # Nodes reachable from v that sit at or before u in the order
+        forward, stack = {v}, [v]
+        while stack:
+            for succ in G._succ[stack.pop()]:
+                if succ == u:
+                    return False
+                if succ not in forward and order[succ] < upper:
+                    forward.add(succ)
+                    stack.append(succ)
+        # Nodes reaching u that sit at or after v in the order
+        backward, stack = {u}, [u]
+        while stack:
+            for pred in G._pred[stack.pop()]:
+                if pred not in backward and order[pred] > lower:
+                    backward.add(pred)
+                    stack.append(pred)
+        # Reuse the affected slots: everything reaching u, then everything from v
+        moved = sorted(backward, key=order.__getitem__) + sorted(forward, key=order.__getitem__)
+        for node, slot in zip(moved, sorted(order[node] for node in moved)):
+            order[node] = slot
+        return True
+
+
+class TrackedDiGraph(nx.DiGraph):
+    """A DiGraph whose .stats tracker follows its add and remove calls."""
+
+    def __init__(self, incoming_graph_data: Any = None, **attr: Any):
+        self.stats = GraphStats(self)
+        super().__init__(incoming_graph_data, **attr)
+
+    def _tracking(self) -> bool:
+        # Views share the class but not the tracker's graph state
+        return self.stats.valid and not nx.is_frozen(self)
+
+    # Nodes ----------------------------------------------------------------
+
+    def add_node(self, node_for_adding: Hashable, **attr: Any) -> None:
+        if not self._tracking():
+            return super().add_node(node_for_adding, **attr)
+        data = self._node.get(node_for_adding)
+        old = _node_type(data) if data is not None else None
+        super().add_node(node_for_adding, **attr)
+        self._node_changed(node_for_adding, old)
+
+    def add_nodes_from(self, nodes_for_adding: Iterable[Any], **attr: Any) -> None:
+        if not self._tracking():
+            return super().add_nodes_from(nodes_for_adding, **attr)
+        nodes = list(nodes_for_adding)
+        before = {}
+        for item in nodes:
+            # As in add_nodes_from: an unhashable item is a (node, attrs) pair
+            try:
+                node = item
+                hash(node)
+            except TypeError:
+                node = item[0]
+            if node not in before:
+                data = self._node.get(node)
+                before[node] = _node_type(data) if data is not None else None
+        super().add_nodes_from(nodes, **attr)
+        for node, old in before.items():
+            self._node_changed(node, old)
+
+    def _node_changed(self, node: Hashable, old: Any) -> None:
+        new = _node_type(self._node[node])
+        if old is None:
+            self.stats.node_added(node, new)
+        else:
+            self.stats.node_retyped(old, new)
+
+    def remove_node(self, n: Hashable) -> None:
+        if not self._tracking() or n not in self._node:
+            return super().remove_node(n)
+        edge_types = [_edge_type(data) for data in self._succ[n].values()]
+        edge_types += [_edge_type(data) for pred, data in self._pred[n].items() if pred != n]
+        node_type = _node_type(self._node[n])
+        super().remove_node(n)
+        self.stats.node_removed(n, node_type, edge_types)
+
+    def remove_nodes_from(self, nodes: Iterable[Hashable]) -> None:
+        if not self._tracking():
+            return super().remove_nodes_from(nodes)
+        for n in list(nodes):
+            if n in self._node:
+                self.remove_node(n)
+
+    def set_node_data(self, n: Hashable, data: Dict[str, Any]) -> None:
+        """Replace n's attributes with data (adding n if needed)."""
+        self.add_node(n)
+        attrs = self._node[n]
+        old = _node_type(attrs)
+        attrs.clear()
+        attrs.update(data)
+        if self._tracking():
+            self.stats.node_retyped(old, _node_type(attrs))
+
+    # Edges ----------------------------------------------------------------
+
+    def add_edge(self, u_of_edge: Hashable, v_of_edge: Hashable, **attr: Any) -> None:
+        if not self._tracking():
+            return super().add_edge(u_of_edge, v_of_edge, **attr)
+        before = self._edge_state(u_of_edge, v_of_edge)
+        super().add_edge(u_of_edge, v_of_edge, **attr)
+        self._edge_changed(u_of_edge, v_of_edge, *before)
+
+    def add_edges_from(self, ebunch_to_add: Iterable[Tuple], **attr: Any) -> None:
+        if not self._tracking():
+            return super().add_edges_from(ebunch_to_add, **attr)
+        # One at a time: the order update assumes all other edges respect it
+        for e in list(ebunch_to_add):
+            before = self._edge_state(e[0], e[1])
+            super().add_edges_from([e], **attr)
+            self._edge_changed(e[0], e[1], *before)
+
+    def _edge_state(self, u: Hashable, v: Hashable) -> Tuple[List[Hashable], Any]:
+        """Endpoints not yet in the graph, and the edge's type if it exists."""
+        new_nodes = [n for n in dict.fromkeys((u, v)) if n not in self._node]
+        data = self._succ[u].get(v) if u in self._succ else None
+        return new_nodes, _edge_type(data) if data is not None else None
+
+    def _edge_changed(self, u: Hashable, v: Hashable, new_nodes: List[Hashable], old: Any) -> None:
+        stats = self.stats
+        for node in new_nodes:
+            stats.node_added(node, _node_type(self._node[node]))
+        new = _edge_type(self._succ[u][v])
+        if old is None:
+            stats.edge_added(u, v, new)
+        else:
+            stats.edge_retyped(old, new)
+
+    def remove_edge(self, u: Hashable, v: Hashable) -> None:
+        if not self._tracking() or not self.has_edge(u, v):
+            return super().remove_edge(u, v)
+        edge_type = _edge_type(self._succ[u][v])
+        super().remove_edge(u, v)
+        self.stats.edge_removed(edge_type)
+
+    def remove_edges_from(self, ebunch: Iterable[Tuple]) -> None:
+        if not self._tracking():
+            return super().remove_edges_from(ebunch)
+        for e in list(ebunch):
+            if self.has_edge(e[0], e[1]):
+                self.remove_edge(e[0], e[1])
+
+    def set_edge_data(self, u: Hashable, v: Hashable, data: Dict[str, Any]) -> None:
+        """Replace the attributes of edge (u, v) with data (adding it if needed)."""
+        self.add_edge(u, v)
+        attrs = self._succ[u][v]
+        old = _edge_type(attrs)
+        attrs.clear()
+        attrs.update(data)
+        if self._tracking():
+            self.stats.edge_retyped(old, _edge_type(attrs))
+
+    # Whole graph ------------------------------------------------------------
+
+    def clear(self) -> None:
+        super().clear()
+        self.stats = GraphStats(self)
+
+    def clear_edges(self) -> None:
+        super().clear_edges()
+        self.stats = GraphStats(self)
@@ -0,0 +1,660 @@
+"""
+VHF OAA Validator
+Server-side OAA quality gates (G1-G6) and graph audit for loaded ontologies.
+
+A Python port of validateOAAv5 / auditGraph in js/audit-engine.js that
+runs on OntologyLoader output and OntologyGraphBuilder graphs, so the
+registry can be validated in batch without a browser.
+
+Gate rules are compiled once: patterns are precompiled at import and each
+gate is a function of the facts collected by one pass over the ontology's
+entities, relationships and business rules and one pass over its graph.
+validate_many() spreads files over a process pool.
+
+Results serialise to the same JSON as the browser: ValidationResult.to_dict()
+is the object renderOAACompliancePanel (js/compliance-reporter.js) takes,
+and audit_report() builds the OAAAuditReport of generateAuditReport
+(js/export.js).
+
+Usage:
+    result = validate_ontology(ontology, graph)
+    result.overall                      # 'pass', 'warn' or 'fail'
+
+    python oaa_validator.py sample-ontologies --report audit.json
+"""
+
+import json
+import math
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import networkx as nx
+
+from graph_builder import OntologyGraphBuilder
+from ontology_cache import OntologyCache
+from ontology_loader import Ontology, OntologyLoader
+
+OAA_VERSION = "6.1.0"
+AUDIT_VERSION = "1.0.0"
+
+# Files per process-pool task in validate_many
+BATCH_CHUNK_SIZE = 32
+
+# Accept both dot notation (n..1) and colon notation (n:1, n:m, 1:n)
+CARDINALITY_PATTERN = re.compile(r"^(0|1|\*|n|m)((\.\.)|([:]))?(0|1|\*|n|m)?$", re.IGNORECASE)
+IF_THEN_PATTERN = re.compile(r"^IF\s+.+\s+THEN\s+.+$", re.IGNORECASE)
+EXPRESSION_PATTERN = re.compile(
+    r"^[A-Za-z_][A-Za-z0-9_.]*\s*(==|!=|>|<|>=|<=|&&|\|\||\s+AND\s+|\s+OR\s+)", re.IGNORECASE
+)
+PASCAL_CASE_PATTERN = re.compile(r"^[A-Z][a-zA-Z0-9]*$")
+WHITESPACE_PATTERN = re.compile(r"\s")
+LOWER_START_PATTERN = re.compile(r"^[a-z]")
+
+# Loader formats that carry a registry envelope (G6)
+REGISTRY_FORMATS = ("uniregistry", "registry")
+
+
+@dataclass
+class GateResult:
+    """Outcome of one quality gate."""
+    gate: str
+    status: str  # "pass", "warn" or "fail"
+    issues: List[str] = field(default_factory=list)
+    warnings: List[str] = field(default_factory=list)
+    detail: str = ""
+    advisory: bool = False
+    skipped: bool = False
+    # Gate-specific fields (orphaned ids for G2B, component count for G2C)
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = {
+            "gate": self.gate,
+            "status": self.status,
+            "issues": self.issues,
+            "warnings": self.warnings,
+            "detail": self.detail,
+            **self.extra
+        }
+        if self.advisory:
+            result["advisory"] = True
+        if self.skipped:
+            result["skipped"] = True
+        return result
+
+
+@dataclass
+class ValidationResult:
+    """All gate results for one ontology, plus its graph audit."""
+    gates: List[GateResult]
+    overall: str
+    summary: Dict[str, int]
+    audit: Dict[str, Any] = field(default_factory=dict)
+
+    def gate(self, prefix: str) -> Optional[GateResult]:
+        """The gate whose name starts with prefix (e.g. "G2B"), if it ran."""
+        for result in self.gates:
+            if result.gate.split(":")[0] == prefix:
+                return result
+        return None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The validation object of validateOAAv5."""
+        return {
+            "gates": [g.to_dict() for g in self.gates],
+            "overall": self.overall,
+            "summary": self.summary
+        }
+
+
+@dataclass
+class AuditResult:
+    """Outcome of validating one file in a batch."""
+    path: Path
+    report: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class _UnionFind:
+    """Disjoint sets over hashable ids, for connected components in one edge pass."""
+
+    def __init__(self):
+        self.parent: Dict[Any, Any] = {}
+
+    def add(self, item: Any) -> None:
+        self.parent.setdefault(item, item)
+
+    def find(self, item: Any) -> Any:
+        parent = self.parent
+        root = item
+        while parent[root] != root:
+            root = parent[root]
+        while parent[item] != root:
+            parent[item], item = root, parent[item]
+        return root
+
+    def union(self, a: Any, b: Any) -> None:
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a != root_b:
+            self.parent[root_b] = root_a
+
+    def groups(self) -> List[List[Any]]:
+        """Components, largest first."""
+        groups: Dict[Any, List[Any]] = {}
+        for item in self.parent:
+            groups.setdefault(self.find(item), []).append(item)
+        return sorted(groups.values(), key=len, reverse=True)
+
+
+@dataclass
+class _Facts:
+    """Everything the gates read, collected in one traversal of an ontology and its graph."""
+    ontology: Ontology
+    graph: nx.DiGraph
+    entity_count: int = 0
+    entities_missing_id: List[int] = field(default_factory=list)
+    entities_missing_type: int = 0
+    relationship_count: int = 0
+    relationship_issues: List[str] = field(default_factory=list)
+    relationship_warnings: List[str] = field(default_factory=list)
+    rule_count: int = 0
+    rules_compliant: int = 0
+    rule_issues: List[str] = field(default_factory=list)
+    rule_warnings: List[str] = field(default_factory=list)
+    # Nodes the ontology defines; placeholders and external parents are meta nodes
+    domain_nodes: List[Any] = field(default_factory=list)
+    orphaned: List[Any] = field(default_factory=list)
+    domain_components: int = 0
+    semantic_warnings: List[str] = field(default_factory=list)
+    components: List[List[Any]] = field(default_factory=list)
+    isolated: List[Any] = field(default_factory=list)
+    stub_nodes: List[Any] = field(default_factory=list)
+
+
+def _percent(part: int, whole: int) -> int:
+    """part/whole as a whole percentage, rounding halves up like Math.round."""
+    return math.floor(part * 100 / whole + 0.5)
+
+
+def _text(value: Any) -> str:
+    return value if isinstance(value, str) else ""
+
+
+def _status(issues: List[str], warnings: List[str]) -> str:
+    return "fail" if issues else ("warn" if warnings else "pass")
+
+
+def _collect(ontology: Ontology, graph: nx.DiGraph) -> _Facts:
+    """Single pass over entities, relationships, rules, nodes and edges."""
+    facts = _Facts(ontology, graph)
+
+    for i, entity in enumerate(ontology.entities):
+        facts.entity_count += 1
+        if not entity.id:
+            facts.entities_missing_id.append(i)
+        if not entity.entity_type:
+            facts.entities_missing_type += 1
+
+    for i, rel in enumerate(ontology.relationships):
+        facts.relationship_count += 1
+        name = rel.label or rel.id or f"Relationship {i}"
+        if not rel.source:
+            facts.relationship_issues.append(f"{name}: missing domain")
+        if not rel.target:
+            facts.relationship_issues.append(f"{name}: missing range")
+        if isinstance(rel.cardinality, str) and rel.cardinality and not CARDINALITY_PATTERN.match(rel.cardinality):
+            facts.relationship_warnings.append(f'{name}: non-standard cardinality notation "{rel.cardinality}"')
+
+    for i, rule in enumerate(ontology.business_rules):
+        facts.rule_count += 1
+        _check_rule(facts, i, rule if isinstance(rule, dict) else {"rule": rule})
+
+    everything = _UnionFind()
+    domain = _UnionFind()
+    defined = {}
+    for node, data in graph.nodes(data=True):
+        everything.add(node)
+        if "entity_type" in data:
+            defined[node] = data
+            domain.add(node)
+        else:
+            facts.stub_nodes.append(node)
+    for u, v in graph.edges():
+        everything.union(u, v)
+        if u in defined and v in defined:
+            domain.union(u, v)
+
+    for node, data in defined.items():
+        facts.domain_nodes.append(node)
+        # The browser parser labels unlabelled nodes with their id
+        label = _text(data.get("label")) or str(node)
+        if graph.degree(node) == 0:
+            facts.orphaned.append(node)
+        if not _text(data.get("description")).strip():
+            facts.semantic_warnings.append(f"{label}: missing description")
+        if (label and not PASCAL_CASE_PATTERN.match(label) and not WHITESPACE_PATTERN.search(label)
+                and LOWER_START_PATTERN.match(label) and "_" in label):
+            facts.semantic_warnings.append(f"{label}: consider PascalCase naming")
+
+    facts.isolated = [node for node in graph.nodes if graph.degree(node) == 0]
+    facts.components = everything.groups()
+    facts.domain_components = len(domain.groups())
+    return facts
+
+
+def _check_rule(facts: _Facts, i: int, rule: Dict[str, Any]) -> None:
+    """Classify one business rule for G3."""
+    name = rule.get("name") or rule.get("@id") or rule.get("id") or f"Rule {i + 1}"
+    condition, action = _text(rule.get("condition")), _text(rule.get("action"))
+    if condition and action:
+        text = f"{condition} {action}"
+    else:
+        text = _text(rule.get("expression") or rule.get("rule") or rule.get("description"))
+
+    if IF_THEN_PATTERN.match(text):
+        facts.rules_compliant += 1
+    elif condition and action:
+        if condition.upper().startswith("IF") and "MUST" in action.upper():
+            facts.rules_compliant += 1
+        else:
+            facts.rule_warnings.append(f"{name}: condition/action should use IF...THEN format")
+    elif EXPRESSION_PATTERN.match(text):
+        facts.rule_warnings.append(f"{name}: has expression but not IF-THEN format")
+    elif not text.strip():
+        facts.rule_issues.append(f"{name}: empty rule expression")
+    else:
+        facts.rule_warnings.append(f"{name}: convert to IF-THEN format")
+
+    if not rule.get("severity"):
+        facts.rule_warnings.append(f"{name}: missing severity (error/warning/info)")
+
+
+# ----------------------------------------------------------------------
+# Gates
+# ----------------------------------------------------------------------
+
+def gate_schema_structure(facts: _Facts) -> GateResult:
+    ontology = facts.ontology
+    issues, warnings = [], []
+    if not ontology.context:
+        warnings.append("Missing @context (not strict JSON-LD)")
+    if not ontology.id and not ontology.name:
+        issues.append("Missing ontology identifier (@id, id, or name)")
+    if not facts.entity_count:
+        issues.append("No entities found (entities, hasDefinedTerm, or @graph)")
+    issues.extend(f"Entity {i}: missing identifier" for i in facts.entities_missing_id)
+    return GateResult(
+        "G1: Schema Structure", _status(issues, warnings), issues, warnings,
+        "Valid JSON structure" if not issues else f"{len(issues)} issue(s) found"
+    )
+
+
+def gate_relationship_cardinality(facts: _Facts) -> GateResult:
+    name = "G2: Relationship Cardinality"
+    if not facts.relationship_count:
+        return GateResult(name, "warn", [], ["No explicit relationships defined"], "No relationships to validate")
+    issues, warnings = facts.relationship_issues, facts.relationship_warnings
+    return GateResult(
+        name, _status(issues, warnings), list(issues), list(warnings),
+        f"{facts.relationship_count} relationship(s) checked"
+    )
+
+
+def gate_entity_connectivity(facts: _Facts) -> GateResult:
+    graph = facts.graph
+    total = len(facts.domain_nodes)
+    connected = total - len(facts.orphaned)
+    pct = _percent(connected, total) if total else 100
+    return GateResult(
+        "G2B: Entity Connectivity",
+        "fail" if facts.orphaned else "pass",
+        [f"{graph.nodes[n].get('label') or n} ({graph.nodes[n].get('entity_type')})" for n in facts.orphaned],
+        [],
+        f"{pct}% entities connected ({connected}/{total})",
+        extra={"orphaned": list(facts.orphaned)}
+    )
+
+
+def gate_graph_connectivity(facts: _Facts) -> GateResult:
+    name = "G2C: Graph Connectivity"
+    if not facts.domain_nodes:
+        return GateResult(name, "pass", [], [], "No domain entities")
+    count = facts.domain_components
+    connected = count <= 1
+    return GateResult(
+        name,
+        "pass" if connected else "warn",
+        [],
+        [] if connected else [f"{count} disconnected clusters"],
+        "Single connected component" if connected else f"{count} components",
+        extra={"components": count}
+    )
+
+
+def gate_business_rules(facts: _Facts) -> GateResult:
+    name = "G3: Business Rules"
+    if not facts.rule_count:
+        return GateResult(name, "warn", [], ["No business rules defined"], "Consider adding IF-THEN business rules")
+    pct = _percent(facts.rules_compliant, facts.rule_count)
+    issues = list(facts.rule_issues)
+    return GateResult(
+        name,
+        "fail" if issues else ("warn" if pct < 80 else "pass"),
+        issues,
+        facts.rule_warnings[:5],
+        f"{pct}% rules in IF-THEN format ({facts.rules_compliant}/{facts.rule_count})"
+    )
+
+
+def gate_semantic_consistency(facts: _Facts) -> GateResult:
+    warnings = facts.semantic_warnings
+    shown = warnings[:5]
+    if len(warnings) > 5:
+        shown.append(f"... and {len(warnings) - 5} more")
+    return GateResult(
+        "G4: Semantic Consistency", _status([], warnings), [], shown,
+        "All entities have descriptions" if not warnings else f"{len(warnings)} entities missing descriptions"
+    )
+
+
+def gate_completeness(facts: _Facts) -> GateResult:
+    ontology = facts.ontology
+    registry = ontology.metadata.get("registryMetadata") or {}
+    warnings = []
+    if not (ontology.context or registry):
+        warnings.append("No metadata block found")
+    else:
+        if not (ontology.version or registry.get("version")):
+            warnings.append("Missing version")
+        if not (ontology.metadata.get("creator") or registry.get("author") or registry.get("creator")):
+            warnings.append("Missing author/creator")
+
+    if facts.entities_missing_type:
+        warnings.append(f"{facts.entities_missing_type} entities missing @type")
+
+    defined = len(facts.domain_nodes)
+    if defined > 3:
+        ratio = facts.graph.number_of_edges() / defined
+        if ratio < 0.5:
+            warnings.append(f"Low edge-to-node ratio: {ratio:.2f} (recommend ≥0.8)")
+
+    return GateResult(
+        "G5: Completeness", _status([], warnings), [], warnings,
+        "All required fields present" if not warnings else f"{len(warnings)} recommendation(s)",
+        advisory=True
+    )
+
+
+def gate_uniregistry(facts: _Facts) -> GateResult:
+    name = "G6: UniRegistry Format"
+    metadata = facts.ontology.metadata
+    if metadata.get("format") not in REGISTRY_FORMATS:
+        return GateResult(name, "pass", [], [], "Not UniRegistry format (OK)", advisory=True, skipped=True)
+
+    warnings = []
+    if metadata.get("format") == "uniregistry":
+        if not facts.ontology.name:
+            warnings.append("ontologyDefinition missing name")
+        if not facts.entity_count:
+            warnings.append("ontologyDefinition missing @graph or entities")
+        registry = metadata.get("registryMetadata") or {}
+        if not registry.get("registryId"):
+            warnings.append("registryMetadata missing registryId")
+        if not (registry.get("registeredAt") or registry.get("createdAt")):
+            warnings.append("registryMetadata missing timestamp")
+    return GateResult(name, _status([], warnings), [], warnings, "UniRegistry format validated", advisory=True)
+
+
+Gate = Callable[[_Facts], GateResult]
+
+# In report order; G5 and G6 are advisory and do not affect the overall status
+GATES: Tuple[Gate, ...] = (
+    gate_schema_structure,
+    gate_relationship_cardinality,
+    gate_entity_connectivity,
+    gate_graph_connectivity,
+    gate_business_rules,
+    gate_semantic_consistency,
+    gate_completeness,
+    gate_uniregistry,
+)
+
+
+class OAAValidator:
+    """Run the OAA quality gates over ontologies and their graphs."""
+
+    def __init__(
+        self,
+        gates: Optional[Iterable[Gate]] = None,
+        cache: Optional[OntologyCache] = None,
+        json_backend: Optional[str] = None
+    ):
+        self.gates = tuple(gates) if gates is not None else GATES
+        self.cache = cache
+        self.loader = OntologyLoader(cache=cache, json_backend=json_backend)
+        self.builder = OntologyGraphBuilder()
+
+    def validate(self, ontology: Ontology, graph: Optional[nx.DiGraph] = None) -> ValidationResult:
+        """Validate an ontology; its graph is built when not given."""
+        if graph is None:
+            graph = self.builder.build_graph(ontology)
+        facts = _collect(ontology, graph)
+        gates = [gate(facts) for gate in self.gates]
+
+        core = [g for g in gates if not g.advisory and not g.skipped]
+        summary = {
+            "pass": sum(g.status == "pass" for g in core),
+            "warn": sum(g.status == "warn" for g in core),
+            "fail": sum(g.status == "fail" for g in core),
+            "advisory": sum(g.advisory for g in gates)
+        }
+        overall = "fail" if summary["fail"] else ("warn" if summary["warn"] else "pass")
+        return ValidationResult(gates, overall, summary, audit_graph(graph, facts))
+
+    def validate_file(self, file_path: str | Path) -> Dict[str, Any]:
+        """Load, validate and audit one file; returns its OAAAuditReport."""
+        ontology = self.loader.load_file(file_path)
+        graph = self.builder.build_graph(ontology)
+        return audit_report(ontology, self.validate(ontology, graph), graph, str(file_path))
+
+    def validate_many(
+        self,
+        file_paths: Iterable[str | Path],
+        max_workers: Optional[int] = None
+    ) -> Iterator[AuditResult]:
+        """
+        Validate many files in a process pool.
+
+        Files are sent to workers in chunks and results are yielded as
+        each chunk finishes (not in input order). A file that fails to
+        load yields an AuditResult with error set. With max_workers=1,
+        files are validated in this process.
+        """
+        paths = [Path(p) for p in file_paths]
+        workers = min(max_workers or os.cpu_count() or 1, len(paths))
+        if workers <= 1:
+            for path in paths:
+                yield _audit_file(self, path)
+            return
+
+        # Small enough chunks to keep every worker busy to the end
+        size = max(1, min(BATCH_CHUNK_SIZE, len(paths) // (workers * 4)))
+        chunks = [paths[i:i + size] for i in range(0, len(paths), size)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_audit_batch, self.gates, self.cache, self.loader.json.name, c) for c in chunks]
+            for future in as_completed(futures):
+                yield from future.result()
+
+
+def _audit_file(validator: OAAValidator, path: Path) -> AuditResult:
+    try:
+        return AuditResult(path, validator.validate_file(path))
+    except Exception as e:
+        return AuditResult(path, error=f"{type(e).__name__}: {e}")
+
+
+def _audit_batch(
+    gates: Tuple[Gate, ...],
+    cache: Optional[OntologyCache],
+    json_backend: str,
+    paths: List[Path]
+) -> List[AuditResult]:
+    """Process-pool entry point for OAAValidator.validate_many."""
+    validator = OAAValidator(gates, cache=cache, json_backend=json_backend)
+    return [_audit_file(validator, path) for path in paths]
+
+
+def audit_graph(graph: nx.DiGraph, facts: Optional[_Facts] = None) -> Dict[str, Any]:
+    """Graph audit of auditGraph: isolated nodes, components and stub nodes."""
+    if facts is None:
+        facts = _collect(Ontology("", "", "", "", {}, [], []), graph)
+    components = facts.components
+    return {
+        "format": graph.graph.get("format", ""),
+        "totalNodes": graph.number_of_nodes(),
+        "totalEdges": graph.number_of_edges(),
+        "isolated": facts.isolated,
+        "components": components,
+        "stubNodes": facts.stub_nodes,
+        "mainComponentSize": len(components[0]) if components else 0,
+        "disconnectedCount": len(components) - 1
+    }
+
+
+def audit_report(
+    ontology: Ontology,
+    validation: ValidationResult,
+    graph: nx.DiGraph,
+    source_file: str = "",
+    registry_info: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """OAAAuditReport for one ontology, as generateAuditReport writes it."""
+    timestamp = datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+    name = ontology.name or (ontology.id.split("/")[-1] if ontology.id else "") or "unnamed"
+    slug = re.sub(r"\s+", "-", name.lower())
+    defined = sum("entity_type" in data for _, data in graph.nodes(data=True))
+    orphaned = validation.gate("G2B")
+
+    return {
+        "@context": "https://oaa-ontology.org/audit/v1/",
+        "@type": "OAAAuditReport",
+        "@id": f"audit:{slug}-{re.sub(r'[:.]', '-', timestamp)}",
+        "auditMetadata": {
+            "generatedAt": timestamp,
+            "generatedBy": f"OAA Validator (Python) v{OAA_VERSION}",
+            "oaaVersion": OAA_VERSION,
+            "auditVersion": AUDIT_VERSION
+        },
+        "ontologyMetadata": {
+            "name": name,
+            "version": ontology.version or "unknown",
+            "schemaVersion": None,
+            "domain": None,
+            "previousVersion": None,
+            "sourceFile": source_file or ontology.metadata.get("source") or "unknown"
+        },
+        "complianceResult": {
+            "overallStatus": validation.overall,
+            "summary": validation.summary
+        },
+        "gateResults": [
+            {
+                "gateId": g.gate.split(":")[0].strip(),
+                "gateName": g.gate.split(":", 1)[1].strip() if ":" in g.gate else g.gate,
+                "status": g.status,
+                "isAdvisory": g.advisory,
+                "isSkipped": g.skipped,
+                "detail": g.detail,
+                "issues": g.issues,
+                "warnings": g.warnings
+            }
+            for g in validation.gates
+        ],
+        "graphMetrics": {
+            "totalNodes": graph.number_of_nodes(),
+            "totalEdges": graph.number_of_edges(),
+            "entityCount": defined,
+            "relationshipCount": len(ontology.relationships),
+            "businessRuleCount": len(ontology.business_rules),
+            "edgeToNodeRatio": f"{graph.number_of_edges() / defined:.2f}" if defined else 0,
+            "connectedComponents": len(validation.audit.get("components", [])) or 1,
+            "orphanedEntities": orphaned.extra.get("orphaned", []) if orphaned else []
+        },
+        "registryInfo": {
+            "matched": True,
+            "entryId": registry_info.get("entryId"),
+            "registryVersion": registry_info.get("version"),
+            "registryStatus": registry_info.get("status"),
+            "validatedDate": registry_info.get("validatedDate"),
+            "dependencies": registry_info.get("dependencies", []),
+            "dependents": registry_info.get("dependents", [])
+        } if registry_info else {"matched": False}
+    }
+
+
+def batch_report(results: Iterable[AuditResult]) -> Dict[str, Any]:
+    """Combine batch results into one report: per-file OAAAuditReports plus a status summary."""
+    reports, errors = [], []
+    summary = {"pass": 0, "warn": 0, "fail": 0, "error": 0}
+    for result in results:
+        if result.ok:
+            reports.append(result.report)
+            summary[result.report["complianceResult"]["overallStatus"]] += 1
+        else:
+            errors.append({"sourceFile": str(result.path), "error": result.error})
+            summary["error"] += 1
+    reports.sort(key=lambda r: r["ontologyMetadata"]["sourceFile"])
+    return {
+        "@context": "https://oaa-ontology.org/audit/v1/",
+        "@type": "OAABatchAuditReport",
+        "auditMetadata": reports[0]["auditMetadata"] if reports else {},
+        "summary": summary,
+        "reports": reports,
+        "errors": errors
+    }
+
+
+def validate_ontology(ontology: Ontology, graph: Optional[nx.DiGraph] = None) -> ValidationResult:
+    """Convenience function to run every gate over one ontology."""
+    return OAAValidator().validate(ontology, graph)
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Validate ontologies against the OAA quality gates")
+    parser.add_argument("paths", nargs="+", help="Ontology files or directories")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--report", help="Write the batch audit report as JSON to this file")
+    args = parser.parse_args()
+
+    validator = OAAValidator()
+    files = []
+    for path in args.paths:
+        files.extend(validator.loader.discover(path) if Path(path).is_dir() else [Path(path)])
+
+    results = sorted(validator.validate_many(files, max_workers=args.workers), key=lambda r: str(r.path))
+    for result in results:
+        if result.ok:
+            compliance = result.report["complianceResult"]
+            print(f"  {compliance['overallStatus'].upper():5} {result.path}: {compliance['summary']}")
+        else:
+            print(f"  ERROR {result.path}: {result.error}")
+
+    report = batch_report(results)
+    print(f"\n{len(results)} files: {report['summary']}")
+    if args.report:
+        with open(args.report, 'w') as f:
+            json.dump(report, f, indent=2, default=str)
+        print(f"Report saved to {args.report}")
+    sys.exit(1 if report["summary"]["fail"] or report["summary"]["error"] else 0)
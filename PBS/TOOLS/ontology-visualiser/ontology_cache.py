@@ -0,0 +1,174 @@
+"""
+VHF Ontology Cache
+Persistent on-disk cache of parsed ontologies and built graphs.
+
+Entries are pickled and keyed by the source file's path. Each entry
+records the file's size, mtime and SHA-256 at the time it was parsed:
+an unchanged size and mtime is a hit without reading the file, and a
+changed mtime with identical content (e.g. a fresh checkout) is still
+a hit after hashing. The cache directory is bounded in size; the least
+recently used entries are evicted first.
+
+Configuration:
+    VHF_ONTOLOGY_CACHE=0          disable the default cache
+    VHF_ONTOLOGY_CACHE_DIR=<dir>  cache location (default ~/.cache/vhf-ontology)
+
+Usage:
+    cache = default_cache()           # None when disabled
+    ontology = cache.cached(path, lambda: loader.load_file(path))
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+# Bump when pickled payload classes (Ontology, Entity, ...) change shape
+# or the loader's output for the same file changes
+CACHE_FORMAT = 4
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+_DISABLED_VALUES = ("0", "false", "no", "off")
+
+_enabled = os.environ.get("VHF_ONTOLOGY_CACHE", "1").strip().lower() not in _DISABLED_VALUES
+_default: Optional["OntologyCache"] = None
+
+
+def set_cache_enabled(enabled: bool) -> None:
+    """Globally enable or disable the default cache."""
+    global _enabled
+    _enabled = enabled
+
+
+def default_cache() -> Optional["OntologyCache"]:
+    """The shared cache used by load_ontology/build_ontology_graph, or None if disabled."""
+    global _default
+    if not _enabled:
+        return None
+    if _default is None:
+        _default = OntologyCache()
+    return _default
+
+
+def _file_digest(path: Path) -> str:
+    with open(path, 'rb') as f:
+        if hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(f, "sha256").hexdigest()
+        # Python < 3.11
+        digest = hashlib.sha256()
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+        return digest.hexdigest()
+
+
+class OntologyCache:
+    """Size-bounded LRU cache of pickled values derived from ontology files."""
+
+    def __init__(self, directory: Optional[str | Path] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        default_dir = Path.home() / ".cache" / "vhf-ontology"
+        self.directory = Path(directory or os.environ.get("VHF_ONTOLOGY_CACHE_DIR") or default_dir)
+        self.max_bytes = max_bytes
+
+    def entry_path(self, file_path: str | Path, kind: str = "ontology") -> Path:
+        """Cache file holding the kind of value derived from file_path."""
+        key = f"{kind}\0{Path(file_path).resolve()}".encode("utf-8")
+        return self.directory / f"{hashlib.sha1(key).hexdigest()}.pkl"
+
+    def get(self, file_path: str | Path, kind: str = "ontology") -> Any:
+        """Return the cached value for file_path, or None on a miss."""
+        entry = self.entry_path(file_path, kind)
+        try:
+            stat = os.stat(file_path)
+            with open(entry, 'rb') as f:
+                header = pickle.load(f)
+                if not self._matches(header, file_path, stat):
+                    return None
+                value = pickle.load(f)
+            # Touch the entry so eviction sees it as recently used
+            os.utime(entry)
+        except Exception:
+            # Missing, stale-format or corrupt entries are misses
+            return None
+        return value
+
+    def put(
+        self,
+        file_path: str | Path,
+        value: Any,
+        kind: str = "ontology",
+        signature: Optional[Dict[str, Any]] = None
+    ) -> None:
+        """
+        Store value for file_path.
+
+        signature is the file's size/mtime/digest as read before value was
+        built (see signature()); it defaults to the file's current state.
+        """
+        header = {"format": CACHE_FORMAT, "kind": kind, **(signature or self.signature(file_path))}
+        entry = self.entry_path(file_path, kind)
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    pickle.dump(header, f, pickle.HIGHEST_PROTOCOL)
+                    pickle.dump(value, f, pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp, entry)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+            self._evict()
+        except (OSError, pickle.PicklingError, TypeError, AttributeError):
+            # The cache is best effort: read-only locations or unpicklable
+            # values just mean the next run parses again
+            pass
+
+    def cached(self, file_path: str | Path, build: Callable[[], Any], kind: str = "ontology") -> Any:
+        """Return the cached value for file_path, building and storing it on a miss."""
+        value = self.get(file_path, kind)
+        if value is not None:
+            return value
+        try:
+            signature = self.signature(file_path)
+        except OSError:
+            # Let build() report the missing/unreadable file
+            return build()
+        value = build()
+        self.put(file_path, value, kind, signature)
+        return value
+
+    def signature(self, file_path: str | Path) -> Dict[str, Any]:
+        """Size, mtime and content digest identifying the current file."""
+        stat = os.stat(file_path)
+        return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": _file_digest(Path(file_path))}
+
+    def clear(self) -> None:
+        """Remove every cache entry."""
+        for entry in self.directory.glob("*.pkl"):
+            entry.unlink(missing_ok=True)
+
+    def _matches(self, header: Dict[str, Any], file_path: str | Path, stat: os.stat_result) -> bool:
+        if header.get("format") != CACHE_FORMAT or header.get("size") != stat.st_size:
+            return False
+        if header.get("mtime_ns") == stat.st_mtime_ns:
+            return True
+        return header.get("sha256") == _file_digest(Path(file_path))
+
+    def _evict(self) -> None:
+        """Delete least recently used entries until the cache fits max_bytes."""
+        entries = []
+        for entry in self.directory.glob("*.pkl"):
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, entry))
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries, key=lambda e: e[0]):
+            if total <= self.max_bytes:
+                break
+            entry.unlink(missing_ok=True)
+            total -= size
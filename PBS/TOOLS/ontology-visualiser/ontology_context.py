@@ -0,0 +1,166 @@
+"""
+VHF Ontology Context
+JSON-LD @context expansion and IRI interning.
+
+IriResolver expands compact IRIs (prefix:local) in ids, domains and
+ranges to full IRIs using an ontology's @context. The same concept
+written as vsom:Vision in one file and as its full IRI in another then
+becomes one interned string, and so one graph node. compact() maps full
+IRIs back to their shortest prefixed form for display, using a trie of
+the known namespaces.
+
+Every expansion and compaction is memoised, and resolver_for() shares
+one resolver between all ontologies with the same @context, so merging
+many registry ontologies expands each distinct term once.
+
+Usage:
+    resolver = resolver_for(ontology.context)
+    resolver.expand("vsom:Vision")      # 'https://.../vsom#Vision'
+    resolver.compact(iri)               # 'vsom:Vision'
+"""
+
+import json
+import sys
+from typing import Any, Dict, Optional, Tuple
+
+# Prefixes assumed when an ontology's @context does not define them
+STANDARD_PREFIXES = {
+    "owl": "http://www.w3.org/2002/07/owl#",
+    "rdf": "http://www.w3.org/1999/02/22-rdf-syntax-ns#",
+    "rdfs": "http://www.w3.org/2000/01/rdf-schema#",
+    "xsd": "http://www.w3.org/2001/XMLSchema#",
+    "skos": "http://www.w3.org/2004/02/skos/core#",
+    "schema": "https://schema.org/",
+}
+
+# A term is usable as a prefix when its IRI ends in a JSON-LD gen-delim
+_PREFIX_ENDINGS = ("/", "#", ":", "?", "[", "]", "@")
+
+# Distinct @context values kept by resolver_for
+MAX_SHARED_RESOLVERS = 256
+
+
+def expand_term(term: str, prefixes: Dict[str, str], vocab: Optional[str] = None) -> str:
+    """Expand a compact IRI (prefix:local) or vocabulary term to a full IRI."""
+    prefix, sep, local = term.partition(":")
+    if sep:
+        if prefix in prefixes and not local.startswith("//"):
+            return prefixes[prefix] + local
+        return term
+    return vocab + term if vocab else term
+
+
+class NamespaceTrie:
+    """Character trie of namespace IRIs for longest-namespace lookup."""
+
+    def __init__(self):
+        self._root: Dict[str, Any] = {}
+
+    def add(self, namespace: str, prefix: str) -> None:
+        node = self._root
+        for char in namespace:
+            node = node.setdefault(char, {})
+        # None is never a character key, so it marks the end of a namespace
+        node.setdefault(None, prefix)
+
+    def longest(self, iri: str) -> Optional[Tuple[int, str]]:
+        """(namespace length, prefix) of the longest namespace iri starts with."""
+        node = self._root
+        match = None
+        for position, char in enumerate(iri):
+            if None in node:
+                match = (position, node[None])
+            node = node.get(char)
+            if node is None:
+                return match
+        if None in node:
+            match = (len(iri), node[None])
+        return match
+
+
+class IriResolver:
+    """Expands and compacts IRIs against one JSON-LD @context."""
+
+    def __init__(self, context: Any = None):
+        self.prefixes: Dict[str, str] = dict(STANDARD_PREFIXES)
+        self.vocab: Optional[str] = None
+        self._absorb(context)
+        self._expanded: Dict[str, str] = {}
+        self._vocab_expanded: Dict[str, str] = {}
+        self._compacted: Dict[str, str] = {}
+        self._trie: Optional[NamespaceTrie] = None
+
+    def _absorb(self, context: Any) -> None:
+        if isinstance(context, str):
+            # A remote context; the loaders treat it as the vocabulary
+            self.vocab = context
+        elif isinstance(context, list):
+            for item in context:
+                self._absorb(item)
+        elif isinstance(context, dict):
+            for term, value in context.items():
+                if isinstance(value, dict):
+                    value = value.get("@id")
+                if not isinstance(value, str):
+                    continue
+                if term == "@vocab":
+                    self.vocab = value
+                elif not term.startswith("@") and value.endswith(_PREFIX_ENDINGS):
+                    self.prefixes[term] = value
+
+    def expand(self, value: Any) -> Any:
+        """
+        Canonical interned IRI for an id, domain or range.
+
+        Compact IRIs with a known prefix are expanded; full IRIs, bare ids
+        and unknown prefixes are kept. Non-string values pass through.
+        """
+        if type(value) is not str:
+            return value
+        try:
+            return self._expanded[value]
+        except KeyError:
+            pass
+        iri = sys.intern(expand_term(value, self.prefixes))
+        self._expanded[value] = iri
+        return iri
+
+    def expand_vocab(self, term: str) -> str:
+        """Like expand, but bare terms (e.g. @type values) resolve against @vocab."""
+        try:
+            return self._vocab_expanded[term]
+        except KeyError:
+            pass
+        iri = sys.intern(expand_term(term, self.prefixes, self.vocab))
+        self._vocab_expanded[term] = iri
+        return iri
+
+    def compact(self, iri: str) -> str:
+        """Shortest prefix:local form of iri, or iri itself if no namespace matches."""
+        try:
+            return self._compacted[iri]
+        except KeyError:
+            pass
+        if self._trie is None:
+            self._trie = NamespaceTrie()
+            # Shorter prefixes first, so they win for a shared namespace
+            for prefix, namespace in sorted(self.prefixes.items(), key=lambda p: (len(p[0]), p[0])):
+                self._trie.add(namespace, prefix)
+        match = self._trie.longest(iri)
+        compacted = f"{match[1]}:{iri[match[0]:]}" if match and match[0] < len(iri) else iri
+        self._compacted[iri] = compacted
+        return compacted
+
+
+_shared: Dict[str, IriResolver] = {}
+
+
+def resolver_for(context: Any) -> IriResolver:
+    """Shared IriResolver for a @context; equal contexts share memoised expansions."""
+    key = json.dumps(context, sort_keys=True, default=str)
+    resolver = _shared.get(key)
+    if resolver is None:
+        if len(_shared) >= MAX_SHARED_RESOLVERS:
+            _shared.clear()
+        resolver = _shared[key] = IriResolver(context)
+    return resolver
@@ -8,13 +8,90 @@ Supports:
 - OAA-generated ontologies
 """
 
+import copy
+import hashlib
 import json
+import os
+import pickle
+import re
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, List, Any, Optional
-from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Callable, Dict, List, Any, Iterable, Iterator, Optional, TextIO, Tuple, Union
+from dataclasses import dataclass, field, fields
 
+from ontology_cache import OntologyCache, default_cache
+from ontology_context import STANDARD_PREFIXES, IriResolver, expand_term, resolver_for
 
-@dataclass
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+if TYPE_CHECKING:
+    from ontology_store import OntologyStore
+
+# Characters read per chunk when streaming a file
+STREAM_CHUNK_SIZE = 1 << 16
+
+# Top-level sections streamed one entry at a time
+STREAM_SECTIONS = ("@graph", "classes", "relationships", "objectProperties")
+
+# File patterns discovered by load_directory
+ONTOLOGY_PATTERNS = ("*.json", "*.jsonld")
+
+
+@dataclass(frozen=True)
+class JsonBackend:
+    """A JSON decoder/encoder pair working on UTF-8 bytes."""
+    name: str
+    loads: Callable[[bytes], Any]
+    dumps: Callable[[Any, bool], bytes]  # (obj, indent) -> bytes
+
+
+JSON_BACKENDS: Dict[str, JsonBackend] = {}
+
+
+def register_json_backend(backend: JsonBackend) -> None:
+    """Make a JSON backend selectable by name (OntologyLoader(json_backend=...))."""
+    JSON_BACKENDS[backend.name] = backend
+
+
+def get_json_backend(name: Optional[str] = None) -> JsonBackend:
+    """Return the named backend, or the fastest registered one."""
+    if name is None:
+        name = "orjson" if "orjson" in JSON_BACKENDS else "json"
+    if name not in JSON_BACKENDS:
+        raise ValueError(f"Unknown JSON backend '{name}' (available: {', '.join(JSON_BACKENDS)})")
+    return JSON_BACKENDS[name]
+
+
+def _stdlib_dumps(obj: Any, indent: bool = False) -> bytes:
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode("utf-8")
+
+
+register_json_backend(JsonBackend("json", json.loads, _stdlib_dumps))
+
+if ORJSON_AVAILABLE:
+    def _orjson_loads(data: bytes) -> Any:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # orjson rejects some input the stdlib accepts (NaN, integers
+            # beyond 64 bits); keep the stdlib's behaviour for those
+            return json.loads(data)
+
+    def _orjson_dumps(obj: Any, indent: bool = False) -> bytes:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+        except TypeError:
+            # Non-string keys, oversized integers, ...
+            return _stdlib_dumps(obj, indent)
+
+    register_json_backend(JsonBackend("orjson", _orjson_loads, _orjson_dumps))
+
+
+@dataclass(slots=True)
 class Entity:
     """Represents an ontology entity/class."""
     id: str
@@ -25,7 +102,7 @@ class Entity:
     parent_class: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Relationship:
     """Represents a relationship between entities."""
     id: str
@@ -49,73 +126,603 @@ class Ontology:
     business_rules: List[Dict[str, str]] = field(default_factory=list)
     metadata: Dict[str, Any] = field(default_factory=dict)
 
+    @property
+    def entity_count(self) -> int:
+        return len(self.entities)
+
+    @property
+    def relationship_count(self) -> int:
+        return len(self.relationships)
+
+
+# Ontology fields parsed on first access by LazyOntology
+_LAZY_FIELDS = ("entities", "relationships", "business_rules")
+
+
+class LazyOntology(Ontology):
+    """
+    An Ontology over already-decoded JSON whose entities, relationships and
+    business_rules are parsed on first access.
+
+    The file is still fully JSON-decoded when it is loaded; only object
+    construction is deferred, so a registry scan saves materialisation
+    cost, not parse cost. Header fields (id, name, version, description,
+    context, metadata) are read up front. @graph nodes are not classified
+    until entity_count or relationship_count is first read, which counts
+    them without building Entity/Relationship objects, or until the
+    entities are parsed. Compares equal to the eagerly loaded Ontology of
+    the same file.
+    """
+
+    def __init__(
+        self,
+        header: Ontology,
+        counts: Callable[[], Tuple[int, int]],
+        parse: Callable[[], Ontology]
+    ):
+        for name in ("id", "name", "version", "description", "context", "metadata"):
+            setattr(self, name, getattr(header, name))
+        self._count: Optional[Callable[[], Tuple[int, int]]] = counts
+        self._counts: Optional[Tuple[int, int]] = None
+        self._parse: Optional[Callable[[], Ontology]] = parse
+        self._parsed: Optional[Ontology] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._parsed is not None
+
+    def _load(self) -> Ontology:
+        if self._parsed is None:
+            self._parsed = self._parse()
+            # Release the decoded JSON held by the closures
+            self._parse = self._count = None
+        return self._parsed
+
+    def _get_counts(self) -> Tuple[int, int]:
+        if self._parsed is not None:
+            return len(self._parsed.entities), len(self._parsed.relationships)
+        if self._counts is None:
+            self._counts = self._count()
+        return self._counts
+
+    entities = property(lambda self: self._load().entities,
+                        lambda self, value: setattr(self._load(), "entities", value))
+    relationships = property(lambda self: self._load().relationships,
+                             lambda self, value: setattr(self._load(), "relationships", value))
+    business_rules = property(lambda self: self._load().business_rules,
+                              lambda self, value: setattr(self._load(), "business_rules", value))
+
+    @property
+    def entity_count(self) -> int:
+        return self._get_counts()[0]
+
+    @property
+    def relationship_count(self) -> int:
+        return self._get_counts()[1]
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Ontology):
+            return NotImplemented
+        return all(getattr(self, f.name) == getattr(other, f.name) for f in fields(Ontology))
+
+    def __repr__(self) -> str:
+        if self.loaded:
+            return f"LazyOntology(loaded={self._parsed!r})"
+        return (f"LazyOntology(id={self.id!r}, name={self.name!r}, version={self.version!r}, "
+                f"loaded=False)")
+
+
+GraphNodeHandler = Callable[[Dict[str, Any]], Optional[Union[Entity, Relationship]]]
+
+
+def _graph_class(node: Dict[str, Any]) -> Entity:
+    return Entity(
+        id=node.get("@id", ""),
+        label=node.get("rdfs:label", node.get("name", "")),
+        description=node.get("rdfs:comment", node.get("description", "")),
+        entity_type="Class"
+    )
+
+
+def _graph_property(node: Dict[str, Any]) -> Relationship:
+    return Relationship(
+        id=node.get("@id", ""),
+        label=node.get("rdfs:label", ""),
+        source=node.get("rdfs:domain", ""),
+        target=node.get("rdfs:range", "")
+    )
+
+
+# Expanded @type IRI -> handler(node), used by every new OntologyLoader
+GRAPH_TYPE_HANDLERS: Dict[str, GraphNodeHandler] = {}
+
+
+def register_graph_type(type_iri: str, handler: GraphNodeHandler) -> None:
+    """
+    Handle @graph nodes of type_iri (compact with a standard prefix, or full) with handler.
+
+    handler(node) returns an Entity, a Relationship, or None to skip the node.
+    """
+    GRAPH_TYPE_HANDLERS[expand_term(type_iri, STANDARD_PREFIXES)] = handler
+
+
+for _type in ("owl:Class", "rdfs:Class"):
+    register_graph_type(_type, _graph_class)
+for _type in ("rdf:Property", "owl:ObjectProperty", "owl:DatatypeProperty", "owl:AnnotationProperty"):
+    register_graph_type(_type, _graph_property)
+
+
+def _handler_fingerprint(handlers: Dict[str, GraphNodeHandler]) -> str:
+    """Short digest of a type -> handler table, naming each handler and hashing its code."""
+    digest = hashlib.sha1()
+    for type_iri, handler in sorted(handlers.items()):
+        name = getattr(handler, "__qualname__", type(handler).__qualname__)
+        digest.update(f"{type_iri}={getattr(handler, '__module__', '')}.{name}\0".encode("utf-8"))
+        code = getattr(handler, "__code__", None)
+        if code is not None:
+            digest.update(code.co_code)
+    return digest.hexdigest()[:12]
+
+
+class _TypeIndex:
+    """
+    Resolves raw @type values to handlers for one ontology.
+
+    Each distinct @type string is expanded against the ontology's @context
+    once and memoised, so classifying a node is a dict lookup. Types with
+    no registered handler fall back on their local name: "Class" is an
+    entity and "...Property" a relationship, in any vocabulary.
+    """
+
+    _LOCAL_NAME = re.compile(r"[^#/:]*$")
+
+    def __init__(self, handlers: Dict[str, GraphNodeHandler], resolver: IriResolver):
+        self.handlers = handlers
+        self.resolver = resolver
+        self._memo: Dict[str, Optional[GraphNodeHandler]] = {}
+
+    def classify(self, node: Dict[str, Any]) -> Optional[Union[Entity, Relationship]]:
+        node_type = node.get("@type")
+        try:
+            handler = self._memo[node_type]
+        except (KeyError, TypeError):  # first sighting, or a list @type
+            handler = self.handler(node_type)
+        return handler(node) if handler is not None else None
+
+    def handler(self, node_type: Any) -> Optional[GraphNodeHandler]:
+        if isinstance(node_type, list):
+            # First type with a handler wins
+            for value in node_type:
+                handler = self.handler(value)
+                if handler is not None:
+                    return handler
+            return None
+        if not isinstance(node_type, str):
+            return None
+        try:
+            return self._memo[node_type]
+        except KeyError:
+            pass
+        iri = self.resolver.expand_vocab(node_type)
+        handler = self.handlers.get(iri)
+        if handler is None:
+            local = self._LOCAL_NAME.search(iri).group()
+            if local == "Class":
+                handler = _graph_class
+            elif local.endswith("Property"):
+                handler = _graph_property
+        self._memo[node_type] = handler
+        return handler
+
+
+@dataclass
+class LoadResult:
+    """Outcome of loading one file in a batch: an ontology or an error."""
+    path: Path
+    ontology: Optional[Ontology] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
 
 class OntologyLoader:
     """Load and parse JSON-LD ontology files."""
 
-    def __init__(self, base_path: Optional[Path] = None):
-        """Initialize loader with optional base path for ontology files."""
+    def __init__(
+        self,
+        base_path: Optional[Path] = None,
+        store: Optional["OntologyStore"] = None,
+        cache: Optional[OntologyCache] = None,
+        json_backend: Optional[str] = None,
+        canonical_ids: bool = False
+    ):
+        """
+        Initialize loader with optional base path for ontology files.
+
+        With a store, entities and relationships of every loaded ontology
+        are kept in the store's compact columnar tables instead of lists.
+        With a cache, load_file reuses ontologies parsed by earlier runs
+        while the file is unchanged. json_backend picks a registered
+        decoder by name (default: orjson when installed, else json).
+        Ids are kept as written in the source by default. With
+        canonical_ids, entity ids, parent classes and relationship
+        ids/domains/ranges written as compact IRIs (prefix:local) are
+        expanded to full interned IRIs via the ontology's @context, so
+        ontologies mixing both forms merge onto the same graph nodes.
+        """
         self.base_path = base_path or Path.cwd()
+        self.store = store
+        self.cache = cache
+        self.json = get_json_backend(json_backend)
+        self.canonical_ids = canonical_ids
+        self.type_handlers = dict(GRAPH_TYPE_HANDLERS)
+
+    def register_type_handler(self, type_iri: str, handler: GraphNodeHandler) -> None:
+        """Like register_graph_type, for this loader only."""
+        self.type_handlers[expand_term(type_iri, STANDARD_PREFIXES)] = handler
+
+    @property
+    def cache_kind(self) -> str:
+        """
+        Cache kind of ontologies parsed by this loader (id mode and type handlers).
+
+        Cached ontologies never hold store tables: they are parsed without
+        the store and compacted into this loader's store when returned.
+        """
+        kind = "ontology" if self.canonical_ids else "ontology:source-ids"
+        return f"{kind}:{_handler_fingerprint(self.type_handlers)}"
+
+    def type_index(self, context: Any) -> _TypeIndex:
+        """@type dispatch index for an ontology with the given @context."""
+        return _TypeIndex(self.type_handlers, resolver_for(context))
+
+    def canonicalize(self, item: Union[Entity, Relationship], resolver: IriResolver) -> Union[Entity, Relationship]:
+        """Expand an item's ids and references to canonical IRIs, in place."""
+        expand = resolver.expand
+        item.id = expand(item.id)
+        if isinstance(item, Entity):
+            item.parent_class = expand(item.parent_class)
+        else:
+            item.source = expand(item.source)
+            item.target = expand(item.target)
+        return item
+
+    def load_file(self, file_path: str | Path, stream: bool = False, lazy: bool = False) -> Ontology:
+        """
+        Load ontology from JSON file.
+
+        With stream=True the file is parsed incrementally: @graph nodes and
+        classes/relationships entries are decoded one at a time, so peak
+        memory is bounded by the largest entry rather than the file size.
+
+        With lazy=True the whole file is still decoded, but @graph nodes
+        are only classified, and entities, relationships and business rules
+        only built, when first needed (see LazyOntology); headline metadata
+        is cheap. Lazy loads bypass the cache.
+        """
+        path = self._resolve(file_path)
+        if lazy:
+            if stream:
+                raise ValueError("stream and lazy loading are mutually exclusive")
+            with open(path, 'rb') as f:
+                data = self.json.loads(f.read())
+            return self.parse_lazy(data, str(path))
+        if self.cache is not None:
+            plain = self._without_store()
+            return self._compact(self.cache.cached(path, lambda: plain._load_path(path, stream), self.cache_kind))
+        return self._load_path(path, stream)
+
+    def _load_path(self, path: Path, stream: bool) -> Ontology:
+        if stream:
+            return self._load_streaming(path)
+
+        with open(path, 'rb') as f:
+            data = self.json.loads(f.read())
+
+        return self.parse_ontology(data, str(path))
+
+    def _compact(self, ontology: Ontology) -> Ontology:
+        return self.store.compact(ontology) if self.store is not None else ontology
+
+    def _without_store(self) -> "OntologyLoader":
+        """This loader, or a copy of it without the store, building list-backed ontologies."""
+        if self.store is None:
+            return self
+        plain = copy.copy(self)
+        plain.store = None
+        return plain
+
+    def iter_file(
+        self,
+        file_path: str | Path,
+        chunk_size: Optional[int] = None
+    ) -> Iterator[Union[Entity, Relationship]]:
+        """
+        Yield entities and relationships from a file as they are parsed.
+
+        The first entities arrive before the rest of the file is read.
+        Formats without @graph/classes sections (registry entries, inferred
+        formats) yield nothing; use load_file for those.
+        """
+        path = self._resolve(file_path)
+        fields: Dict[str, Any] = {}
+        types: Optional[_TypeIndex] = None
+        for kind, container, key, value in self._iter_events(path, chunk_size):
+            if kind == "field":
+                if key == "@context":
+                    (fields.setdefault(container, {}) if container else fields)[key] = value
+                continue
+            if types is None:
+                types = self.type_index(self._stream_context(fields))
+            item = self._item_from_section(container, key, value, types)
+            if item is not None:
+                yield self.canonicalize(item, types.resolver) if self.canonical_ids else item
+
+    def discover(self, directory: str | Path, patterns: Iterable[str] = ONTOLOGY_PATTERNS) -> List[Path]:
+        """Find ontology files under directory (recursively), in sorted order."""
+        root = self._resolve(directory)
+        found = {path for pattern in patterns for path in root.rglob(pattern) if path.is_file()}
+        return sorted(found)
+
+    def load_directory(
+        self,
+        directory: str | Path,
+        patterns: Iterable[str] = ONTOLOGY_PATTERNS,
+        max_workers: Optional[int] = None,
+        stream: bool = False
+    ) -> Iterator[LoadResult]:
+        """Load every ontology file under directory; see load_many."""
+        return self.load_many(self.discover(directory, patterns), max_workers, stream)
+
+    def load_many(
+        self,
+        file_paths: Iterable[str | Path],
+        max_workers: Optional[int] = None,
+        stream: bool = False
+    ) -> Iterator[LoadResult]:
+        """
+        Load many ontology files in a process pool.
+
+        Results are yielded as each file finishes (not in input order).
+        A file that fails to load yields a LoadResult with error set
+        instead of aborting the batch. Workers load with this loader's
+        configuration (id mode and type handlers). With max_workers=1, a
+        single file, or type handlers that cannot be pickled (lambdas,
+        closures), files are loaded in this process.
+        """
+        paths = [self._resolve(p) for p in file_paths]
+        workers = min(max_workers or os.cpu_count() or 1, len(paths))
+        config = _BatchConfig(self.base_path, self.cache, self.json.name, self.canonical_ids, self.type_handlers)
+        if workers > 1:
+            try:
+                pickle.dumps(config)
+            except (pickle.PicklingError, TypeError, AttributeError):
+                workers = 1
+        if workers <= 1:
+            # Loaded like a worker would, then compacted once in _finish_load
+            load = self._without_store().load_file
+            for path in paths:
+                yield self._finish_load(path, load, path, stream)
+            return
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(_load_for_batch, config, path, stream): path for path in paths}
+            for future in as_completed(futures):
+                yield self._finish_load(futures[future], future.result)
+
+    def _finish_load(self, path: Path, load, *args) -> LoadResult:
+        """Run load(*args) for one batch file, capturing any error."""
+        try:
+            ontology = load(*args)
+        except Exception as e:
+            return LoadResult(path, error=f"{type(e).__name__}: {e}")
+        # Worker processes cannot share the store; compact on arrival
+        return LoadResult(path, self._compact(ontology))
 
-    def load_file(self, file_path: str | Path) -> Ontology:
-        """Load ontology from JSON file."""
+    def _resolve(self, file_path: str | Path) -> Path:
         path = Path(file_path)
         if not path.is_absolute():
             path = self.base_path / path
+        return path
 
+    def _iter_events(self, path: Path, chunk_size: Optional[int] = None) -> Iterator[Tuple]:
+        """Stream ("field", container, key, value) and ("item", section, key, value) events."""
         with open(path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+            yield from _JsonStream(f, chunk_size or STREAM_CHUNK_SIZE).events()
 
-        return self.parse_ontology(data, str(path))
+    def _load_streaming(self, path: Path) -> Ontology:
+        """Build an Ontology from streamed events."""
+        fields: Dict[str, Any] = {}
+        # Per streamed section: (entities, relationships)
+        sections: Dict[str, Tuple[Any, Any]] = {}
+        types: Optional[_TypeIndex] = None
+
+        for kind, container, key, value in self._iter_events(path):
+            if kind == "field":
+                target = fields.setdefault(container, {}) if container else fields
+                target[key] = value
+                continue
+            if container not in sections:
+                sections[container] = self._new_containers()
+            if types is None:
+                types = self.type_index(self._stream_context(fields))
+            item = self._item_from_section(container, key, value, types)
+            if item is not None and self.canonical_ids:
+                self.canonicalize(item, types.resolver)
+            if isinstance(item, Entity):
+                sections[container][0].append(item)
+            elif isinstance(item, Relationship):
+                sections[container][1].append(item)
+
+        source = str(path)
+        if "registryEntry" in fields or not ("classes" in sections or "@graph" in sections):
+            # Registry entries and inferred formats are small summaries;
+            # parse them eagerly so sections they read are all present
+            return self._load_path(path, stream=False)
+
+        # Same precedence as the eager parsers: classes over @graph (except
+        # inside ontologyDefinition), relationships over objectProperties
+        data = fields.get("ontologyDefinition", fields)
+        if "classes" in sections and not ("ontologyDefinition" in fields and "@graph" in sections):
+            rels = sections.get("relationships", sections.get("objectProperties"))
+            relationships = rels[1] if rels else self._new_containers()[1]
+            ontology = self._standard_ontology(data, source, sections["classes"][0], relationships)
+        else:
+            entities, relationships = sections.get("@graph") or self._new_containers()
+            ontology = self._graph_ontology(data, source, entities, relationships)
+        return self._registry_wrapper(ontology, fields)
+
+    def _new_containers(self) -> Tuple[Any, Any]:
+        """Empty (entities, relationships) containers: lists, or store tables."""
+        if self.store is not None:
+            return self.store.entity_table(), self.store.relationship_table()
+        return [], []
+
+    def _stream_context(self, fields: Dict[str, Any]) -> Any:
+        """
+        The @context streamed so far, as the eager parsers would pick it;
+        a @context placed after the streamed sections is not seen.
+        """
+        return fields.get("ontologyDefinition", fields).get("@context")
+
+    def _item_from_section(
+        self,
+        section: str,
+        key: Optional[str],
+        value: Any,
+        types: Optional[_TypeIndex] = None
+    ) -> Optional[Union[Entity, Relationship]]:
+        """Convert one streamed section entry to an Entity or Relationship."""
+        if not isinstance(value, dict):
+            return None
+        if section == "@graph":
+            return (types or self.type_index(None)).classify(value)
+        if key is None:
+            return None
+        if section == "classes":
+            return self._entity_from_class(key, value)
+        return self._relationship_from_property(key, value)
 
     def parse_ontology(self, data: Dict[str, Any], source: str = "") -> Ontology:
         """Parse ontology from JSON dict."""
         # Detect format and delegate to appropriate parser
         if "registryEntry" in data:
-            return self._parse_registry_format(data, source)
+            ontology = self._parse_registry_format(data, source)
         elif "ontologyDefinition" in data:
-            return self._parse_uniregistry_format(data, source)
+            ontology = self._parse_uniregistry_format(data, source)
         elif "classes" in data:
-            return self._parse_standard_format(data, source)
+            ontology = self._parse_standard_format(data, source)
         elif "@graph" in data:
-            return self._parse_graph_format(data, source)
+            ontology = self._parse_graph_format(data, source)
         else:
             # Try to infer structure
-            return self._parse_inferred_format(data, source)
+            ontology = self._parse_inferred_format(data, source)
+        if self.canonical_ids:
+            resolver = resolver_for(ontology.context)
+            for item in ontology.entities:
+                self.canonicalize(item, resolver)
+            for item in ontology.relationships:
+                self.canonicalize(item, resolver)
+        return self._compact(ontology)
+
+    def parse_lazy(self, data: Dict[str, Any], source: str = "") -> Ontology:
+        """
+        Like parse_ontology, but defer classifying @graph nodes and building
+        entities, relationships and business rules until first needed; only
+        the header is read now. Registry entries and inferred formats are
+        small and parsed immediately.
+        """
+        body = data.get("ontologyDefinition", data) if "registryEntry" not in data else None
+        if not isinstance(body, dict) or not ("classes" in body or "@graph" in body):
+            return self.parse_ontology(data, source)
+
+        if "@graph" in body and ("ontologyDefinition" in data or "classes" not in body):
+            header = self._graph_ontology(body, source, [], [])
+            counts = lambda: self._graph_counts(body)
+        else:
+            header = self._standard_ontology(body, source, [], [])
+            counts = lambda: self._standard_counts(body)
+        self._registry_wrapper(header, data)
+        return LazyOntology(header, counts, lambda: self.parse_ontology(data, source))
+
+    def _standard_counts(self, data: Dict) -> Tuple[int, int]:
+        """Class and relationship counts of a standard-format body."""
+        rels = data.get("relationships", data.get("objectProperties", {}))
+        return (
+            len(data.get("classes", {})),
+            sum(isinstance(r, dict) for r in rels.values()) if isinstance(rels, dict) else 0
+        )
+
+    def _graph_counts(self, data: Dict) -> Tuple[int, int]:
+        """Entity and relationship counts of a @graph, classifying nodes without building them."""
+        types = self.type_index(data.get("@context"))
+        entities = relationships = 0
+        for node in data.get("@graph", []):
+            if not isinstance(node, dict):
+                continue
+            handler = types.handler(node.get("@type"))
+            if handler is _graph_class:
+                entities += 1
+            elif handler is _graph_property:
+                relationships += 1
+            elif handler is not None:
+                # Custom handlers decide the item kind (or skip) themselves
+                item = handler(node)
+                entities += isinstance(item, Entity)
+                relationships += isinstance(item, Relationship)
+        return entities, relationships
 
     def _parse_standard_format(self, data: Dict, source: str) -> Ontology:
         """Parse standard JSON-LD ontology with classes key."""
-        context = data.get("@context", {})
-        if isinstance(context, str):
-            context = {"@vocab": context}
-
         entities = []
         classes = data.get("classes", {})
         for class_id, class_def in classes.items():
-            entity = Entity(
-                id=class_def.get("@id", class_id),
-                label=class_def.get("rdfs:label", class_id),
-                description=class_def.get("rdfs:comment", ""),
-                entity_type=class_def.get("w4m:entityType", "Class"),
-                properties=class_def.get("properties", {}),
-                parent_class=class_def.get("rdfs:subClassOf")
-            )
-            entities.append(entity)
+            entities.append(self._entity_from_class(class_id, class_def))
 
         relationships = []
         rels = data.get("relationships", data.get("objectProperties", {}))
         if isinstance(rels, dict):
             for rel_id, rel_def in rels.items():
                 if isinstance(rel_def, dict):
-                    rel = Relationship(
-                        id=rel_def.get("@id", rel_id),
-                        label=rel_def.get("rdfs:label", rel_id),
-                        source=rel_def.get("rdfs:domain", ""),
-                        target=rel_def.get("rdfs:range", ""),
-                        cardinality=rel_def.get("w4m:cardinality", "1:*"),
-                        description=rel_def.get("rdfs:comment", "")
-                    )
-                    relationships.append(rel)
+                    relationships.append(self._relationship_from_property(rel_id, rel_def))
+
+        return self._standard_ontology(data, source, entities, relationships)
+
+    def _entity_from_class(self, class_id: str, class_def: Dict) -> Entity:
+        """Build an Entity from a classes entry."""
+        return Entity(
+            id=class_def.get("@id", class_id),
+            label=class_def.get("rdfs:label", class_id),
+            description=class_def.get("rdfs:comment", ""),
+            entity_type=class_def.get("w4m:entityType", "Class"),
+            properties=class_def.get("properties", {}),
+            parent_class=class_def.get("rdfs:subClassOf")
+        )
+
+    def _relationship_from_property(self, rel_id: str, rel_def: Dict) -> Relationship:
+        """Build a Relationship from a relationships/objectProperties entry."""
+        return Relationship(
+            id=rel_def.get("@id", rel_id),
+            label=rel_def.get("rdfs:label", rel_id),
+            source=rel_def.get("rdfs:domain", ""),
+            target=rel_def.get("rdfs:range", ""),
+            cardinality=rel_def.get("w4m:cardinality", "1:*"),
+            description=rel_def.get("rdfs:comment", "")
+        )
+
+    def _standard_ontology(
+        self,
+        data: Dict,
+        source: str,
+        entities: List[Entity],
+        relationships: List[Relationship]
+    ) -> Ontology:
+        """Assemble a standard-format Ontology from its header fields and parsed items."""
+        context = data.get("@context", {})
+        if isinstance(context, str):
+            context = {"@vocab": context}
 
         business_rules = []
         rules = data.get("businessRules", data.get("w4m:cardinalRules", {}))
@@ -172,6 +779,7 @@ class OntologyLoader:
             relationships=relationships,
             metadata={
                 "source": source,
+                "format": "registry",
                 "status": entry.get("status"),
                 "registrationDate": entry.get("registrationDate"),
                 "subDomains": entry.get("subDomains", []),
@@ -183,39 +791,44 @@ class OntologyLoader:
     def _parse_uniregistry_format(self, data: Dict, source: str) -> Ontology:
         """Parse UniRegistry v1.0 format with ontologyDefinition."""
         ont_def = data.get("ontologyDefinition", {})
-        metadata = data.get("registryMetadata", {})
 
         # Parse from @graph if present
         if "@graph" in ont_def:
-            return self._parse_graph_format(ont_def, source)
+            return self._registry_wrapper(self._parse_graph_format(ont_def, source), data)
+
+        return self._registry_wrapper(self._parse_standard_format(ont_def, source), data)
 
-        return self._parse_standard_format(ont_def, source)
+    def _registry_wrapper(self, ontology: Ontology, data: Dict) -> Ontology:
+        """Record the UniRegistry envelope of an ontologyDefinition in its metadata."""
+        if "ontologyDefinition" in data:
+            ontology.metadata["format"] = "uniregistry"
+            ontology.metadata["registryMetadata"] = data.get("registryMetadata", {})
+        return ontology
 
     def _parse_graph_format(self, data: Dict, source: str) -> Ontology:
         """Parse JSON-LD with @graph array."""
-        context = data.get("@context", {})
-        graph = data.get("@graph", [])
-
         entities = []
         relationships = []
 
-        for node in graph:
-            node_type = node.get("@type", "")
-            if "Class" in str(node_type) or node_type in ["owl:Class", "rdfs:Class"]:
-                entities.append(Entity(
-                    id=node.get("@id", ""),
-                    label=node.get("rdfs:label", node.get("name", "")),
-                    description=node.get("rdfs:comment", node.get("description", "")),
-                    entity_type="Class"
-                ))
-            elif "Property" in str(node_type) or "ObjectProperty" in str(node_type):
-                relationships.append(Relationship(
-                    id=node.get("@id", ""),
-                    label=node.get("rdfs:label", ""),
-                    source=node.get("rdfs:domain", ""),
-                    target=node.get("rdfs:range", "")
-                ))
+        classify = self.type_index(data.get("@context")).classify
+        for node in data.get("@graph", []):
+            item = classify(node) if isinstance(node, dict) else None
+            if isinstance(item, Entity):
+                entities.append(item)
+            elif isinstance(item, Relationship):
+                relationships.append(item)
+
+        return self._graph_ontology(data, source, entities, relationships)
 
+    def _graph_ontology(
+        self,
+        data: Dict,
+        source: str,
+        entities: List[Entity],
+        relationships: List[Relationship]
+    ) -> Ontology:
+        """Assemble an @graph-format Ontology from its header fields and parsed items."""
+        context = data.get("@context", {})
         return Ontology(
             id=data.get("@id", source),
             name=data.get("name", Path(source).stem),
@@ -299,10 +912,146 @@ class OntologyLoader:
             "metadata": ontology.metadata
         }
 
+    def dumps(self, ontology: Ontology, indent: bool = False) -> bytes:
+        """Serialize an ontology's to_dict() form as UTF-8 JSON bytes."""
+        return self.json.dumps(self.to_dict(ontology), indent)
+
+    def save_file(self, ontology: Ontology, file_path: str | Path, indent: bool = True) -> None:
+        """Write an ontology's to_dict() form to a JSON file."""
+        with open(self._resolve(file_path), 'wb') as f:
+            f.write(self.dumps(ontology, indent))
+
+
+class _JsonStream:
+    """
+    Incremental reader for one JSON-LD ontology document.
+
+    Walks the top-level object (and a nested ontologyDefinition) key by
+    key. Entries of STREAM_SECTIONS are decoded one at a time with
+    json.JSONDecoder.raw_decode over a sliding buffer; every other value
+    is decoded whole, as those are small header fields.
+    """
+
+    NESTED = ("ontologyDefinition",)
+    WHITESPACE = " \t\n\r"
+
+    def __init__(self, f: TextIO, chunk_size: int = STREAM_CHUNK_SIZE):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def events(self, container: Optional[str] = None) -> Iterator[Tuple]:
+        """Yield field and item events for the object at the current position."""
+        self._expect("{")
+        if self._peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self._value()
+            self._expect(":")
+            opener = self._peek()
+            if key in STREAM_SECTIONS and opener in "[{":
+                yield from self._section(key)
+            elif key in self.NESTED and container is None and opener == "{":
+                yield from self.events(key)
+            else:
+                yield ("field", container, key, self._value())
+            if self._next_separator("}"):
+                return
+
+    def _section(self, section: str) -> Iterator[Tuple]:
+        opener = self._peek()
+        self.pos += 1
+        closer = "]" if opener == "[" else "}"
+        if self._peek() == closer:
+            self.pos += 1
+            return
+        while True:
+            key = None
+            if opener == "{":
+                key = self._value()
+                self._expect(":")
+            yield ("item", section, key, self._value())
+            if self._next_separator(closer):
+                return
+
+    def _fill(self, size: int) -> bool:
+        """Read more text, discarding what has been consumed. False at end of file."""
+        if self.eof:
+            return False
+        chunk = self.f.read(size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def _peek(self) -> str:
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in self.WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf) or not self._fill(self.chunk_size):
+                return self.buf[self.pos:self.pos + 1]
+
+    def _expect(self, char: str) -> None:
+        found = self._peek()
+        if found != char:
+            raise ValueError(f"Expected '{char}' but found '{found or 'end of file'}'")
+        self.pos += 1
+
+    def _next_separator(self, closer: str) -> bool:
+        """Consume ',' (returns False) or the closing bracket (returns True)."""
+        found = self._peek()
+        if found not in (",", closer):
+            raise ValueError(f"Expected ',' or '{closer}' but found '{found or 'end of file'}'")
+        self.pos += 1
+        return found == closer
+
+    def _value(self) -> Any:
+        self._peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                # Incomplete value: read at least as much again and retry
+                if not self._fill(max(self.chunk_size, len(self.buf))):
+                    raise
+                continue
+            # A number ending exactly at the buffer edge may continue in the next chunk
+            if end == len(self.buf) and isinstance(value, (int, float)) and not isinstance(value, bool) \
+                    and self._fill(self.chunk_size):
+                continue
+            self.pos = end
+            return value
+
+
+@dataclass
+class _BatchConfig:
+    """Picklable OntologyLoader settings sent to load_many worker processes."""
+    base_path: Path
+    cache: Optional[OntologyCache]
+    json_backend: str
+    canonical_ids: bool
+    type_handlers: Dict[str, GraphNodeHandler]
+
+
+def _load_for_batch(config: _BatchConfig, path: Path, stream: bool) -> Ontology:
+    """Process-pool entry point for OntologyLoader.load_many."""
+    loader = OntologyLoader(
+        config.base_path, cache=config.cache, json_backend=config.json_backend,
+        canonical_ids=config.canonical_ids
+    )
+    loader.type_handlers = dict(config.type_handlers)
+    return loader.load_file(path, stream=stream)
+
 
 def load_ontology(file_path: str | Path) -> Ontology:
-    """Convenience function to load an ontology file."""
-    loader = OntologyLoader()
+    """Convenience function to load an ontology file (via the default cache)."""
+    loader = OntologyLoader(cache=default_cache())
     return loader.load_file(file_path)
 
 
@@ -310,13 +1059,21 @@ if __name__ == "__main__":
     import sys
 
     if len(sys.argv) < 2:
-        print("Usage: python ontology_loader.py <ontology_file.json>")
+        print("Usage: python ontology_loader.py <ontology_file.json | directory>")
         sys.exit(1)
 
-    ontology = load_ontology(sys.argv[1])
-    print(f"Loaded: {ontology.name} v{ontology.version}")
-    print(f"Entities: {len(ontology.entities)}")
-    print(f"Relationships: {len(ontology.relationships)}")
+    if Path(sys.argv[1]).is_dir():
+        failed = 0
+        for result in OntologyLoader().load_directory(sys.argv[1]):
+            if result.ok:
+                print(f"  OK   {result.path}: {len(result.ontology.entities)} entities")
+            else:
+                failed += 1
+                print(f"  FAIL {result.path}: {result.error}")
+        sys.exit(1 if failed else 0)
 
-    for entity in ontology.entities[:5]:
-        print(f"  - {entity.label}: {entity.description[:50]}...")
+    # Lazy: only the header and counts are needed, so no entities are built
+    ontology = OntologyLoader().load_file(sys.argv[1], lazy=True)
+    print(f"Loaded: {ontology.name} v{ontology.version}")
+    print(f"Entities: {ontology.entity_count}")
+    print(f"Relationships: {ontology.relationship_count}")
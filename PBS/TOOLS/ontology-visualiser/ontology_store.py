@@ -0,0 +1,251 @@
+"""
+VHF Ontology Store
+Compact columnar storage for ontology entities and relationships.
+
+Each field is held as a parallel column of interned string references,
+so repeated strings (entity types, cardinalities, relationship endpoints
+that name entity ids) are stored once and every entity costs a few machine
+words instead of a Python object with its own properties dict.
+
+The tables behave like the lists they replace: len(), indexing, slicing,
+iteration, append/extend and equality with lists all work, with Entity /
+Relationship objects materialised on access. Materialised items are
+copies; assign them back (table[i] = entity) to change the stored row.
+
+Usage:
+    store = OntologyStore()
+    loader = OntologyLoader(store=store)        # every load is compacted
+    ontology = store.compact(load_ontology(p))  # or compact one ontology
+"""
+
+import sys
+from array import array
+from collections.abc import MutableSequence
+from dataclasses import fields
+from typing import Any, Dict, Iterable, Iterator, List, Sequence
+
+from ontology_loader import Entity, Ontology, Relationship
+
+
+class StringPool:
+    """
+    Interns strings shared by every table of a store.
+
+    Non-string values (e.g. a list-valued rdfs:domain) are kept as-is.
+    """
+
+    def add(self, value: Any) -> Any:
+        """Return the canonical (interned) object for value."""
+        return sys.intern(value) if type(value) is str else value
+
+
+class _ColumnTable(MutableSequence):
+    """
+    List-like table of dataclass rows stored as parallel interned-string columns.
+
+    Subclasses set ROW (the dataclass) and STRING_FIELDS (fields stored in
+    the pool), and override _build and the *_extra hooks for anything else.
+    """
+
+    ROW: Any = None
+    STRING_FIELDS: tuple = ()
+
+    def __init__(self, pool: StringPool, rows: Iterable[Any] = ()):
+        self.pool = pool
+        self._columns: Dict[str, List[Any]] = {name: [] for name in self.STRING_FIELDS}
+        self.extend(rows)
+
+    def __len__(self) -> int:
+        return len(self._columns[self.STRING_FIELDS[0]])
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._row(i) for i in range(*index.indices(len(self)))]
+        return self._row(self._position(index))
+
+    def __setitem__(self, index, value) -> None:
+        if isinstance(index, slice):
+            positions = range(*index.indices(len(self)))
+            values = list(value)
+            if len(positions) != len(values) or index.step not in (None, 1):
+                rows = list(self)
+                rows[index] = values
+                self._reset(rows)
+                return
+            for position, row in zip(positions, values):
+                self._store(position, row)
+            return
+        self._store(self._position(index), value)
+
+    def __delitem__(self, index) -> None:
+        if isinstance(index, slice):
+            rows = list(self)
+            del rows[index]
+            self._reset(rows)
+            return
+        position = self._position(index)
+        for column in self._columns.values():
+            del column[position]
+        self._delete_extra(position)
+
+    def __iter__(self) -> Iterator[Any]:
+        columns = [self._columns[name] for name in self.STRING_FIELDS]
+        for position, values in enumerate(zip(*columns)):
+            yield self._build(position, values)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (list, tuple, _ColumnTable)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({len(self)} rows)"
+
+    def insert(self, index: int, value: Any) -> None:
+        if index >= len(self) or index < -len(self):
+            self.append(value)
+            return
+        rows = list(self)
+        rows.insert(index, value)
+        self._reset(rows)
+
+    def append(self, value: Any) -> None:
+        add = self.pool.add
+        for name in self.STRING_FIELDS:
+            self._columns[name].append(add(getattr(value, name)))
+        self._append_extra(value)
+
+    def extend(self, values: Iterable[Any]) -> None:
+        for value in values:
+            self.append(value)
+
+    def nbytes(self) -> int:
+        """Approximate bytes used by this table's columns (excluding the strings)."""
+        return sum(sys.getsizeof(column) for column in self._columns.values())
+
+    def _position(self, index: int) -> int:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(f"{type(self).__name__} index out of range")
+        return index
+
+    def _row(self, position: int) -> Any:
+        return self._build(position, [self._columns[name][position] for name in self.STRING_FIELDS])
+
+    def _store(self, position: int, value: Any) -> None:
+        add = self.pool.add
+        for name in self.STRING_FIELDS:
+            self._columns[name][position] = add(getattr(value, name))
+        self._store_extra(position, value)
+
+    def _reset(self, rows: List[Any]) -> None:
+        for name in self.STRING_FIELDS:
+            self._columns[name] = []
+        self._clear_extra()
+        self.extend(rows)
+
+    def _build(self, position: int, values: Sequence[Any]) -> Any:
+        return self.ROW(*values)
+
+    def _append_extra(self, value: Any) -> None:
+        pass
+
+    def _store_extra(self, position: int, value: Any) -> None:
+        pass
+
+    def _delete_extra(self, position: int) -> None:
+        pass
+
+    def _clear_extra(self) -> None:
+        pass
+
+
+class EntityTable(_ColumnTable):
+    """Columnar list of Entity rows; properties and parent_class are stored sparsely."""
+
+    ROW = Entity
+    STRING_FIELDS = ("id", "label", "description", "entity_type")
+
+    def __init__(self, pool: StringPool, rows: Iterable[Entity] = ()):
+        # Indices into _extras; -1 marks "no parent" / "no properties"
+        self._parents = array("i")
+        self._property_refs = array("i")
+        self._extras: List[Any] = []
+        super().__init__(pool, rows)
+
+    def nbytes(self) -> int:
+        return (super().nbytes() + sys.getsizeof(self._extras)
+                + self._parents.itemsize * (len(self._parents) + len(self._property_refs)))
+
+    def _build(self, position: int, values: Sequence[Any]) -> Entity:
+        parent = self._parents[position]
+        ref = self._property_refs[position]
+        return Entity(
+            *values,
+            properties=dict(self._extras[ref]) if ref >= 0 else {},
+            parent_class=self._extras[parent] if parent >= 0 else None
+        )
+
+    def _encode_extra(self, value: Entity) -> tuple:
+        parent = ref = -1
+        if value.parent_class is not None:
+            self._extras.append(self.pool.add(value.parent_class))
+            parent = len(self._extras) - 1
+        if value.properties:
+            self._extras.append(dict(value.properties))
+            ref = len(self._extras) - 1
+        return parent, ref
+
+    def _append_extra(self, value: Entity) -> None:
+        parent, ref = self._encode_extra(value)
+        self._parents.append(parent)
+        self._property_refs.append(ref)
+
+    def _store_extra(self, position: int, value: Entity) -> None:
+        self._parents[position], self._property_refs[position] = self._encode_extra(value)
+
+    def _delete_extra(self, position: int) -> None:
+        del self._parents[position]
+        del self._property_refs[position]
+
+    def _clear_extra(self) -> None:
+        self._parents = array("i")
+        self._property_refs = array("i")
+        self._extras = []
+
+
+class RelationshipTable(_ColumnTable):
+    """Columnar list of Relationship rows."""
+
+    ROW = Relationship
+    STRING_FIELDS = ("id", "label", "source", "target", "cardinality", "description")
+
+
+class OntologyStore:
+    """
+    Shared string pool and table factory for compact ontologies.
+
+    One store can hold many ontologies; strings common to them (types,
+    shared entity ids, cardinalities) are held once across all of them.
+    """
+
+    def __init__(self):
+        self.strings = StringPool()
+
+    def entity_table(self, entities: Iterable[Entity] = ()) -> EntityTable:
+        return EntityTable(self.strings, entities)
+
+    def relationship_table(self, relationships: Iterable[Relationship] = ()) -> RelationshipTable:
+        return RelationshipTable(self.strings, relationships)
+
+    def compact(self, ontology: Ontology) -> Ontology:
+        """Return a copy of ontology whose entities and relationships are columnar tables."""
+        if isinstance(ontology.entities, EntityTable) and isinstance(ontology.relationships, RelationshipTable):
+            return ontology
+        # Built field by field (not dataclasses.replace) so Ontology
+        # subclasses such as LazyOntology compact to a plain Ontology
+        values = {f.name: getattr(ontology, f.name) for f in fields(Ontology)}
+        values["entities"] = self.entity_table(ontology.entities)
+        values["relationships"] = self.relationship_table(ontology.relationships)
+        return Ontology(**values)
@@ -0,0 +1,269 @@
+"""
+VHF Ontology Watcher
+Keep loaded ontologies and their graphs current as files change.
+
+OntologyWatcher loads a set of ontology files (or directories), builds a
+graph per file and one combined registry graph. poll() checks each file's
+size and mtime; a changed file is re-parsed on its own, its entities and
+relationships are diffed against the previous version, and both its own
+graph and the combined graph are patched in place. Nodes shared between
+files (the same canonical IRI) stay in the combined graph until the last
+file defining them drops them.
+
+Polling uses only the standard library, so no file-system notification
+package is required; start() runs poll() on a background thread.
+
+Usage:
+    watcher = OntologyWatcher(["sample-ontologies"], on_change=print)
+    watcher.start(interval=1.0)
+    ...
+    with watcher.lock:
+        stats = get_graph_stats(watcher.graph)
+"""
+
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+import networkx as nx
+
+from graph_builder import OntologyGraphBuilder
+from graph_stats import TrackedDiGraph
+from ontology_loader import Entity, Ontology, OntologyLoader, Relationship
+
+
+@dataclass
+class OntologyChange:
+    """What one poll changed for one file."""
+    path: Path
+    kind: str  # "added", "modified", "removed" or "error"
+    added_entities: List[str] = field(default_factory=list)
+    removed_entities: List[str] = field(default_factory=list)
+    changed_entities: List[str] = field(default_factory=list)
+    added_relationships: List[str] = field(default_factory=list)
+    removed_relationships: List[str] = field(default_factory=list)
+    changed_relationships: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+    seconds: float = 0.0
+
+
+def _entity_index(ontology: Optional[Ontology]) -> Dict[str, Entity]:
+    return {e.id: e for e in ontology.entities} if ontology else {}
+
+
+def _relationship_index(ontology: Optional[Ontology]) -> Dict[Tuple, Relationship]:
+    return {(r.id, r.source, r.target): r for r in ontology.relationships} if ontology else {}
+
+
+def _diff(old: Dict[Any, Any], new: Dict[Any, Any]) -> Tuple[List, List, List]:
+    added = [key for key in new if key not in old]
+    removed = [key for key in old if key not in new]
+    changed = [key for key in new if key in old and old[key] != new[key]]
+    return added, removed, changed
+
+
+class OntologyWatcher:
+    """Loaded ontologies plus per-file and combined graphs, patched as files change."""
+
+    def __init__(
+        self,
+        paths: Iterable[str | Path],
+        loader: Optional[OntologyLoader] = None,
+        builder: Optional[OntologyGraphBuilder] = None,
+        on_change: Optional[Callable[[OntologyChange], None]] = None
+    ):
+        self.loader = loader or OntologyLoader()
+        self.builder = builder or OntologyGraphBuilder()
+        self.on_change = on_change
+        self.roots = [Path(p) for p in paths]
+
+        self.ontologies: Dict[Path, Ontology] = {}
+        # Tracked, so get_graph_stats on them is incremental between polls
+        self.graphs: Dict[Path, TrackedDiGraph] = {}
+        self.graph = TrackedDiGraph()
+        # Held while the graphs are patched; hold it to read a consistent graph
+        self.lock = threading.RLock()
+
+        self._signatures: Dict[Path, Tuple[int, int]] = {}
+        self._node_owners: Dict[Hashable, List[Path]] = {}
+        self._edge_owners: Dict[Tuple[Hashable, Hashable], List[Path]] = {}
+        self._poll_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+        self.poll()
+
+    # ------------------------------------------------------------------
+    # Polling
+    # ------------------------------------------------------------------
+
+    def files(self) -> List[Path]:
+        """Ontology files currently under the watched paths."""
+        found: Set[Path] = set()
+        for root in self.roots:
+            if root.is_dir():
+                found.update(self.loader.discover(root))
+            elif root.is_file():
+                found.add(root.resolve())
+        return sorted(found)
+
+    def poll(self) -> List[OntologyChange]:
+        """Reload files added, modified or removed since the last poll."""
+        with self._poll_lock:
+            changes = []
+            current = self.files()
+            for path in current:
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                signature = (stat.st_mtime_ns, stat.st_size)
+                if self._signatures.get(path) != signature:
+                    changes.append(self.reload(path, signature))
+            for path in sorted(set(self._signatures) - set(current)):
+                changes.append(self.remove(path))
+            return changes
+
+    def start(self, interval: float = 1.0) -> None:
+        """Poll every interval seconds on a daemon thread until stop()."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+
+        def run() -> None:
+            while not self._stop.wait(interval):
+                self.poll()
+
+        self._thread = threading.Thread(target=run, name="ontology-watcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the polling thread started by start()."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+
+    # ------------------------------------------------------------------
+    # Reloading
+    # ------------------------------------------------------------------
+
+    def reload(self, path: Path, signature: Optional[Tuple[int, int]] = None) -> OntologyChange:
+        """Re-parse one file and patch the graphs with the difference."""
+        started = time.perf_counter()
+        kind = "modified" if path in self.ontologies else "added"
+        if signature is None:
+            stat = path.stat()
+            signature = (stat.st_mtime_ns, stat.st_size)
+        try:
+            ontology = self.loader.load_file(path)
+            graph = self.builder.build_graph(ontology)
+        except Exception as e:
+            # Keep serving the last good version; retry when the file changes again
+            self._signatures[path] = signature
+            change = OntologyChange(path, "error", error=f"{type(e).__name__}: {e}")
+        else:
+            self._signatures[path] = signature
+            change = self._apply(path, kind, ontology, graph)
+        change.seconds = time.perf_counter() - started
+        self._notify(change)
+        return change
+
+    def remove(self, path: Path) -> OntologyChange:
+        """Drop a file's ontology and its contribution to the combined graph."""
+        started = time.perf_counter()
+        self._signatures.pop(path, None)
+        change = self._apply(path, "removed", None, nx.DiGraph())
+        change.seconds = time.perf_counter() - started
+        self._notify(change)
+        return change
+
+    def _notify(self, change: OntologyChange) -> None:
+        if self.on_change is not None:
+            self.on_change(change)
+
+    def _apply(self, path: Path, kind: str, ontology: Optional[Ontology], new: nx.DiGraph) -> OntologyChange:
+        old_ontology = self.ontologies.get(path)
+        added_e, removed_e, changed_e = _diff(_entity_index(old_ontology), _entity_index(ontology))
+        added_r, removed_r, changed_r = _diff(_relationship_index(old_ontology), _relationship_index(ontology))
+        change = OntologyChange(
+            path, kind,
+            added_entities=added_e,
+            removed_entities=removed_e,
+            changed_entities=changed_e,
+            added_relationships=[key[0] for key in added_r],
+            removed_relationships=[key[0] for key in removed_r],
+            changed_relationships=[key[0] for key in changed_r]
+        )
+
+        with self.lock:
+            old = self.graphs.get(path)
+            if old is None:
+                old = self.graphs[path] = TrackedDiGraph()
+            self._patch(path, old, new)
+            if ontology is None:
+                del self.graphs[path]
+                self.ontologies.pop(path, None)
+            else:
+                self.ontologies[path] = ontology
+        return change
+
+    def _patch(self, path: Path, old: TrackedDiGraph, new: nx.DiGraph) -> None:
+        """Turn old into new in place, mirroring each change onto the combined graph."""
+        old_edges = {(u, v): d for u, v, d in old.edges(data=True)}
+        new_edges = {(u, v): d for u, v, d in new.edges(data=True)}
+        old_nodes = dict(old.nodes(data=True))
+        new_nodes = dict(new.nodes(data=True))
+        added_edges, removed_edges, changed_edges = _diff(old_edges, new_edges)
+        added_nodes, removed_nodes, changed_nodes = _diff(old_nodes, new_nodes)
+
+        old.remove_edges_from(removed_edges)
+        for edge in removed_edges:
+            self._release(self._edge_owners, edge, path)
+        old.remove_nodes_from(removed_nodes)
+        for node in removed_nodes:
+            self._release(self._node_owners, node, path)
+
+        for node in added_nodes + changed_nodes:
+            old.set_node_data(node, new_nodes[node])
+            self._claim(self._node_owners, node, path)
+        for edge in added_edges + changed_edges:
+            old.set_edge_data(*edge, new_edges[edge])
+            self._claim(self._edge_owners, edge, path)
+
+        old.graph.clear()
+        old.graph.update(new.graph)
+
+    def _claim(self, owners: Dict[Any, List[Path]], key: Any, path: Path) -> None:
+        paths = owners.setdefault(key, [])
+        if path in paths:
+            paths.remove(path)
+        paths.append(path)
+        self._refresh(owners, key)
+
+    def _release(self, owners: Dict[Any, List[Path]], key: Any, path: Path) -> None:
+        paths = owners.get(key, [])
+        if path in paths:
+            paths.remove(path)
+        if paths:
+            self._refresh(owners, key)
+            return
+        owners.pop(key, None)
+        if owners is self._edge_owners:
+            if self.graph.has_edge(*key):
+                self.graph.remove_edge(*key)
+        elif key in self.graph:
+            # Any file with an edge to this node also owns the node, so
+            # by now its last edges have been released
+            self.graph.remove_node(key)
+
+    def _refresh(self, owners: Dict[Any, List[Path]], key: Any) -> None:
+        """Set combined-graph attributes from the most recent owner, preferring defined entities."""
+        if owners is self._edge_owners:
+            self.graph.set_edge_data(*key, self.graphs[owners[key][-1]].edges[key])
+        else:
+            candidates = [self.graphs[p].nodes[key] for p in owners[key]]
+            defined = [c for c in candidates if "entity_type" in c]
+            self.graph.set_node_data(key, (defined or candidates)[-1])
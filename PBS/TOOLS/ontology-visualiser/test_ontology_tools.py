@@ -8,24 +8,46 @@ Usage:
     python -m pytest test_ontology_tools.py # Run with pytest (verbose)
 """
 
+import os
 import sys
 import json
+import pickle
 import unittest
 from pathlib import Path
 from tempfile import NamedTemporaryFile, TemporaryDirectory
 
+import networkx as nx
+
 # Add tools to path
 sys.path.insert(0, str(Path(__file__).parent))
 
 from ontology_loader import (
-    OntologyLoader, Ontology, Entity, Relationship, load_ontology
+    OntologyLoader, Ontology, Entity, Relationship, load_ontology,
+    JSON_BACKENDS, get_json_backend, GRAPH_TYPE_HANDLERS, LazyOntology
 )
 from graph_builder import (
-    OntologyGraphBuilder, build_ontology_graph, get_graph_stats
+    OntologyGraphBuilder, AgentContextGraphBuilder, VEValueChainBuilder,
+    build_ontology_graph, get_graph_stats
 )
+from csr_graph import CSRGraph
+from federated_graph import FederatedGraph
+from graph_stats import TrackedDiGraph
+from ontology_cache import OntologyCache, default_cache, set_cache_enabled
+from ontology_context import IriResolver, resolver_for
+from ontology_store import OntologyStore, EntityTable, RelationshipTable
+from ontology_watcher import OntologyWatcher
+from oaa_validator import OAAValidator, audit_report, batch_report, validate_ontology
 from visualiser import OntologyVisualiser
 from ve_domain_graphs import VEDomainGraphBuilder, W4MFramework
 
+# Keep test runs out of the user's ontology cache
+set_cache_enabled(False)
+
+
+def _skip_graph_node(node):
+    """Module-level (picklable) @type handler used by the batch loading tests."""
+    return None
+
 
 class TestOntologyLoader(unittest.TestCase):
     """Tests for ontology_loader.py"""
@@ -132,6 +154,724 @@ class TestOntologyLoader(unittest.TestCase):
         self.assertEqual(rel.cardinality, "1:*")
 
 
+class TestStreamingLoader(unittest.TestCase):
+    """Tests for incremental parsing in ontology_loader.py"""
+
+    GRAPH_DATA = {
+        "@context": {"owl": "http://www.w3.org/2002/07/owl#"},
+        "@id": "test:graph",
+        "name": "Graph Test",
+        "version": "3.1.4",
+        "@graph": [
+            {"@id": "test:A", "@type": "owl:Class", "rdfs:label": "A"},
+            {"@id": "test:B", "@type": "owl:Class", "rdfs:label": "B \u00e9\\\"quoted\""},
+            {"@id": "test:ab", "@type": "owl:ObjectProperty", "rdfs:domain": "test:A", "rdfs:range": "test:B"},
+            {"@id": "test:x", "@type": "owl:NamedIndividual", "weight": 12345}
+        ]
+    }
+
+    STANDARD_DATA = {
+        "@context": "https://schema.org/",
+        "name": "Standard Test",
+        "classes": {
+            "A": {"@id": "test:A", "rdfs:label": "A", "properties": {"size": 1.25}},
+            "B": {"@id": "test:B", "rdfs:subClassOf": "test:A"}
+        },
+        "relationships": {"ab": {"rdfs:domain": "test:A", "rdfs:range": "test:B"}},
+        "objectProperties": {"ignored": {"rdfs:domain": "test:B", "rdfs:range": "test:A"}},
+        "businessRules": {"BR1": "Every A has a B"}
+    }
+
+    def setUp(self):
+        self.loader = OntologyLoader()
+        self.tmpdir = TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _write(self, data, name="ontology.json", indent=None):
+        path = Path(self.tmpdir.name) / name
+        path.write_text(json.dumps(data, indent=indent), encoding="utf-8")
+        return path
+
+    def test_stream_matches_eager_parse(self):
+        """Streaming and eager loading produce the same ontology for each format."""
+        documents = [
+            self.GRAPH_DATA,
+            self.STANDARD_DATA,
+            {"ontologyDefinition": self.GRAPH_DATA, "registryMetadata": {"status": "active"}},
+            {"registryEntry": {"version": "2.0.0", "entities": {"list": ["A", "B"]}}},
+            {"name": "Inferred", "entities": ["A", "B"]},
+        ]
+        for index, data in enumerate(documents):
+            path = self._write(data, f"doc{index}.json", indent=2)
+            eager = self.loader.load_file(path)
+            streamed = self.loader.load_file(path, stream=True)
+            self.assertEqual(streamed, eager)
+
+    def test_small_chunks_cross_buffer_boundaries(self):
+        """Values split across read chunks are decoded correctly."""
+        path = self._write(self.GRAPH_DATA)
+        for chunk_size in (1, 2, 7, 64):
+            items = list(self.loader.iter_file(path, chunk_size=chunk_size))
+            self.assertEqual([i.id for i in items], ["test:A", "test:B", "test:ab"])
+            self.assertEqual(items[1].label, self.GRAPH_DATA["@graph"][1]["rdfs:label"])
+
+    def test_iter_file_yields_before_end_of_file(self):
+        """Entities are yielded before the rest of the file has been parsed."""
+        text = json.dumps(self.GRAPH_DATA)
+        path = Path(self.tmpdir.name) / "truncated.json"
+        path.write_text(text[:text.index('"test:ab"') - 10], encoding="utf-8")
+
+        items = self.loader.iter_file(path, chunk_size=16)
+        self.assertEqual(next(items).id, "test:A")
+        self.assertEqual(next(items).id, "test:B")
+        with self.assertRaises(ValueError):
+            list(items)
+
+
+class TestOntologyStore(unittest.TestCase):
+    """Tests for ontology_store.py"""
+
+    def setUp(self):
+        self.store = OntologyStore()
+        self.entities = [
+            Entity(id="test:A", label="A", entity_type="class", properties={"size": 1}),
+            Entity(id="test:B", label="B", entity_type="class", parent_class="test:A"),
+            Entity(id="test:C", label="C", entity_type="class"),
+        ]
+
+    def test_entities_are_slotted(self):
+        """Entity and Relationship carry no per-instance __dict__."""
+        self.assertFalse(hasattr(self.entities[0], "__dict__"))
+        self.assertFalse(hasattr(Relationship(id="r", label="r", source="a", target="b"), "__dict__"))
+
+    def test_table_behaves_like_list(self):
+        """Entity tables support the list operations callers rely on."""
+        table = self.store.entity_table(self.entities)
+        self.assertEqual(len(table), 3)
+        self.assertEqual(table, self.entities)
+        self.assertEqual(table[-1].id, "test:C")
+        self.assertEqual([e.id for e in table[1:]], ["test:B", "test:C"])
+        self.assertEqual(table[0].properties, {"size": 1})
+        self.assertEqual(table[1].parent_class, "test:A")
+        self.assertIsNone(table[2].parent_class)
+
+        table.append(Entity(id="test:D", label="D", entity_type="class"))
+        table[0] = Entity(id="test:A2", label="A2", entity_type="class")
+        del table[1]
+        table.insert(0, Entity(id="test:Z", label="Z", entity_type="class"))
+        self.assertEqual([e.id for e in table], ["test:Z", "test:A2", "test:C", "test:D"])
+        self.assertEqual(table[1].properties, {})
+        with self.assertRaises(IndexError):
+            table[10]
+
+    def test_strings_shared_across_tables(self):
+        """Equal strings in different tables are stored once."""
+        entities = self.store.entity_table(self.entities)
+        relationships = self.store.relationship_table([
+            Relationship(id="test:ab", label="ab", source="test:A", target="test:B")
+        ])
+        self.assertIs(relationships[0].source, entities[0].id)
+        self.assertIs(relationships[0].target, entities[1].id)
+
+    def test_loader_with_store(self):
+        """Ontologies loaded through a store build the same graph."""
+        data = {
+            "name": "Store Test",
+            "classes": {
+                "A": {"@id": "test:A", "rdfs:label": "A"},
+                "B": {"@id": "test:B", "rdfs:subClassOf": "test:A"}
+            },
+            "relationships": {"ab": {"rdfs:domain": "test:A", "rdfs:range": "test:B"}}
+        }
+        plain = OntologyLoader().parse_ontology(data)
+        compact = OntologyLoader(store=self.store).parse_ontology(data)
+        self.assertIsInstance(compact.entities, EntityTable)
+        self.assertIsInstance(compact.relationships, RelationshipTable)
+        self.assertEqual(compact, plain)
+
+        builder = OntologyGraphBuilder()
+        expected = builder.build_graph(plain)
+        G = builder.build_graph(compact)
+        self.assertEqual(dict(G.nodes(data=True)), dict(expected.nodes(data=True)))
+        self.assertEqual(list(G.edges(data=True)), list(expected.edges(data=True)))
+
+        with TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "store.json"
+            path.write_text(json.dumps(data), encoding="utf-8")
+            eager = OntologyLoader().load_file(path)
+            streamed = OntologyLoader(store=self.store).load_file(path, stream=True)
+        self.assertIsInstance(streamed.entities, EntityTable)
+        self.assertEqual(streamed, eager)
+
+
+class TestBatchLoading(unittest.TestCase):
+    """Tests for OntologyLoader.load_directory / load_many"""
+
+    def setUp(self):
+        self.tmpdir = TemporaryDirectory()
+        self.root = Path(self.tmpdir.name)
+        (self.root / "nested").mkdir()
+        for index, path in enumerate([self.root / "a.json", self.root / "nested" / "b.jsonld"]):
+            path.write_text(json.dumps({
+                "name": f"Ontology {index}",
+                "classes": {"A": {"@id": f"test:A{index}", "rdfs:label": "A"}}
+            }), encoding="utf-8")
+        (self.root / "broken.json").write_text("{not json", encoding="utf-8")
+        (self.root / "notes.txt").write_text("ignored", encoding="utf-8")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_discover(self):
+        """JSON and JSON-LD files are found recursively."""
+        paths = OntologyLoader().discover(self.root)
+        self.assertEqual([p.relative_to(self.root).as_posix() for p in paths],
+                         ["a.json", "broken.json", "nested/b.jsonld"])
+
+    def test_load_directory_collects_errors(self):
+        """Every file yields a result; failures do not abort the batch."""
+        loader = OntologyLoader()
+        for workers in (1, 2):
+            results = {r.path.name: r for r in loader.load_directory(self.root, max_workers=workers)}
+            self.assertEqual(set(results), {"a.json", "broken.json", "b.jsonld"})
+            self.assertFalse(results["broken.json"].ok)
+            self.assertIn("JSONDecodeError", results["broken.json"].error)
+            self.assertEqual(results["a.json"].ontology, loader.load_file(self.root / "a.json"))
+            self.assertEqual(results["b.jsonld"].ontology.entities[0].id, "test:A1")
+
+    def test_workers_use_loader_configuration(self):
+        """Pool and in-process loads agree for either id mode and custom type handlers."""
+        (self.root / "c.json").write_text(json.dumps({
+            "@context": {"ex": "https://example.org/ns#"},
+            "@graph": [
+                {"@id": "ex:C", "@type": "owl:Class"},
+                {"@id": "ex:Hidden", "@type": "rdfs:Class"},
+                {"@id": "ex:cc", "@type": "owl:ObjectProperty", "rdfs:domain": "ex:C", "rdfs:range": "ex:C"}
+            ]
+        }), encoding="utf-8")
+        paths = [self.root / "a.json", self.root / "nested" / "b.jsonld", self.root / "c.json"]
+        for canonical_ids in (False, True):
+            for handler in (None, _skip_graph_node, lambda node: None):
+                loader = OntologyLoader(canonical_ids=canonical_ids)
+                if handler is not None:
+                    loader.register_type_handler("rdfs:Class", handler)
+                pooled = {r.path: r.ontology for r in loader.load_many(paths, max_workers=2)}
+                local = {r.path: r.ontology for r in loader.load_many(paths, max_workers=1)}
+                self.assertEqual(pooled, local)
+                ids = [e.id for e in local[paths[2]].entities]
+                self.assertEqual(ids[0], "https://example.org/ns#C" if canonical_ids else "ex:C")
+                self.assertEqual(len(ids), 2 if handler is None else 1)
+
+    def test_load_many_with_store(self):
+        """Ontologies from worker processes are compacted into the loader's store."""
+        loader = OntologyLoader(store=OntologyStore())
+        results = list(loader.load_many([self.root / "a.json", self.root / "nested" / "b.jsonld"], max_workers=2))
+        self.assertTrue(all(r.ok for r in results))
+        self.assertTrue(all(isinstance(r.ontology.entities, EntityTable) for r in results))
+
+
+class TestOntologyCache(unittest.TestCase):
+    """Tests for ontology_cache.py"""
+
+    DATA = {
+        "name": "Cache Test",
+        "classes": {"A": {"@id": "test:A"}, "B": {"@id": "test:B", "rdfs:subClassOf": "test:A"}}
+    }
+
+    def setUp(self):
+        self.tmpdir = TemporaryDirectory()
+        self.root = Path(self.tmpdir.name)
+        self.cache = OntologyCache(self.root / "cache")
+        self.path = self.root / "ontology.json"
+        self.path.write_text(json.dumps(self.DATA), encoding="utf-8")
+        self.builds = 0
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _build(self):
+        self.builds += 1
+        return OntologyLoader().load_file(self.path)
+
+    def test_hit_skips_parsing(self):
+        """A second load of an unchanged file comes from the cache."""
+        first = self.cache.cached(self.path, self._build)
+        second = self.cache.cached(self.path, self._build)
+        self.assertEqual(self.builds, 1)
+        self.assertEqual(second, first)
+        self.assertEqual(OntologyLoader(cache=self.cache).load_file(self.path), first)
+
+    def test_invalidation(self):
+        """A touched but identical file hits; changed content misses."""
+        self.cache.cached(self.path, self._build)
+        stat = self.path.stat()
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        self.cache.cached(self.path, self._build)
+        self.assertEqual(self.builds, 1)
+
+        data = dict(self.DATA, name="Changed Test")
+        self.path.write_text(json.dumps(data), encoding="utf-8")
+        self.assertEqual(self.cache.cached(self.path, self._build).name, "Changed Test")
+        self.assertEqual(self.builds, 2)
+
+    def test_corrupt_entry_is_a_miss(self):
+        """Unreadable entries are rebuilt rather than raising."""
+        self.cache.cached(self.path, self._build)
+        self.cache.entry_path(self.path).write_bytes(b"not a pickle")
+        self.assertIsNone(self.cache.get(self.path))
+        self.cache.cached(self.path, self._build)
+        self.assertEqual(self.builds, 2)
+
+    def test_lru_eviction(self):
+        """Least recently used entries are evicted once max_bytes is exceeded."""
+        paths = []
+        for index in range(3):
+            path = self.root / f"o{index}.json"
+            path.write_text(json.dumps(self.DATA), encoding="utf-8")
+            paths.append(path)
+        self.cache.put(paths[0], "x" * 1000)
+        size = self.cache.entry_path(paths[0]).stat().st_size
+        self.cache.max_bytes = size * 2
+        self.cache.put(paths[1], "x" * 1000)
+        # Age both entries, then use o0 so that o1 is least recently used
+        for age, path in ((2, paths[0]), (1, paths[1])):
+            os.utime(self.cache.entry_path(path), ns=(0, age * 10**9))
+        self.cache.get(paths[0])
+        self.cache.put(paths[2], "x" * 1000)
+        self.assertIsNotNone(self.cache.get(paths[0]))
+        self.assertIsNone(self.cache.get(paths[1]))
+        self.assertIsNotNone(self.cache.get(paths[2]))
+
+    def test_type_handlers_partition_the_cache(self):
+        """A loader with custom type handlers does not reuse entries parsed without them."""
+        plain = OntologyLoader(cache=self.cache)
+        custom = OntologyLoader(cache=self.cache)
+        custom.register_type_handler("https://example.org/ns#Agent", lambda node: None)
+        self.assertNotEqual(custom.cache_kind, plain.cache_kind)
+        self.assertEqual(OntologyLoader().cache_kind, plain.cache_kind)
+        plain.load_file(self.path)
+        self.assertIsNotNone(self.cache.get(self.path, plain.cache_kind))
+        self.assertIsNone(self.cache.get(self.path, custom.cache_kind))
+
+    def test_store_loaders_share_plain_cache_entries(self):
+        """Store-backed and plain loaders sharing a cache each get their own representation."""
+        store = OntologyStore()
+        compact = OntologyLoader(cache=self.cache, store=store).load_file(self.path)
+        self.assertIsInstance(compact.entities, EntityTable)
+        self.assertIs(compact.entities.pool, store.strings)
+        plain = OntologyLoader(cache=self.cache).load_file(self.path)
+        self.assertIsInstance(plain.entities, list)
+        self.assertEqual(plain, compact)
+        self.assertIsInstance(self.cache.get(self.path, OntologyLoader().cache_kind).entities, list)
+
+    def test_digest_without_file_digest(self):
+        """The chunked SHA-256 fallback matches hashlib.file_digest."""
+        import hashlib
+        import ontology_cache
+        expected = hashlib.sha256(self.path.read_bytes()).hexdigest()
+        self.assertEqual(ontology_cache._file_digest(self.path), expected)
+        saved = getattr(hashlib, "file_digest", None)
+        if saved is not None:
+            del hashlib.file_digest
+        try:
+            self.assertEqual(ontology_cache._file_digest(self.path), expected)
+        finally:
+            if saved is not None:
+                hashlib.file_digest = saved
+
+    def test_graph_cache(self):
+        """Graphs built by from_file are cached separately from ontologies."""
+        builder = OntologyGraphBuilder(cache=self.cache)
+        G = builder.from_file(self.path)
+        self.assertIsNotNone(self.cache.get(self.path, "graph:OntologyGraphBuilder"))
+        cached = builder.from_file(self.path)
+        self.assertEqual(dict(cached.nodes(data=True)), dict(G.nodes(data=True)))
+        self.assertEqual(list(cached.edges(data=True)), list(G.edges(data=True)))
+
+    def test_global_opt_out(self):
+        """Disabling the cache makes default_cache() return None."""
+        self.assertIsNone(default_cache())
+
+
+class TestJsonBackends(unittest.TestCase):
+    """Tests for pluggable JSON decoders in ontology_loader.py"""
+
+    DATA = {
+        "name": "Backend Test \u00e9",
+        "classes": {"A": {"@id": "test:A", "properties": {"big": 2 ** 70, "ratio": 0.25}}},
+        "relationships": {"aa": {"rdfs:domain": "test:A", "rdfs:range": "test:A"}}
+    }
+
+    def setUp(self):
+        self.tmpdir = TemporaryDirectory()
+        self.path = Path(self.tmpdir.name) / "backend.json"
+        self.path.write_text(json.dumps(self.DATA), encoding="utf-8")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_backends_agree(self):
+        """Every registered backend loads and serializes identically."""
+        self.assertIn("json", JSON_BACKENDS)
+        loaded = {name: OntologyLoader(json_backend=name).load_file(self.path) for name in JSON_BACKENDS}
+        for name, ontology in loaded.items():
+            self.assertEqual(ontology, loaded["json"], name)
+            loader = OntologyLoader(json_backend=name)
+            self.assertEqual(json.loads(loader.dumps(ontology)), loader.to_dict(ontology))
+
+    def test_save_file_round_trip(self):
+        """save_file writes the to_dict form as UTF-8 JSON."""
+        loader = OntologyLoader()
+        ontology = loader.load_file(self.path)
+        out = Path(self.tmpdir.name) / "out.json"
+        loader.save_file(ontology, out)
+        self.assertEqual(json.loads(out.read_text(encoding="utf-8")), loader.to_dict(ontology))
+
+    def test_unknown_backend(self):
+        """Asking for an unregistered backend is an error."""
+        with self.assertRaises(ValueError):
+            get_json_backend("simdjson-missing")
+
+
+class TestTypeDispatch(unittest.TestCase):
+    """Tests for @type dispatch of @graph nodes in ontology_loader.py"""
+
+    DATA = {
+        "@context": {"o": "http://www.w3.org/2002/07/owl#", "ex": "https://example.org/ns#"},
+        "name": "Dispatch Test",
+        "@graph": [
+            {"@id": "ex:A", "@type": "o:Class", "rdfs:label": "A"},
+            {"@id": "ex:B", "@type": ["owl:NamedIndividual", "http://www.w3.org/2002/07/owl#Class"]},
+            {"@id": "ex:Scheme", "@type": "ex:Classification"},
+            {"@id": "ex:ab", "@type": "o:ObjectProperty", "rdfs:domain": "ex:A", "rdfs:range": "ex:B"},
+            {"@id": "ex:size", "@type": ["ex:Custom", "schema:DatatypeProperty"], "rdfs:domain": "ex:A"},
+            {"@id": "ex:bot", "@type": "ex:Agent", "rdfs:label": "Bot"}
+        ]
+    }
+
+    def test_prefix_expansion_and_list_types(self):
+        """Types resolve through @context prefixes, and list @type values are checked per item."""
+        ontology = OntologyLoader(canonical_ids=False).parse_ontology(self.DATA)
+        self.assertEqual([e.id for e in ontology.entities], ["ex:A", "ex:B"])
+        self.assertEqual([r.id for r in ontology.relationships], ["ex:ab", "ex:size"])
+
+    def test_register_type_handler(self):
+        """New node kinds can be handled per loader without changing the defaults."""
+        loader = OntologyLoader(canonical_ids=False)
+        loader.register_type_handler(
+            "https://example.org/ns#Agent",
+            lambda node: Entity(id=node["@id"], label=node["rdfs:label"], entity_type="Agent")
+        )
+        ontology = loader.parse_ontology(self.DATA)
+        self.assertEqual(ontology.entities[-1], Entity(id="ex:bot", label="Bot", entity_type="Agent"))
+        self.assertNotIn("https://example.org/ns#Agent", GRAPH_TYPE_HANDLERS)
+
+        with TemporaryDirectory() as tmpdir:
+            path = Path(tmpdir) / "dispatch.json"
+            path.write_text(json.dumps(self.DATA), encoding="utf-8")
+            self.assertEqual(loader.load_file(path, stream=True), loader.load_file(path))
+
+
+class TestIriResolver(unittest.TestCase):
+    """Tests for ontology_context.py"""
+
+    VSOM = "https://example.org/vsom#"
+
+    def test_expand(self):
+        """Compact IRIs with known prefixes expand; everything else is kept."""
+        resolver = IriResolver({"vsom": self.VSOM, "label": "rdfs:label", "@vocab": "https://schema.org/"})
+        self.assertEqual(resolver.expand("vsom:Vision"), self.VSOM + "Vision")
+        self.assertEqual(resolver.expand("owl:Thing"), "http://www.w3.org/2002/07/owl#Thing")
+        self.assertEqual(resolver.expand(self.VSOM + "Vision"), self.VSOM + "Vision")
+        self.assertEqual(resolver.expand("other:Vision"), "other:Vision")
+        self.assertEqual(resolver.expand("label:x"), "label:x")
+        self.assertEqual(resolver.expand("Vision"), "Vision")
+        self.assertEqual(resolver.expand_vocab("Vision"), "https://schema.org/Vision")
+        self.assertEqual(resolver.expand(["vsom:Vision"]), ["vsom:Vision"])
+        self.assertIs(resolver.expand("vsom:Vision"), IriResolver({"v": self.VSOM}).expand("v:Vision"))
+
+    def test_compact_uses_longest_namespace(self):
+        """compact() picks the most specific matching namespace."""
+        resolver = IriResolver({"ex": "https://example.org/", "exa": "https://example.org/a/"})
+        self.assertEqual(resolver.compact("https://example.org/a/Thing"), "exa:Thing")
+        self.assertEqual(resolver.compact("https://example.org/Thing"), "ex:Thing")
+        self.assertEqual(resolver.compact("https://elsewhere.org/Thing"), "https://elsewhere.org/Thing")
+
+    def test_shared_resolvers(self):
+        """Equal contexts share one resolver and its memoised expansions."""
+        self.assertIs(resolver_for({"a": "https://a/", "b": "https://b/"}),
+                      resolver_for({"b": "https://b/", "a": "https://a/"}))
+
+    def test_prefixed_and_full_iris_merge(self):
+        """With canonical ids, ontologies using a prefix and the full IRI produce the same graph nodes."""
+        loader = OntologyLoader(canonical_ids=True)
+        prefixed = loader.parse_ontology({
+            "@context": {"vsom": self.VSOM},
+            "classes": {"Vision": {"@id": "vsom:Vision"}, "Goal": {"@id": "vsom:Goal", "rdfs:subClassOf": "vsom:Vision"}},
+            "relationships": {"has": {"rdfs:domain": "vsom:Vision", "rdfs:range": "vsom:Goal"}}
+        })
+        full = loader.parse_ontology({
+            "@graph": [{"@id": self.VSOM + "Vision", "@type": "owl:Class"}]
+        })
+        builder = OntologyGraphBuilder()
+        G = nx.compose(builder.build_graph(prefixed), builder.build_graph(full))
+        self.assertEqual(sorted(G.nodes), [self.VSOM + "Goal", self.VSOM + "Vision"])
+        self.assertTrue(G.has_edge(self.VSOM + "Vision", self.VSOM + "Goal"))
+
+
+class TestLazyOntology(unittest.TestCase):
+    """Tests for lazy loading in ontology_loader.py"""
+
+    def setUp(self):
+        self.loader = OntologyLoader()
+        self.tmpdir = TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _write(self, data):
+        path = Path(self.tmpdir.name) / "lazy.json"
+        path.write_text(json.dumps(data), encoding="utf-8")
+        return path
+
+    def test_counts_and_header_before_parsing(self):
+        """Metadata and counts are available without parsing sections."""
+        path = self._write(TestStreamingLoader.STANDARD_DATA)
+        lazy = self.loader.load_file(path, lazy=True)
+        self.assertIsInstance(lazy, LazyOntology)
+        self.assertEqual((lazy.name, lazy.entity_count, lazy.relationship_count), ("Standard Test", 2, 1))
+        self.assertFalse(lazy.loaded)
+
+        eager = self.loader.load_file(path)
+        self.assertEqual(lazy, eager)
+        self.assertTrue(lazy.loaded)
+        self.assertEqual(lazy.business_rules, [{"id": "BR1", "rule": "Every A has a B"}])
+
+    def test_graph_counts(self):
+        """@graph counts classify nodes the same way parsing does."""
+        path = self._write(TestTypeDispatch.DATA)
+        lazy = self.loader.load_file(path, lazy=True)
+        self.assertEqual((lazy.entity_count, lazy.relationship_count), (2, 2))
+        self.assertFalse(lazy.loaded)
+        self.assertEqual(lazy, self.loader.load_file(path))
+
+    def test_graph_classified_on_first_count(self):
+        """@graph nodes are not classified until a count is read."""
+        path = self._write(TestTypeDispatch.DATA)
+        calls = []
+        count = self.loader._graph_counts
+        self.loader._graph_counts = lambda data: calls.append(1) or count(data)
+        lazy = self.loader.load_file(path, lazy=True)
+        self.assertEqual(calls, [])
+        self.assertEqual(lazy.entity_count, 2)
+        self.assertEqual(lazy.relationship_count, 2)
+        self.assertEqual(calls, [1])
+
+    def test_small_formats_parse_eagerly(self):
+        """Registry entries are returned as plain Ontologies."""
+        path = self._write({"registryEntry": {"version": "2.0.0", "entities": {"list": ["A"]}}})
+        ontology = self.loader.load_file(path, lazy=True)
+        self.assertNotIsInstance(ontology, LazyOntology)
+        self.assertEqual(ontology.entity_count, 1)
+
+    def test_stream_and_lazy_conflict(self):
+        """stream and lazy cannot be combined."""
+        with self.assertRaises(ValueError):
+            self.loader.load_file(self._write({"classes": {}}), stream=True, lazy=True)
+
+    def test_store_compacts_lazy_ontology(self):
+        """A store turns a lazy ontology into a compact plain Ontology."""
+        lazy = self.loader.load_file(self._write(TestStreamingLoader.STANDARD_DATA), lazy=True)
+        compact = OntologyStore().compact(lazy)
+        self.assertIsInstance(compact.entities, EntityTable)
+        self.assertEqual(compact, lazy)
+
+
+class TestOntologyWatcher(unittest.TestCase):
+    """Tests for ontology_watcher.py"""
+
+    NS = "https://example.org/v#"
+
+    def setUp(self):
+        self.tmpdir = TemporaryDirectory()
+        self.root = Path(self.tmpdir.name)
+        self.a = {
+            "@context": {"v": self.NS},
+            "classes": {"A": {"@id": "v:A"}, "B": {"@id": "v:B", "rdfs:subClassOf": "v:A"}},
+            "relationships": {"ab": {"rdfs:domain": "v:A", "rdfs:range": "v:B"}}
+        }
+        self.b = {
+            "@context": {"w": self.NS},
+            "@graph": [
+                {"@id": "w:B", "@type": "owl:Class", "rdfs:label": "Bee"},
+                {"@id": "w:bc", "@type": "owl:ObjectProperty", "rdfs:domain": "w:B", "rdfs:range": "w:C"}
+            ]
+        }
+        self._write("a.json", self.a)
+        self._write("b.json", self.b)
+        self.changes = []
+        # Canonical ids, so v:B and w:B are one node
+        self.watcher = OntologyWatcher([self.root], loader=OntologyLoader(canonical_ids=True),
+                                       on_change=self.changes.append)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _write(self, name, data):
+        path = self.root / name
+        path.write_text(json.dumps(data), encoding="utf-8")
+        # Make the change visible even on coarse mtime filesystems
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9 * len(self.__dict__)))
+
+    def _rebuilt(self):
+        """The combined graph a full rebuild would produce."""
+        builder = OntologyGraphBuilder()
+        G = nx.DiGraph()
+        for path in sorted(self.root.glob("*.json")):
+            G = nx.compose(G, builder.build_graph(OntologyLoader(canonical_ids=True).load_file(path)))
+        return G
+
+    def _assert_matches_rebuild(self):
+        expected = self._rebuilt()
+        self.assertEqual(set(self.watcher.graph.nodes), set(expected.nodes))
+        self.assertEqual(set(self.watcher.graph.edges), set(expected.edges))
+        for node in expected.nodes:
+            self.assertEqual(self.watcher.graph.nodes[node]["label"], expected.nodes[node]["label"])
+        self.assertEqual(get_graph_stats(self.watcher.graph), get_graph_stats(nx.DiGraph(self.watcher.graph)))
+
+    def test_initial_load(self):
+        """Both files load into one graph sharing canonical nodes."""
+        self.assertEqual([c.kind for c in self.changes], ["added", "added"])
+        self.assertEqual(len(self.watcher.ontologies), 2)
+        self._assert_matches_rebuild()
+
+    def test_modify_patches_graph_in_place(self):
+        """Editing one file patches its diff into the existing graph objects."""
+        graph, file_graph = self.watcher.graph, self.watcher.graphs[self.root / "a.json"]
+        get_graph_stats(graph)  # start incremental tracking
+        del self.a["classes"]["B"]
+        self.a["classes"]["D"] = {"@id": "v:D"}
+        self.a["relationships"] = {}
+        self._write("a.json", self.a)
+
+        changes = self.watcher.poll()
+        self.assertEqual(len(changes), 1)
+        self.assertEqual(changes[0].added_entities, [self.NS + "D"])
+        self.assertEqual(changes[0].removed_entities, [self.NS + "B"])
+        self.assertEqual(changes[0].removed_relationships, ["ab"])
+        self.assertIs(self.watcher.graph, graph)
+        self.assertIs(self.watcher.graphs[self.root / "a.json"], file_graph)
+        # B is still defined by b.json
+        self.assertEqual(self.watcher.graph.nodes[self.NS + "B"]["label"], "Bee")
+        self._assert_matches_rebuild()
+        self.assertEqual(self.watcher.poll(), [])
+
+    def test_remove_and_error(self):
+        """Deleted files leave the graph; unparseable edits keep the last good version."""
+        (self.root / "b.json").unlink()
+        self.assertEqual([c.kind for c in self.watcher.poll()], ["removed"])
+        self._assert_matches_rebuild()
+
+        (self.root / "a.json").write_text("{broken", encoding="utf-8")
+        changes = self.watcher.poll()
+        self.assertEqual(changes[0].kind, "error")
+        self.assertIn(self.NS + "A", self.watcher.graph)
+
+
+class TestOAAValidator(unittest.TestCase):
+    """Tests for oaa_validator.py"""
+
+    COMPLIANT = {
+        "@context": {"ex": "https://example.org/"},
+        "@id": "ex:ontology",
+        "name": "Example",
+        "creator": "Example Team",
+        "classes": {
+            "Order": {"@id": "ex:Order", "rdfs:label": "Order", "rdfs:comment": "A customer order"},
+            "Customer": {"@id": "ex:Customer", "rdfs:label": "Customer", "rdfs:comment": "Who orders"}
+        },
+        "relationships": {
+            "placedBy": {"rdfs:domain": "ex:Order", "rdfs:range": "ex:Customer", "w4m:cardinality": "n..1"}
+        },
+        "businessRules": [
+            {"id": "BR-1", "rule": "IF order is placed THEN customer must exist", "severity": "error"}
+        ]
+    }
+
+    def setUp(self):
+        self.loader = OntologyLoader()
+        self.validator = OAAValidator()
+
+    def test_compliant_ontology(self):
+        """A complete ontology passes every core gate; the dict matches validateOAAv5."""
+        result = validate_ontology(self.loader.parse_ontology(self.COMPLIANT))
+        self.assertEqual(result.overall, "pass")
+        self.assertEqual(result.summary, {"pass": 6, "warn": 0, "fail": 0, "advisory": 2})
+
+        data = result.to_dict()
+        self.assertEqual(
+            [g["gate"].split(":")[0] for g in data["gates"]],
+            ["G1", "G2", "G2B", "G2C", "G3", "G4", "G5", "G6"]
+        )
+        self.assertTrue(data["gates"][7]["skipped"])
+        self.assertEqual(data["gates"][2]["orphaned"], [])
+        json.dumps(data)
+
+    def test_failing_gates(self):
+        """Orphans, missing ranges and empty rules fail their gates."""
+        data = json.loads(json.dumps(self.COMPLIANT))
+        data["classes"]["Orphan"] = {"@id": "ex:Orphan", "rdfs:label": "Orphan"}
+        data["relationships"]["broken"] = {"rdfs:domain": "ex:Order", "w4m:cardinality": "lots"}
+        data["businessRules"].append({"id": "BR-2", "rule": ""})
+        ontology = self.loader.parse_ontology(data)
+        result = self.validator.validate(ontology)
+
+        self.assertEqual(result.overall, "fail")
+        self.assertEqual(result.gate("G2").issues, ["broken: missing range"])
+        self.assertIn('broken: non-standard cardinality notation "lots"', result.gate("G2").warnings)
+        self.assertEqual(result.gate("G2B").extra["orphaned"], ["ex:Orphan"])
+        self.assertEqual(result.gate("G2B").detail, "67% entities connected (2/3)")
+        self.assertEqual(result.gate("G2C").status, "warn")
+        self.assertEqual(result.gate("G3").issues, ["BR-2: empty rule expression"])
+        self.assertEqual(result.gate("G4").warnings, ["Orphan: missing description"])
+        self.assertEqual(result.audit["isolated"], ["ex:Orphan"])
+        self.assertEqual(result.audit["disconnectedCount"], 1)
+
+        report = audit_report(ontology, result, self.validator.builder.build_graph(ontology), "example.json")
+        self.assertEqual(report["@type"], "OAAAuditReport")
+        self.assertEqual(report["complianceResult"]["overallStatus"], "fail")
+        self.assertEqual(report["graphMetrics"]["orphanedEntities"], ["ex:Orphan"])
+        self.assertEqual(report["gateResults"][2]["gateId"], "G2B")
+
+    def test_uniregistry_gate(self):
+        """G6 runs for UniRegistry envelopes and checks registryMetadata."""
+        data = {"registryMetadata": {"registryId": "REG-1"}, "ontologyDefinition": self.COMPLIANT}
+        result = self.validator.validate(self.loader.parse_ontology(data))
+        g6 = result.gate("G6")
+        self.assertFalse(g6.skipped)
+        self.assertEqual(g6.warnings, ["registryMetadata missing timestamp"])
+        self.assertEqual(result.overall, "pass")
+
+    def test_validate_many(self):
+        """Batch validation reports every file, including ones that fail to load."""
+        with TemporaryDirectory() as tmpdir:
+            root = Path(tmpdir)
+            for i in range(3):
+                (root / f"ont{i}.json").write_text(json.dumps(self.COMPLIANT), encoding="utf-8")
+            (root / "broken.json").write_text("{", encoding="utf-8")
+            paths = sorted(root.glob("*.json"))
+
+            for workers in (1, 2):
+                results = list(self.validator.validate_many(paths, max_workers=workers))
+                self.assertEqual(len(results), 4)
+                report = batch_report(results)
+                self.assertEqual(report["summary"], {"pass": 3, "warn": 0, "fail": 0, "error": 1})
+                self.assertEqual(report["errors"][0]["sourceFile"], str(root / "broken.json"))
+
+
 class TestGraphBuilder(unittest.TestCase):
     """Tests for graph_builder.py"""
 
@@ -178,6 +918,37 @@ class TestGraphBuilder(unittest.TestCase):
         self.assertEqual(G.graph['name'], "Metadata Test")
         self.assertEqual(G.graph['version'], "2.0.0")
 
+    def test_placeholders_and_duplicates(self):
+        """Undefined endpoints become placeholders in first-seen order; repeated ids keep the last attributes."""
+        ontology = Ontology(
+            id="test:bulk",
+            name="Bulk",
+            version="1.0.0",
+            description="",
+            context={},
+            entities=[
+                Entity("A", "First A", "", "Core", parent_class="Base"),
+                Entity("B", "B", ""),
+                Entity("A", "Second A", "", "Agent"),
+            ],
+            relationships=[
+                Relationship("r1", "to Y", "A", "Y"),
+                Relationship("r2", "from X", "X", "B"),
+                Relationship("r3", "dangling", "A", ""),
+                Relationship("r4", "again", "Y", "X"),
+            ]
+        )
+
+        G = self.builder.build_graph(ontology)
+
+        self.assertEqual(list(G.nodes), ["A", "B", "Y", "X", "Base"])
+        self.assertEqual(G.nodes["A"]["label"], "Second A")
+        self.assertEqual(G.nodes["A"]["color"], self.builder.ENTITY_COLORS["Agent"])
+        self.assertEqual(G.nodes["Y"], {"label": "Y", "node_type": "entity"})
+        self.assertEqual(G.nodes["Base"], {"label": "Base", "node_type": "external"})
+        self.assertEqual(list(G.edges), [("A", "Y"), ("A", "Base"), ("Y", "X"), ("X", "B")])
+        self.assertEqual(G.edges["A", "Base"]["edge_type"], "inheritance")
+
     def test_node_attributes(self):
         """Test that node attributes are set correctly."""
         ontology = Ontology(
@@ -225,6 +996,298 @@ class TestGraphBuilder(unittest.TestCase):
         self.assertTrue(stats['is_dag'])
 
 
+class TestGraphStats(unittest.TestCase):
+    """Tests for graph_stats.py"""
+
+    def setUp(self):
+        self.G = OntologyGraphBuilder().build_graph(Ontology(
+            "test:stats", "Stats", "1.0.0", "", {},
+            [Entity("A", "A", "", "Core"), Entity("B", "B", "", parent_class="A"), Entity("C", "C", "")],
+            [Relationship("r1", "r", "A", "C"), Relationship("r2", "r", "B", "C")]
+        ))
+
+    def _assert_current(self):
+        self.assertEqual(get_graph_stats(self.G), get_graph_stats(nx.DiGraph(self.G)))
+
+    def test_incremental_updates(self):
+        """Adds, removals and cycles keep the tracked stats equal to a full pass."""
+        self.assertIsInstance(self.G, TrackedDiGraph)
+        self.assertFalse(self.G.stats.valid)
+        stats = get_graph_stats(self.G)
+        self.assertEqual(stats["edge_types"], {"relationship": 2, "inheritance": 1})
+        self.assertTrue(stats["is_dag"])
+        self.assertTrue(self.G.stats.valid)
+
+        self.G.add_node("D", node_type="external")
+        self.G.add_edges_from([("D", "E"), ("E", "F", {"edge_type": "relationship"})])
+        self._assert_current()
+        self.assertEqual(get_graph_stats(self.G)["components"], 2)
+
+        # C -> B closes the cycle B -> C -> B
+        self.G.add_edge("C", "B", edge_type="relationship")
+        self.assertFalse(get_graph_stats(self.G)["is_dag"])
+        self.G.remove_edge("C", "B")
+        self._assert_current()
+        self.assertTrue(get_graph_stats(self.G)["is_dag"])
+
+        self.G.remove_nodes_from(["E", "missing"])
+        self._assert_current()
+        self.assertEqual(get_graph_stats(self.G)["components"], 3)
+
+        self.G.set_node_data("F", {"node_type": "entity"})
+        self.G.set_edge_data("A", "C", {"edge_type": "inheritance"})
+        self._assert_current()
+
+    def test_recompute_and_views(self):
+        """Direct attribute edits need recompute; views and copies are computed in full."""
+        get_graph_stats(self.G)
+        self.G.nodes["C"]["node_type"] = "external"
+        self.assertEqual(get_graph_stats(self.G)["node_types"], {"entity": 3})
+        self.assertEqual(get_graph_stats(self.G, recompute=True)["node_types"], {"entity": 2, "external": 1})
+
+        view = self.G.subgraph(["A", "B"])
+        self.assertEqual(get_graph_stats(view)["edges"], 1)
+        copy = self.G.copy()
+        copy.add_edge("A", "B")
+        self.assertFalse(get_graph_stats(copy)["is_dag"])
+        self.assertTrue(get_graph_stats(self.G)["is_dag"])
+
+
+class TestAgentContextGraphBuilder(unittest.TestCase):
+    """Tests for AgentContextGraphBuilder in graph_builder.py"""
+
+    def setUp(self):
+        self.builder = AgentContextGraphBuilder()
+        base = OntologyGraphBuilder()
+        self.graphs = {
+            "ont:a": base.build_graph(Ontology(
+                "ont:a", "A", "1.0.0", "", {},
+                [Entity("X", "X", ""), Entity("Y", "Y", "")],
+                [Relationship("r1", "links", "X", "Y")]
+            )),
+            "ont:b": base.build_graph(Ontology(
+                "ont:b", "B", "2.0.0", "", {},
+                [Entity("Y", "Y in B", ""), Entity("Z", "Z", "")],
+                [Relationship("r2", "links", "Y", "Z")]
+            ))
+        }
+
+    def test_matches_compose(self):
+        """Merging in place matches nx.compose of each distinct ontology graph at its first binding."""
+        agent = {
+            "agentId": "agent:1",
+            "agentName": "Agent One",
+            "ontologyBindings": {
+                "CONSUMES": ["ont:a", {"ontologyId": "ont:b"}, "ont:missing"],
+                "PRODUCES": ["ont:a"]
+            }
+        }
+        expected, composed = nx.DiGraph(), set()
+        expected.add_node("agent:1", label="Agent One", node_type="agent", color="#E91E63")
+        for ont_id, binding in [("ont:a", "CONSUMES"), ("ont:b", "CONSUMES"),
+                                ("ont:missing", "CONSUMES"), ("ont:a", "PRODUCES")]:
+            if ont_id not in expected:
+                expected.add_node(ont_id, label=ont_id, node_type="ontology", color="#2196F3")
+            if binding == "PRODUCES":
+                expected.add_edge("agent:1", ont_id, label=binding, edge_type="binding")
+            else:
+                expected.add_edge(ont_id, "agent:1", label=binding, edge_type="binding")
+            if ont_id in self.graphs and ont_id not in composed:
+                composed.add(ont_id)
+                expected = nx.compose(expected, self.graphs[ont_id])
+
+        G = self.builder.build_agent_context_graph(agent, self.graphs)
+
+        self.assertEqual(list(G.nodes(data=True)), list(expected.nodes(data=True)))
+        self.assertEqual(list(G.edges(data=True)), list(expected.edges(data=True)))
+        self.assertEqual(G.graph, expected.graph)
+        self.assertEqual(G.nodes["Y"]["label"], "Y in B")
+
+    def test_registry_batch(self):
+        """Every registry agent gets a view over one shared graph."""
+        registry = {"agents": [
+            {"id": "agent:1", "name": "One", "ontologyBindings": {"CONSUMES": ["ont:a"]}},
+            {"id": "agent:2", "name": "Two", "ontologyBindings": {"REQUIRES": ["ont:a", "ont:b"]}},
+            {"id": "agent:3", "name": "Three"}
+        ]}
+        graphs = self.builder.build_registry_context_graphs(registry, self.graphs)
+
+        self.assertEqual(list(graphs), ["agent:1", "agent:2", "agent:3"])
+        self.assertEqual(set(graphs["agent:1"]), {"agent:1", "ont:a", "X", "Y"})
+        self.assertTrue(graphs["agent:2"].has_edge("Y", "Z"))
+        self.assertEqual(graphs["agent:2"].nodes["agent:2"]["label"], "Two")
+        self.assertEqual(list(graphs["agent:3"].nodes), ["agent:3"])
+        self.assertIs(graphs["agent:1"]._graph, graphs["agent:2"]._graph)
+
+        sample = Path(__file__).parent / "sample-ontologies" / "agent-registry.json"
+        graphs = self.builder.build_registry_context_graphs(sample, self.graphs)
+        self.assertEqual(len(graphs), 8)
+        self.assertEqual(graphs["azlan:agent:oaa-v1.0"].nodes["azlan:agent:oaa-v1.0"]["label"],
+                         "Ontology Architect Agent")
+
+
+class TestFederatedGraph(unittest.TestCase):
+    """Tests for federated_graph.py"""
+
+    def setUp(self):
+        self.builder = OntologyGraphBuilder()
+        self.federation = FederatedGraph()
+        self.problems = Ontology(
+            "ont:problems", "Problems", "1.0.0", "", {},
+            [Entity("Pain", "Pain", "", "Core"), Entity("Gap", "Gap", "", "Core")],
+            [Relationship("r1", "causes", "Pain", "Gap"), Relationship("r2", "about", "Gap", "Customer")]
+        )
+        self.customers = Ontology(
+            "ont:customers", "Customers", "1.0.0", "", {},
+            [Entity("Customer", "Customer", "A buyer", "Framework")],
+            [Relationship("r3", "feels", "Customer", "Pain")]
+        )
+
+    def test_views_share_one_store(self):
+        """Each member views build_graph's graph; shared nodes are stored once."""
+        problems = self.builder.add_to_federation(self.federation, self.problems)
+        customers = self.builder.add_to_federation(self.federation, self.customers)
+        expected = self.builder.build_graph(self.problems)
+
+        self.assertTrue(nx.is_frozen(problems))
+        self.assertEqual(list(problems.nodes), list(expected.nodes))
+        self.assertEqual(list(problems.edges(data=True)), list(expected.edges(data=True)))
+        self.assertEqual(problems.graph["name"], "Problems")
+        self.assertEqual(list(customers.edges), [("Customer", "Pain")])
+        self.assertEqual(self.federation.store.number_of_nodes(), 3)
+        # The defined Customer entity replaced the placeholder from problems
+        self.assertEqual(problems.nodes["Customer"]["entity_type"], "Framework")
+        self.assertIs(problems.nodes["Pain"], customers.nodes["Pain"])
+
+        combined = self.federation.view("ont:problems", "ont:customers")
+        self.assertEqual(combined.number_of_edges(), 3)
+        self.assertFalse(nx.is_directed_acyclic_graph(combined))
+
+        self.federation.remove("ont:customers")
+        self.assertEqual(list(self.federation.keys()), ["ont:problems"])
+        self.assertIn("Customer", self.federation.store)
+        self.assertFalse(self.federation.store.has_edge("Customer", "Pain"))
+        self.federation.remove("ont:problems")
+        self.assertEqual(self.federation.store.number_of_nodes(), 0)
+
+    def test_value_chains_are_views(self):
+        """Value chains, agent contexts and domain filters reference the shared store."""
+        chain = VEDomainGraphBuilder().build_ve_value_chain(
+            {"Problem Space": self.problems, "ICP": self.customers}, federation=self.federation
+        )
+        self.assertTrue(nx.is_frozen(chain))
+        self.assertEqual(chain.graph["name"], "W4M Business Framework")
+        self.assertTrue(chain.has_edge("layer_0", "Pain"))
+        self.assertTrue(chain.has_edge("layer_1", "Customer"))
+        self.assertTrue(chain.has_edge("Customer", "Pain"))
+        self.assertNotIn("Problem Space_Pain", chain)
+
+        simple = VEValueChainBuilder().build_value_chain_graph(
+            {"Problem Space": "ont:problems"}, federation=self.federation
+        )
+        self.assertTrue(simple.has_edge("layer_0", "Gap"))
+        self.assertNotIn("ont:customers", simple.graph.values())
+        self.assertEqual(self.federation.store.number_of_nodes(), 11)
+
+        registry = {"agents": [{"id": "agent:1", "name": "One",
+                                "ontologyBindings": {"CONSUMES": ["ont:problems"]}}]}
+        contexts = AgentContextGraphBuilder().build_registry_context_graphs(registry, federation=self.federation)
+        self.assertEqual(set(contexts["agent:1"]), {"agent:1", "ont:problems", "Pain", "Gap", "Customer"})
+        self.assertTrue(contexts["agent:1"].has_edge("ont:problems", "agent:1"))
+
+        filtered = OntologyVisualiser().filter_by_domain(chain, "Core", include_connected=False)
+        self.assertTrue(nx.is_frozen(filtered))
+
+
+class TestCSRGraph(unittest.TestCase):
+    """Tests for csr_graph.py"""
+
+    def setUp(self):
+        self.builder = OntologyGraphBuilder()
+        self.ontology = Ontology(
+            id="test:csr",
+            name="CSR Test",
+            version="1.0.0",
+            description="",
+            context={},
+            entities=[
+                Entity("A", "Node A", "First", "Core"),
+                Entity("B", "Node B", "Second", "Framework", parent_class="A"),
+                Entity("C", "Node C", "Third", "Core"),
+                Entity("D", "Node D", "Isolated", "Agent"),
+            ],
+            relationships=[
+                Relationship("r1", "links", "A", "B"),
+                Relationship("r2", "links", "B", "C"),
+                Relationship("r3", "refers", "C", "Ext"),
+            ]
+        )
+        self.G = self.builder.build_graph(self.ontology)
+        self.csr = self.builder.build_csr(self.ontology)
+
+    def test_matches_networkx(self):
+        """build_csr yields the same nodes, edges, attributes and order as build_graph."""
+        self.assertEqual(list(self.csr.nodes(data=True)), list(self.G.nodes(data=True)))
+        self.assertEqual(list(self.csr.edges(data=True)), list(self.G.edges(data=True)))
+        self.assertEqual(self.csr.graph, self.G.graph)
+        self.assertEqual(self.csr.nodes["Ext"], {"label": "Ext", "node_type": "entity"})
+        self.assertEqual(self.csr.edges["B", "A"]["edge_type"], "inheritance")
+        self.assertEqual(get_graph_stats(self.csr), get_graph_stats(self.G))
+
+    def test_adjacency_and_traversal(self):
+        """Successors, predecessors, degree, BFS, paths and components."""
+        csr = self.csr
+        self.assertEqual(list(csr.successors("B")), ["C", "A"])
+        self.assertEqual(list(csr.predecessors("A")), ["B"])
+        self.assertEqual(csr.degree("B"), 3)
+        self.assertEqual(dict(csr.degree()), dict(self.G.degree()))
+        self.assertEqual(list(csr.bfs("A")), ["A", "B", "C", "Ext"])
+        self.assertEqual(set(csr.bfs("Ext", direction="in")), {"Ext", "C", "B", "A"})
+        self.assertEqual(csr.shortest_path("A", "Ext"), ["A", "B", "C", "Ext"])
+        with self.assertRaises(nx.NetworkXNoPath):
+            csr.shortest_path("Ext", "A")
+        with self.assertRaises(nx.NodeNotFound):
+            csr.shortest_path("A", "missing")
+        self.assertEqual(sorted(map(sorted, csr.weakly_connected_components())),
+                         [["A", "B", "C", "Ext"], ["D"]])
+        self.assertFalse(csr.is_directed_acyclic_graph())
+
+    def test_analysis_functions_accept_csr(self):
+        """filter_by_domain, highlight_path and analyze_value_flow run on a CSRGraph."""
+        vis = OntologyVisualiser()
+        filtered = vis.filter_by_domain(self.csr, "Core", include_connected=True)
+        expected = vis.filter_by_domain(self.G, "Core", include_connected=True)
+        self.assertIsInstance(filtered, CSRGraph)
+        self.assertEqual(list(filtered.edges(data=True)), list(expected.edges(data=True)))
+
+        highlighted = vis.highlight_path(self.csr, "A", "C")
+        self.assertIsInstance(highlighted, nx.DiGraph)
+        self.assertTrue(highlighted.nodes["B"]["highlighted"])
+
+        ve_builder = VEDomainGraphBuilder()
+        framework = ve_builder.build_w4m_framework_graph()
+        self.assertEqual(ve_builder.analyze_value_flow(CSRGraph.from_networkx(framework)),
+                         ve_builder.analyze_value_flow(framework))
+
+    def test_conversion_round_trips(self):
+        """networkx and pickle round trips preserve the graph; duplicates merge like DiGraph."""
+        G = self.csr.to_networkx()
+        self.assertEqual(list(G.edges(data=True)), list(self.G.edges(data=True)))
+        again = CSRGraph.from_networkx(G)
+        self.assertEqual(list(again.nodes(data=True)), list(self.G.nodes(data=True)))
+        restored = pickle.loads(pickle.dumps(self.csr))
+        self.assertEqual(list(restored.edges(data=True)), list(self.G.edges(data=True)))
+
+        merged = CSRGraph.from_items(
+            [("a", {"x": 1}), ("a", {"y": 2})],
+            [("a", "b", {"p": 1}), ("a", "b", {"q": 2})]
+        )
+        self.assertEqual(list(merged.nodes(data=True)), [("a", {"x": 1, "y": 2}), ("b", {})])
+        self.assertEqual(list(merged.edges(data=True)), [("a", "b", {"p": 1, "q": 2})])
+        with self.assertRaises(ValueError):
+            CSRGraph.from_networkx(nx.Graph())
+
+
 class TestVisualiser(unittest.TestCase):
     """Tests for visualiser.py"""
 
@@ -268,6 +1331,17 @@ class TestVisualiser(unittest.TestCase):
         self.assertTrue(highlighted.nodes["A"].get("highlighted", False))
         self.assertTrue(highlighted.nodes["B"].get("highlighted", False))
 
+    def test_canonical_iris_display_compact(self):
+        """Full IRIs are labelled and classified by their compact form."""
+        ontology = OntologyLoader(canonical_ids=True).parse_ontology({
+            "classes": {"Thing": {"@id": "ex:Thing", "rdfs:subClassOf": "schema:Thing"}}
+        })
+        G = self.builder.build_graph(ontology)
+        self.assertEqual(G.nodes["https://schema.org/Thing"]["label"], "schema:Thing")
+        self.assertEqual(self.vis._infer_domain("https://schema.org/Thing", {}), "Core")
+        self.assertEqual(self.vis._infer_domain("http://www.w3.org/2002/07/owl#Thing", {}), "Core")
+        self.assertEqual(self.vis._infer_domain("org:Organization", {}), "CE")
+
     def test_render_pyvis_creates_file(self):
         """Test PyVis rendering creates HTML file."""
         G = self._create_test_graph()
@@ -376,7 +1450,21 @@ def run_tests():
 
     # Add test classes
     suite.addTests(loader.loadTestsFromTestCase(TestOntologyLoader))
+    suite.addTests(loader.loadTestsFromTestCase(TestStreamingLoader))
+    suite.addTests(loader.loadTestsFromTestCase(TestOntologyStore))
+    suite.addTests(loader.loadTestsFromTestCase(TestBatchLoading))
+    suite.addTests(loader.loadTestsFromTestCase(TestOntologyCache))
+    suite.addTests(loader.loadTestsFromTestCase(TestJsonBackends))
+    suite.addTests(loader.loadTestsFromTestCase(TestTypeDispatch))
+    suite.addTests(loader.loadTestsFromTestCase(TestIriResolver))
+    suite.addTests(loader.loadTestsFromTestCase(TestLazyOntology))
+    suite.addTests(loader.loadTestsFromTestCase(TestOntologyWatcher))
+    suite.addTests(loader.loadTestsFromTestCase(TestOAAValidator))
     suite.addTests(loader.loadTestsFromTestCase(TestGraphBuilder))
+    suite.addTests(loader.loadTestsFromTestCase(TestGraphStats))
+    suite.addTests(loader.loadTestsFromTestCase(TestAgentContextGraphBuilder))
+    suite.addTests(loader.loadTestsFromTestCase(TestFederatedGraph))
+    suite.addTests(loader.loadTestsFromTestCase(TestCSRGraph))
     suite.addTests(loader.loadTestsFromTestCase(TestVisualiser))
     suite.addTests(loader.loadTestsFromTestCase(TestVEDomainGraphs))
     suite.addTests(loader.loadTestsFromTestCase(TestIntegration))
@@ -17,6 +17,8 @@ from dataclasses import dataclass, field
 
 from ontology_loader import OntologyLoader, Ontology
 from graph_builder import OntologyGraphBuilder, get_graph_stats
+from csr_graph import CSRGraph
+from federated_graph import FederatedGraph
 
 
 @dataclass
@@ -128,17 +130,32 @@ class VEDomainGraphBuilder:
 
     def build_ve_value_chain(
         self,
-        layer_ontologies: Dict[str, Ontology]
+        layer_ontologies: Dict[str, Ontology],
+        federation: Optional[FederatedGraph] = None,
+        key: str = 've:w4m-value-chain'
     ) -> nx.DiGraph:
         """
         Build a VE value chain connecting ontologies to W4M layers.
 
+        Without a federation, each layer gets its own copy of its ontology,
+        with node ids prefixed by the layer name. With one, ontologies are
+        added as members (by ontology id, unless already present) and keep
+        their ids, the framework is the member 'w4m:framework' and the
+        layer_content edges the member key; the result is a read-only view
+        over these, so an ontology used by several layers or value chains
+        is stored once.
+
         Args:
             layer_ontologies: Dict mapping layer names to Ontology objects
+            federation: FederatedGraph to build the value chain in
+            key: Member key for the layer_content edges
 
         Returns:
             Combined value chain graph
         """
+        if federation is not None:
+            return self._federated_value_chain(layer_ontologies, federation, key)
+
         # Start with framework graph
         G = self.build_w4m_framework_graph()
 
@@ -171,6 +188,40 @@ class VEDomainGraphBuilder:
 
         return G
 
+    def _federated_value_chain(
+        self,
+        layer_ontologies: Dict[str, Ontology],
+        federation: FederatedGraph,
+        key: str
+    ) -> nx.DiGraph:
+        """build_ve_value_chain over federation members instead of copies."""
+        if 'w4m:framework' not in federation:
+            federation.add_graph('w4m:framework', self.build_w4m_framework_graph())
+
+        contents = nx.DiGraph()
+        members = ['w4m:framework', key]
+        for layer_name, ontology in layer_ontologies.items():
+            layer = self.framework.get_layer(layer_name)
+            if not layer:
+                continue
+            if ontology.id not in federation:
+                self.builder.add_to_federation(federation, ontology)
+            members.append(ontology.id)
+            for node in federation.nodes_of(ontology.id):
+                contents.add_edge(
+                    f"layer_{layer.index}",
+                    node,
+                    label='contains',
+                    edge_type='layer_content',
+                    color='#90A4AE'
+                )
+
+        federation.add_graph(key, contents)
+        G = federation.view(*members)
+        # Framework metadata, as in the copied value chain
+        G.graph = federation.view('w4m:framework').graph
+        return G
+
     def build_vsom_graph(self, vsom_ontology: Ontology) -> nx.DiGraph:
         """
         Build VSOM (Vision-Strategy-Objectives-Metrics) specific graph.
@@ -269,6 +320,10 @@ class VEDomainGraphBuilder:
         Returns:
             Analysis results including paths and metrics
         """
+        if isinstance(G, CSRGraph):
+            # Simple paths and betweenness centrality need networkx
+            G = G.to_networkx()
+
         source = f"layer_{source_layer}"
         target = f"layer_{target_layer}"
 
@@ -14,6 +14,9 @@ import networkx as nx
 from typing import Dict, List, Any, Optional, Set
 from pathlib import Path
 
+from csr_graph import CSRGraph
+from ontology_context import resolver_for
+
 try:
     from pyvis.network import Network
     PYVIS_AVAILABLE = True
@@ -236,7 +239,8 @@ class OntologyVisualiser:
         Filter graph to show only nodes from a specific domain.
 
         Args:
-            G: Source graph
+            G: Source graph (a CSRGraph gives a CSRGraph subgraph; a
+               read-only view, e.g. from a FederatedGraph, gives a view)
             domain: Domain to filter (VE, CE, Agent, etc.)
             include_connected: Include nodes connected to domain nodes
 
@@ -257,6 +261,8 @@ class OntologyVisualiser:
                 domain_nodes.update(G.predecessors(node))
                 domain_nodes.update(G.successors(node))
 
+        if nx.is_frozen(G):
+            return G.subgraph(domain_nodes)
         return G.subgraph(domain_nodes).copy()
 
     def highlight_path(
@@ -270,7 +276,7 @@ class OntologyVisualiser:
         Highlight shortest path between two nodes.
 
         Args:
-            G: Source graph
+            G: Source graph (a CSRGraph is searched in place, then converted)
             start: Start node ID
             end: End node ID
             highlight_color: Color for highlighted path
@@ -278,10 +284,13 @@ class OntologyVisualiser:
         Returns:
             Graph with highlighted path
         """
-        H = G.copy()
+        H = G.to_networkx() if isinstance(G, CSRGraph) else G.copy()
 
         try:
-            path = nx.shortest_path(G, start, end)
+            if isinstance(G, CSRGraph):
+                path = G.shortest_path(start, end)
+            else:
+                path = nx.shortest_path(G, start, end)
 
             # Highlight path nodes
             for node in path:
@@ -370,8 +379,8 @@ class OntologyVisualiser:
         return layouts.get(layout, layouts['spring'])()
 
     def _infer_domain(self, node: str, data: Dict) -> str:
-        """Infer domain from node data."""
-        node_lower = str(node).lower()
+        """Infer domain from node data (full IRIs are matched in their compact prefix:local form)."""
+        node_lower = (resolver_for(None).compact(node) if isinstance(node, str) else str(node)).lower()
         label_lower = data.get('label', '').lower()
 
         if 'agent' in node_lower or data.get('node_type') == 'agent':